@@ -0,0 +1,116 @@
+"""
+Ending Loop Renderer
+Renders each ending as a seamless frame loop: static layers are drawn
+once into a cached plate, only particles, fog and glow pulses are
+redrawn per frame, over the window they touch
+For 기억의 전당포 (Memory Pawnshop)
+
+Usage:
+    python animate_endings.py                              # every ending, 300 frames
+    python animate_endings.py ending_forgotten --frames 60
+    python animate_endings.py --sheet                      # one sprite sheet per ending, 480x270 cells
+    python animate_endings.py --sheet --cell 960x540
+    python animate_endings.py --out build/loops --workers 4
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import os
+import time
+
+from pipeline import encode, profiling
+from pipeline.bands import share_cores
+from pipeline.batch import ASSETS_DIR, load_generator
+from pipeline.encode import save_image
+from pipeline.sequence import save_sequence, sprite_sheet
+
+# Generator modules exposing SCENES = {asset_id: scene factory}
+SCENE_MODULES = ["generate_endings", "create_endings"]
+
+DEFAULT_OUT = os.path.join(ASSETS_DIR, "illustrations", "loops")
+
+# Sheet cells default to the frame shrunk by this: 300 full 1080p cells
+# would make a 34560px wide texture
+SHEET_DOWNSCALE = 4
+
+def collect_scenes():
+    """{asset_id: module} for every ending with a layered scene"""
+    return {asset_id: module for module in SCENE_MODULES
+            for asset_id in load_generator(module).SCENES}
+
+def render_loop(module, asset_id, output_dir, frames, fps, sheet=False, cell=None, columns=None):
+    """Render one ending's loop; returns (asset_id, files written, seconds)"""
+    start = time.perf_counter()
+    scene = load_generator(module).SCENES[asset_id]()
+    loop = scene.frames(frames)
+    if not sheet:
+        paths = save_sequence(loop, os.path.join(output_dir, asset_id), asset_id)
+        return asset_id, len(paths), time.perf_counter() - start
+
+    columns = columns or math.ceil(math.sqrt(frames))
+    cell = cell or (scene.size[0] // SHEET_DOWNSCALE, scene.size[1] // SHEET_DOWNSCALE)
+    img = sprite_sheet(loop, frames, columns, cell)
+    os.makedirs(output_dir, exist_ok=True)
+    path = save_image(img, os.path.join(output_dir, f"{asset_id}_sheet.png"))
+    w, h = cell
+    with open(os.path.join(output_dir, f"{asset_id}_sheet.json"), "w", encoding="utf-8") as f:
+        json.dump({"sheet": os.path.basename(path), "frames": frames, "fps": fps,
+                   "columns": columns, "cell": [w, h]}, f, indent=2)
+    return asset_id, 1, time.perf_counter() - start
+
+def parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render looping ending animations")
+    parser.add_argument("endings", nargs="*", help="asset ids (default: every ending)")
+    parser.add_argument("--frames", type=int, default=300, help="frames per loop")
+    parser.add_argument("--fps", type=int, default=30, help="playback rate recorded for sheets")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory")
+    parser.add_argument("--sheet", action="store_true",
+                        help="write one sprite sheet per ending instead of a PNG sequence")
+    parser.add_argument("--cell", type=parse_size, default=None, metavar="WxH",
+                        help=f"sheet frame size (default: the frame / {SHEET_DOWNSCALE})")
+    parser.add_argument("--columns", type=int, default=None, help="sprite sheet columns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="endings rendered in parallel (1 renders in-process)")
+    parser.add_argument("--encode", choices=sorted(encode.PROFILES), default=None,
+                        help="encode profile for frames and sheets")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="write plate and per-frame timings as Chrome trace JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        profiling.enable(args.trace)
+    if args.encode:
+        encode.set_profile(args.encode)
+
+    scenes = collect_scenes()
+    endings = args.endings or list(scenes)
+    unknown = [asset_id for asset_id in endings if asset_id not in scenes]
+    if unknown:
+        raise SystemExit(f"unknown endings: {', '.join(unknown)}; expected {', '.join(scenes)}")
+
+    tasks = [(scenes[asset_id], asset_id, args.out, args.frames, args.fps,
+              args.sheet, args.cell, args.columns) for asset_id in endings]
+    print(f"Rendering {len(tasks)} loops of {args.frames} frames")
+    if args.workers == 1 or len(tasks) == 1:
+        results = [render_loop(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=share_cores,
+                                 initargs=(args.workers,)) as pool:
+            results = list(pool.map(render_loop, *zip(*tasks)))
+
+    for asset_id, files, seconds in results:
+        print(f"  {asset_id:<20} {files:>4} file(s) {seconds:>7.1f}s "
+              f"({seconds / args.frames * 1000:.0f} ms/frame)")
+    if args.trace:
+        profiling.write_trace(args.trace)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Asset Generator Benchmarks
+Times every create_* generator and the shared pipeline stages in isolation
+For 기억의 전당포 (Memory Pawnshop)
+
+Each case runs in fresh worker processes, writing to a temp dir: timed
+runs record wall time, CPU time and peak RSS, and one separate run
+traces peak Python allocations (tracemalloc slows allocation-heavy code
+severalfold, so it never runs while timing). Results are compared to a
+stored baseline and the run fails when any case regresses past the
+threshold.
+
+Usage:
+    python benchmark_assets.py --save-baseline      # record baseline.json
+    python benchmark_assets.py                      # compare, exit 1 on regression
+    python benchmark_assets.py --threshold 15 --only portrait stage:bloom
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.batch import Job, collect_jobs, load_generator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# Pipeline stages are resolution-independent, so they run at every size;
+# the ending generators have fixed 1920x1080 geometry
+STAGE_SIZES = [(1280, 720), (1920, 1080), (3840, 2160)]
+PORTRAIT_SIZES = [(256, 256), (512, 512), (1024, 1024)]
+
+def _stage_gradient(size):
+    from pipeline.gradients import radial_field, ring_steps, paint
+    from PIL import Image
+    img = Image.new('RGBA', size, (0, 0, 0, 255))
+    field = ring_steps(radial_field(size, (size[0] // 2, size[1] // 2), size[1] // 2), 100)
+    paint(img, field, (255, 200, 120), lambda t: 180 * (1 - t))
+
+def _stage_vignette(size):
+    from pipeline.vignette import rect_vignette_mask, apply_vignette
+    from PIL import Image
+    # Bypass the memo so the mask build itself is timed
+    mask = rect_vignette_mask.__wrapped__(size, size[1] // 5, 0.6, 0.5)
+    apply_vignette(Image.new('RGBA', size, (128, 128, 128, 255)), mask)
+
+def _stage_bloom(size):
+    from pipeline.bloom import pyramid_blur
+    from PIL import Image
+    pyramid_blur(Image.new('RGBA', size, (200, 100, 255, 128)), 80)
+
+def _stage_particles(size):
+    from pipeline.particles import splat
+    from PIL import Image
+    import numpy as np
+    rng = np.random.default_rng(0)
+    n = 100_000
+    splat(Image.new('RGBA', size, (0, 0, 0, 255)),
+          rng.integers(0, size[0], n), rng.integers(0, size[1], n),
+          rng.integers(1, 4, n), (255, 220, 150), rng.integers(30, 200, n))
+
+def _stage_rays(size):
+    from pipeline.rays import ray_angles, draw_rays
+    from PIL import Image
+    import random
+    angles = ray_angles(random.Random(0), 64)
+    draw_rays(Image.new('RGBA', size, (0, 0, 0, 255)), (size[0] // 2, size[1] // 2),
+              angles, size[1] // 2, size[1] // 70, (255, 250, 200), taper=0.8)
+
+STAGES = {
+    "gradient": _stage_gradient,
+    "vignette": _stage_vignette,
+    "bloom": _stage_bloom,
+    "particles": _stage_particles,
+    "rays": _stage_rays,
+}
+
+def collect_cases(output_root):
+    """Return [(case_id, spec)]; spec is a Job or ("stage", name, size)"""
+    cases = []
+    for job in collect_jobs(output_root):
+        if job.func == "create_portrait":
+            for size in PORTRAIT_SIZES:
+                sized = Job(job.asset_id, job.module, job.func, job.args,
+                            dict(job.kwargs, size=size), job.key)
+                cases.append((f"{job.asset_id}@{size[0]}x{size[1]}", sized))
+        else:
+            cases.append((job.asset_id, job))
+    for name in STAGES:
+        for size in STAGE_SIZES:
+            cases.append((f"stage:{name}@{size[0]}x{size[1]}", ("stage", name, size)))
+    return cases
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_case(spec, trace=False):
+    """Run one case in this (fresh) process and measure it
+
+    trace=True measures peak traced allocations instead of times.
+    """
+    if isinstance(spec, Job):
+        func = getattr(load_generator(spec.module), spec.func)
+        os.makedirs(os.path.dirname(spec.output), exist_ok=True)
+        call = lambda: func(*spec.args, **spec.kwargs)
+    else:
+        _, name, size = spec
+        call = lambda: STAGES[name](size)
+
+    # Imports and first-touch costs (e.g. Pillow's lazy codec registry)
+    # stay out of the measurement
+    from PIL import Image
+    Image.init()
+    if trace:
+        tracemalloc.start()
+        call()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"peak_traced_mb": traced_peak / (1024 * 1024)}
+
+    rss_before = _peak_rss_mb()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    call()
+    wall = time.perf_counter() - start_wall
+    cpu = time.process_time() - start_cpu
+    rss_after = _peak_rss_mb()
+
+    return {
+        "wall": wall,
+        "cpu": cpu,
+        "peak_rss_mb": rss_after,
+        "rss_growth_mb": None if rss_before is None else rss_after - rss_before,
+    }
+
+def _run_fresh(spec, trace=False):
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        return pool.apply(run_case, (spec, trace))
+
+def run_isolated(spec, repeat):
+    """Time a case `repeat` times, each in a new process, keeping the
+    fastest; then trace its allocations in one more"""
+    runs = [_run_fresh(spec) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["wall"])
+    best["cpu"] = min(r["cpu"] for r in runs)
+    best.update(_run_fresh(spec, trace=True))
+    return best
+
+def compare(results, baseline, threshold, min_delta):
+    """Return a list of human-readable regression messages"""
+    regressions = []
+    for case_id, r in results.items():
+        base = baseline.get(case_id)
+        if not base:
+            continue
+        for metric, slack in (("wall", min_delta), ("peak_traced_mb", 1.0)):
+            old, new = base.get(metric), r.get(metric)
+            if old is None or new is None:
+                continue
+            limit = old * (1 + threshold / 100)
+            if new > limit and new - old > slack:
+                regressions.append(
+                    f"{case_id}: {metric} {old:.3f} -> {new:.3f} "
+                    f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+def format_table(results, baseline):
+    lines = [f"{'case':<36}{'wall (s)':>10}{'cpu (s)':>10}{'traced MB':>11}{'rss MB':>9}{'vs base':>9}"]
+    for case_id, r in results.items():
+        base = baseline.get(case_id, {}).get("wall")
+        delta = f"{(r['wall'] / base - 1) * 100:+.0f}%" if base else "-"
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        lines.append(f"{case_id:<36}{r['wall']:>10.3f}{r['cpu']:>10.3f}"
+                     f"{r['peak_traced_mb']:>11.1f}{rss:>9}{delta:>9}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the asset generators")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="allowed regression in percent (default 20)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="ignore wall-time regressions smaller than this many seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=None,
+                        help="run only cases whose id starts with these prefixes")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["cases"]
+
+    with tempfile.TemporaryDirectory(prefix="asset_bench_") as tmp:
+        cases = collect_cases(tmp)
+        if args.only:
+            cases = [c for c in cases if c[0].startswith(tuple(args.only))]
+        results = {}
+        for case_id, spec in cases:
+            results[case_id] = run_isolated(spec, args.repeat)
+            print(f"  {case_id:<36}{results[case_id]['wall']:.3f}s", flush=True)
+
+    print()
+    print(format_table(results, baseline))
+
+    if args.save_baseline:
+        merged = dict(baseline, **results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "cases": merged}, f,
+                      indent=1, sort_keys=True)
+        print(f"\nBaseline saved: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) past {args.threshold:.0f}%:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print("\nNo regressions." if baseline else "\nNo baseline yet; run with --save-baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Batch Asset Builder
+Renders the endings, portraits and icons the game references (see
+pipeline/manifest.py) in parallel, then packs the portrait and icon
+atlases
+For 기억의 전당포 (Memory Pawnshop)
+
+Usage:
+    python build_assets.py                 # referenced assets, one worker per core
+    python build_assets.py --all           # every generator's assets, referenced or not
+    python build_assets.py --workers 4
+    python build_assets.py --only ending_ --out build/
+    python build_assets.py --only orb_     # named assets, referenced or not (per-customer orbs)
+    python build_assets.py --force         # ignore the build cache
+    python build_assets.py --expressions   # per-emotion portraits from the dialogue tags
+    python build_assets.py --variants      # also write 4K/720p/thumbnail copies and 16-512px icons
+    python build_assets.py --trace trace.json --force   # per-stage Chrome trace
+    python build_assets.py --encode fast   # quick PNGs while iterating
+    python build_assets.py --gpu-compress  # BC1/BC3 .dds beside each ending/portrait
+    python build_assets.py --node-cache .node_cache   # keep ending layer renders between builds
+    python build_assets.py --fonts         # also subset fonts/ to the characters the game uses
+                                           # and pre-rasterize the dialogue's glyph atlases
+"""
+
+import argparse
+import os
+import time
+
+from fonts.generate_glyph_atlas import create_glyph_atlas
+from pipeline import encode, fonts, layergraph, profiling, texcompress
+from pipeline.batch import (ASSETS_DIR, GENERATORS, collect_jobs, run_jobs, run_post_build,
+                            format_report)
+from pipeline.cache import BuildCache
+from pipeline.manifest import plan_build, scan_references, format_plan
+
+# Full-screen art worth block compressing; icons are tiny and atlased
+GPU_TEXTURE_MODULES = {"generate_endings", "create_endings", "generate_portraits"}
+
+# Disk budget for --node-cache
+NODE_CACHE_BYTES = 1 << 30
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render all generated art assets")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (1 renders in-process)")
+    parser.add_argument("--out", default=None,
+                        help="output root; defaults to each generator's own folder")
+    parser.add_argument("--only", nargs="*", default=None,
+                        help="render only asset ids starting with these prefixes, "
+                             "whether or not the game references them")
+    parser.add_argument("--variants", action="store_true",
+                        help="also write each generator's resolution variants")
+    parser.add_argument("--expressions", action="store_true",
+                        help="also write a portrait per emotion the dialogue uses")
+    parser.add_argument("--all", action="store_true",
+                        help="build every generator's assets, not just those the game references")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render even if the build cache says an asset is fresh")
+    parser.add_argument("--encode", choices=sorted(encode.PROFILES), default=None,
+                        help="encode profile for every output (default: each generator's own)")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="write per-stage timings as Chrome trace JSON (chrome://tracing, Perfetto)")
+    parser.add_argument("--gpu-compress", action="store_true",
+                        help="also write BC1/BC3 .dds textures and their .import for endings and portraits")
+    parser.add_argument("--node-cache", default=None, metavar="DIR",
+                        help="memoize ending layer-graph nodes on disk, pruned to 1 GiB after the build")
+    parser.add_argument("--fonts", action="store_true",
+                        help="write fonts/subset/ cut to the characters the game uses (needs fontTools; "
+                             "fails if a font lacks one) and the dialogue glyph atlases in fonts/atlas/")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        profiling.enable(args.trace)
+    if args.encode:
+        encode.set_profile(args.encode)
+    if args.node_cache:
+        # Workers inherit it; see pipeline.layergraph.default_cache()
+        os.environ[layergraph.NODE_CACHE_ENV] = os.path.abspath(args.node_cache)
+
+    if args.fonts:
+        # First, so a missing glyph fails the build before anything renders
+        try:
+            subsets = fonts.subset_fonts(fonts.font_files(), fonts.used_text(),
+                                         os.path.join(args.out or ASSETS_DIR, "fonts", "subset"))
+        except (ImportError, ValueError) as e:
+            raise SystemExit(f"font subsetting failed:\n{e}")
+        print(fonts.format_report(subsets))
+        atlases = create_glyph_atlas(output_dir=os.path.join(args.out or ASSETS_DIR, "fonts", "atlas"))
+        print(f"{len(atlases)} dialogue glyph atlases")
+        print()
+
+    jobs = collect_jobs(args.out, variants=args.variants, expressions=args.expressions)
+
+    cache = BuildCache(args.out or ASSETS_DIR)
+    plan = None
+    if not args.all:
+        # Orphans are judged against every job, so plan before --only
+        plan = plan_build(jobs, scan_references(), cache, args.out,
+                          {subdir for module, subdir in GENERATORS})
+    if args.only:
+        # Naming an asset builds it even if nothing loads it yet
+        jobs = [job for job in jobs if job.asset_id.startswith(tuple(args.only))]
+        if plan:
+            plan = plan._replace(unreferenced=[job for job in plan.unreferenced if job not in jobs])
+    elif plan:
+        jobs = plan.referenced
+    stale = [job for job in jobs
+             if args.force or not cache.is_fresh(encode.encoded_path(job.output), job.key)]
+
+    print("=" * 50)
+    print(f"Building {len(stale)} assets on {args.workers} workers "
+          f"({len(jobs) - len(stale)} up to date)")
+    print("=" * 50)
+    if plan and format_plan(plan):
+        print(format_plan(plan))
+    if stale:
+        start = time.perf_counter()
+        results = run_jobs(stale, workers=args.workers)
+        total = time.perf_counter() - start
+
+        for job, result in zip(stale, results):
+            # Variants and expressions too, so is_fresh() and the orphan scan see them
+            cache.record(encode.encoded_path(job.output), job.key,
+                         [e[0] for e in result.encoded])
+        cache.save()
+        if args.node_cache:
+            layergraph.NodeCache(os.path.abspath(args.node_cache)).prune(NODE_CACHE_BYTES)
+
+        # Atlases and other whole-folder stages, for generators that changed
+        run_post_build({job.module for job in stale}, args.out)
+
+        print()
+        print(format_report(results, total))
+    if args.gpu_compress:
+        # Every selected texture whose .dds lags its PNG, rebuilt this run or not
+        paths = [path for path in (encode.encoded_path(job.output) for job in jobs
+                                   if job.module in GPU_TEXTURE_MODULES)
+                 if texcompress.is_stale(path)]
+        if paths:
+            print()
+            print(texcompress.format_report(texcompress.compress_files(paths, args.workers)))
+    if args.trace:
+        profiling.write_trace(args.trace)
+
+if __name__ == "__main__":
+    main()
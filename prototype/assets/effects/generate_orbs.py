@@ -0,0 +1,112 @@
+"""
+Memory Orb Texture Generator
+One Luminous Drift orb per customer, coloured by their dialogue's
+memory_color, so a new customer never needs a hand-made orb texture.
+No scene loads them yet (the pawnshop shows memory_orb_cyan.png), so the
+batch builder only makes them when asked: build_assets.py --only orb_
+For 기억의 전당포 (Memory Pawnshop)
+
+Usage:
+    python generate_orbs.py                # effects/orb_<customer_id>.png per dialogue
+    python generate_orbs.py --frames 16    # plus a looping sprite sheet for each
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.dialogues import load_dialogues, memory_accent
+from pipeline.encode import save_image
+from pipeline.orbs import ORB_SIZE, memory_orb, loop_times, render_orbs
+from pipeline.profiling import StageTimer
+from pipeline.rng import asset_rng
+from pipeline.sequence import sprite_sheet
+
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Playback rate recorded for sprite sheets
+SHEET_FPS = 12
+
+def hex_to_rgb(hex_color):
+    """Convert hex color to RGB tuple"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+def customer_colors():
+    """[(customer_id, accent hex)] for every dialogue with a memory_color"""
+    customers = []
+    for stem, data in load_dialogues().items():
+        color = data.get("metadata", {}).get("memory_color")
+        if color:
+            customers.append((data.get("customer_id", stem), memory_accent(color)))
+    return customers
+
+def orb_path(output_dir, customer_id):
+    return os.path.join(output_dir, f"orb_{customer_id}.png")
+
+def save_orb(frames, output_path):
+    """Write the still, and a sprite sheet and its JSON if there are loop frames"""
+    still, loop = frames[0], frames[1:]
+    path = save_image(still, output_path)
+    if loop:
+        columns = math.ceil(math.sqrt(len(loop)))
+        root = os.path.splitext(output_path)[0]
+        sheet = save_image(sprite_sheet(loop, len(loop), columns, mode='RGBA'), f"{root}_sheet.png")
+        with open(f"{root}_sheet.json", "w", encoding="utf-8") as f:
+            json.dump({"sheet": os.path.basename(sheet), "frames": len(loop), "fps": SHEET_FPS,
+                       "columns": columns, "cell": [ORB_SIZE, ORB_SIZE]}, f, indent=2)
+    return path
+
+def customer_orb(customer_id, accent_hex):
+    """The customer's Orb; its fragments are seeded by the customer id"""
+    return memory_orb(hex_to_rgb(accent_hex), asset_rng(f"orb_{customer_id}"))
+
+def create_orbs(customers, output_dir=OUTPUT_DIR, frames=0):
+    """Render every (customer_id, accent hex) orb in one batch; returns the paths"""
+    timer = StageTimer((ORB_SIZE * (1 + frames), ORB_SIZE * len(customers)))
+    timer("render")
+    rendered = render_orbs([customer_orb(*customer) for customer in customers],
+                           [None] + loop_times(frames))
+
+    timer("save")
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [save_orb(orb_frames, orb_path(output_dir, customer_id))
+             for (customer_id, accent), orb_frames in zip(customers, rendered)]
+    timer.done()
+    return paths
+
+def create_orb(customer_id, accent_hex, output_path, frames=0):
+    """Render one customer's orb (and a sprite sheet with frames > 0)"""
+    timer = StageTimer((ORB_SIZE * (1 + frames), ORB_SIZE))
+    timer("render")
+    [orb_frames] = render_orbs([customer_orb(customer_id, accent_hex)], [None] + loop_times(frames))
+    timer("save")
+    save_orb(orb_frames, output_path)
+    timer.done()
+    print(f"Created: {output_path}")
+
+def jobs(output_dir=OUTPUT_DIR):
+    """List (asset_id, create function, args) for every customer's orb"""
+    return [(f"orb_{customer_id}", create_orb, (customer_id, accent, orb_path(output_dir, customer_id)))
+            for customer_id, accent in customer_colors()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render a memory orb texture per customer")
+    parser.add_argument("--frames", type=int, default=0,
+                        help="also write a looping sprite sheet of this many frames per orb")
+    parser.add_argument("--out", default=OUTPUT_DIR, help="output directory")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    customers = customer_colors()
+    paths = create_orbs(customers, args.out, args.frames)
+    for path in paths:
+        print(f"Created: {path}")
+    print(f"\n{len(paths)} memory orbs generated")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Poster Exporter
+Renders endings at print and key-art sizes (8K and up) tile by tile,
+streaming rows into the PNG so memory stays within a fixed budget
+whatever the output size
+For 기억의 전당포 (Memory Pawnshop)
+
+Usage:
+    python export_poster.py                                # every ending at 4x (7680x4320)
+    python export_poster.py ending_mercy --width 15360     # 16K
+    python export_poster.py --scale 8 --budget 128 --out build/posters
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+
+from pipeline import profiling
+from pipeline.bands import share_cores
+from pipeline.batch import ASSETS_DIR, load_generator
+from pipeline.tiles import render_tiled
+
+# Generator modules exposing SPECS = {asset_id: layer graph} and NODES
+POSTER_MODULES = ["generate_endings", "create_endings"]
+
+DEFAULT_OUT = os.path.join(ASSETS_DIR, "illustrations", "posters")
+
+def collect_specs():
+    """{asset_id: module} for every ending described as a layer graph"""
+    return {asset_id: module for module in POSTER_MODULES
+            for asset_id in load_generator(module).SPECS}
+
+def export_poster(module, asset_id, output_dir, scale=None, width=None, budget=256 << 20, level=6):
+    """Render one poster; returns (asset_id, (w, h), bytes written, seconds)"""
+    start = time.perf_counter()
+    generator = load_generator(module)
+    spec = generator.SPECS[asset_id]
+    scale = width / spec["size"][0] if width else scale
+    os.makedirs(output_dir, exist_ok=True)
+    size, path = render_tiled(spec, generator.NODES, os.path.join(output_dir, f"{asset_id}_poster.png"),
+                              scale, budget, level)
+    return asset_id, size, os.path.getsize(path), time.perf_counter() - start
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render poster-size ending exports")
+    parser.add_argument("endings", nargs="*", help="asset ids (default: every ending)")
+    parser.add_argument("--scale", type=float, default=4, help="multiple of the 1920x1080 design size")
+    parser.add_argument("--width", type=int, default=None,
+                        help="output width in pixels (overrides --scale; height keeps the aspect)")
+    parser.add_argument("--budget", type=int, default=256,
+                        help="peak render memory per worker in MB")
+    parser.add_argument("--level", type=int, default=6, choices=range(10), metavar="0-9",
+                        help="zlib level for the streamed PNG")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="posters rendered in parallel, each within --budget")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="write per-tile timings as Chrome trace JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        profiling.enable(args.trace)
+
+    specs = collect_specs()
+    endings = args.endings or list(specs)
+    unknown = [asset_id for asset_id in endings if asset_id not in specs]
+    if unknown:
+        raise SystemExit(f"unknown endings: {', '.join(unknown)}; expected {', '.join(specs)}")
+
+    tasks = [(specs[asset_id], asset_id, args.out, args.scale, args.width,
+              args.budget << 20, args.level) for asset_id in endings]
+    print(f"Exporting {len(tasks)} posters within {args.budget} MB per worker")
+    if args.workers == 1 or len(tasks) == 1:
+        results = [export_poster(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=share_cores,
+                                 initargs=(args.workers,)) as pool:
+            results = list(pool.map(export_poster, *zip(*tasks)))
+
+    for asset_id, (w, h), size, seconds in results:
+        print(f"  {asset_id:<20} {w}x{h} {size / (1 << 20):>7.1f} MB {seconds:>7.1f}s")
+    if args.trace:
+        profiling.write_trace(args.trace)
+
+if __name__ == "__main__":
+    main()
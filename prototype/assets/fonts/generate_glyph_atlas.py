@@ -0,0 +1,75 @@
+"""
+Dialogue Glyph Atlas Generator
+Pre-rasterizes every character of resources/dialogues/*.json from
+NotoSansKR at the dialogue scene's font sizes, as packed atlas pages and
+a BMFont .fnt per size that Godot imports as a FontFile, plus a neon
+variant glowing like the portraits' name captions
+For 기억의 전당포 (Memory Pawnshop)
+
+Pillow draws characters the font lacks as boxes; build_assets --fonts
+checks every used character against the fonts first.
+
+Usage:
+    python generate_glyph_atlas.py               # atlas/dialogue_<size>.fnt for each size
+    python generate_glyph_atlas.py --sizes 24    # just the dialogue text size
+    python generate_glyph_atlas.py --no-neon
+"""
+
+import argparse
+import os
+import sys
+
+from PIL import ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import fonts
+from pipeline.glyphs import rasterize, scene_font_sizes, write_bmfont
+from pipeline.profiling import StageTimer
+
+FONTS_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(FONTS_DIR, "atlas")
+FONT_FILE = os.path.join(FONTS_DIR, "NotoSansKR-Regular.ttf")
+
+# Its font_size overrides are the sizes rasterized
+DIALOGUE_SCENE = os.path.join(fonts.PROJECT_DIR, "scenes", "dialogue.tscn")
+
+# The theme's hover cyan
+NEON_COLOR = (0, 245, 212)
+
+def create_glyph_atlas(font_path=FONT_FILE, sizes=None, output_dir=OUTPUT_DIR, neon=True):
+    """Write dialogue_<size>.fnt (and dialogue_neon_<size>.fnt) with their pages
+
+    sizes default to the dialogue scene's font sizes. Returns the .fnt paths.
+    """
+    sizes = sizes or scene_font_sizes(DIALOGUE_SCENE)
+    codepoints = fonts.codepoints(fonts.dialogue_text())
+    variants = [("dialogue", None)] + ([("dialogue_neon", NEON_COLOR)] if neon else [])
+    timer = StageTimer()
+    paths = []
+    for size in sizes:
+        font = ImageFont.truetype(font_path, size)
+        for name, glow_color in variants:
+            timer(f"{name}_{size}")
+            glyphs = rasterize(font, codepoints, glow_color)
+            paths.append(write_bmfont(glyphs, font, output_dir, f"{name}_{size}"))
+    timer.done()
+    return paths
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-rasterize the dialogue's glyphs into BMFont atlases")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, metavar="PX",
+                        help="font sizes (default: those scenes/dialogue.tscn uses)")
+    parser.add_argument("--font", default=FONT_FILE, help="TrueType/OpenType font to rasterize")
+    parser.add_argument("--out", default=OUTPUT_DIR, help="output directory")
+    parser.add_argument("--no-neon", action="store_true", help="skip the glowing variant")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = create_glyph_atlas(args.font, args.sizes, args.out, neon=not args.no_neon)
+    for path in paths:
+        print(f"Created: {path}")
+    print(f"\n{len(paths)} glyph atlases generated")
+
+if __name__ == "__main__":
+    main()
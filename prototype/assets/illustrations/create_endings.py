@@ -3,36 +3,27 @@ Neon Memoria - Ending Illustrations Generator
 Creates 3 ending illustrations for "기억의 전당포" (Memory Pawnshop)
 """
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
-import math
-import random
+from PIL import Image, ImageFont
+from functools import partial
+import numpy as np
 import os
+import sys
 
-# Set seed for reproducibility
-random.seed(42)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.encode import save_image
+from pipeline.particles import Particles
+from pipeline.profiling import StageTimer
+from pipeline.layergraph import LAYER, FILTER, Drawing, Raster, node_type, evaluate, render_scaled, to_scene
+from pipeline.orbs import draw_memory_orb
+from pipeline.sequence import phases, wave
+from pipeline.variants import ENDING_VARIANTS, save_variants
 
 # Output directory
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 WIDTH, HEIGHT = 1920, 1080
 
-def create_radial_gradient(width, height, center, colors, radius_factor=1.0):
-    """Create a radial gradient image"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 255))
-    draw = ImageDraw.Draw(img)
-
-    cx, cy = center
-    max_radius = max(width, height) * radius_factor
-
-    for i in range(int(max_radius), 0, -2):
-        ratio = i / max_radius
-        # Interpolate between colors
-        r = int(colors[0][0] * ratio + colors[1][0] * (1 - ratio))
-        g = int(colors[0][1] * ratio + colors[1][1] * (1 - ratio))
-        b = int(colors[0][2] * ratio + colors[1][2] * (1 - ratio))
-
-        draw.ellipse([cx - i, cy - i, cx + i, cy + i], fill=(r, g, b, 255))
-
-    return img
+# Resolution variants written by the batch builder's --variants mode
+VARIANTS = ENDING_VARIANTS
 
 def draw_silhouette(draw, base_x, base_y, scale=1.0, color=(0, 0, 0)):
     """Draw a standing figure silhouette"""
@@ -81,128 +72,8 @@ def draw_silhouette(draw, base_x, base_y, scale=1.0, color=(0, 0, 0)):
     draw.rectangle([base_x - int(25 * scale), torso_bottom, base_x - int(8 * scale), base_y], fill=color)
     draw.rectangle([base_x + int(8 * scale), torso_bottom, base_x + int(25 * scale), base_y], fill=color)
 
-def draw_memory_orb(draw, x, y, radius, color, glow_color, alpha=200):
-    """Draw a glowing memory orb"""
-    # Outer glow
-    for i in range(3, 0, -1):
-        glow_radius = radius + i * 4
-        glow_alpha = int(alpha / (i + 1))
-        # Create glow effect
-        draw.ellipse([x - glow_radius, y - glow_radius,
-                     x + glow_radius, y + glow_radius],
-                    fill=(*glow_color, glow_alpha))
-
-    # Core
-    draw.ellipse([x - radius, y - radius, x + radius, y + radius],
-                fill=(*color, alpha))
-
-    # Highlight
-    highlight_offset = radius // 3
-    highlight_radius = radius // 4
-    draw.ellipse([x - highlight_offset - highlight_radius,
-                 y - highlight_offset - highlight_radius,
-                 x - highlight_offset + highlight_radius,
-                 y - highlight_offset + highlight_radius],
-                fill=(255, 255, 255, 150))
-
-def add_light_rays(img, center, color, num_rays=12, length=400):
-    """Add subtle light rays from a center point"""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-
-    cx, cy = center
-    for i in range(num_rays):
-        angle = (2 * math.pi * i / num_rays) + random.uniform(-0.1, 0.1)
-        end_x = cx + int(length * math.cos(angle))
-        end_y = cy + int(length * math.sin(angle))
-
-        # Draw tapered line
-        for j in range(10):
-            ratio = j / 10
-            alpha = int(30 * (1 - ratio))
-            width = int(20 * (1 - ratio)) + 1
-            mid_x = int(cx + (end_x - cx) * ratio)
-            mid_y = int(cy + (end_y - cy) * ratio)
-            draw.ellipse([mid_x - width, mid_y - width, mid_x + width, mid_y + width],
-                        fill=(*color, alpha))
-
-    return Image.alpha_composite(img, overlay)
-
-def create_ending_mercy():
-    """Create the Mercy Ending illustration - warm, hopeful"""
-    print("Creating ending_mercy.png...")
-
-    # Base - deep dark blue transitioning to warm
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (10, 8, 20, 255))
-    draw = ImageDraw.Draw(img)
-
-    # Warm light source from behind figure (sunrise effect)
-    center = (WIDTH // 2, HEIGHT // 2 + 100)
-
-    # Background gradient - warm golden light
-    for radius in range(800, 0, -5):
-        ratio = radius / 800
-        # Warm colors: gold -> soft orange -> white center
-        r = int(255 - (255 - 255) * ratio)
-        g = int(220 - (220 - 180) * ratio)
-        b = int(150 - (150 - 80) * ratio)
-        alpha = int(180 * (1 - ratio * 0.7))
-
-        draw.ellipse([center[0] - radius, center[1] - radius - 200,
-                     center[0] + radius, center[1] + radius - 200],
-                    fill=(r, g, b, min(255, alpha)))
-
-    # Add light rays
-    img = add_light_rays(img, (WIDTH // 2, HEIGHT // 2 - 100), (255, 230, 180), num_rays=16, length=600)
-    draw = ImageDraw.Draw(img)
-
-    # Draw floating memory orbs (warm, gentle)
-    orb_positions = [
-        (300, 200, 12), (450, 350, 8), (250, 500, 10),
-        (1620, 180, 11), (1500, 400, 9), (1700, 550, 7),
-        (600, 150, 6), (1300, 200, 8), (400, 650, 9),
-        (1550, 650, 10), (800, 100, 7), (1100, 120, 6),
-        (200, 350, 5), (1750, 350, 6), (550, 500, 7),
-        (1400, 500, 5), (700, 280, 8), (1200, 350, 7),
-    ]
-
-    for x, y, r in orb_positions:
-        # Warm colors: gold, amber, soft white
-        color_choice = random.choice([
-            ((255, 220, 150), (255, 200, 100)),
-            ((255, 240, 200), (255, 220, 150)),
-            ((255, 200, 120), (255, 180, 80)),
-        ])
-        draw_memory_orb(draw, x, y, r, color_choice[0], color_choice[1], alpha=random.randint(150, 220))
-
-    # Draw the silhouette (figure standing in light)
-    silhouette_x = WIDTH // 2
-    silhouette_y = HEIGHT - 150
-    draw_silhouette(draw, silhouette_x, silhouette_y, scale=1.3, color=(5, 5, 15))
-
-    # Add subtle floor reflection
-    for i in range(50):
-        y = HEIGHT - 100 + i
-        alpha = int(30 * (1 - i / 50))
-        draw.line([(silhouette_x - 80, y), (silhouette_x + 80, y)],
-                 fill=(255, 220, 150, alpha), width=2)
-
-    # Add subtle vignette
-    vignette = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    vignette_draw = ImageDraw.Draw(vignette)
-    for i in range(200):
-        alpha = int(i * 0.4)
-        # Top and bottom vignette
-        vignette_draw.rectangle([0, i, WIDTH, i + 1], fill=(10, 8, 20, alpha))
-        vignette_draw.rectangle([0, HEIGHT - i - 1, WIDTH, HEIGHT - i], fill=(10, 8, 20, alpha))
-        # Side vignette
-        vignette_draw.rectangle([i, 0, i + 1, HEIGHT], fill=(10, 8, 20, int(alpha * 0.5)))
-        vignette_draw.rectangle([WIDTH - i - 1, 0, WIDTH - i, HEIGHT], fill=(10, 8, 20, int(alpha * 0.5)))
-
-    img = Image.alpha_composite(img, vignette)
-
-    # Add title text
-    draw = ImageDraw.Draw(img)
+def draw_title(draw, title, subtitle, color, alpha=200, subtitle_alpha=150):
+    """Korean title and English subtitle centred at the bottom"""
     try:
         font_path = "C:/Users/user/.claude/skills/canvas-design/canvas-fonts/Jura-Light.ttf"
         title_font = ImageFont.truetype(font_path, 28)
@@ -211,271 +82,329 @@ def create_ending_mercy():
         title_font = ImageFont.load_default()
         subtitle_font = ImageFont.load_default()
 
-    # Korean title at bottom
-    draw.text((WIDTH // 2, HEIGHT - 50), "자 비", font=title_font, fill=(255, 230, 180, 200), anchor="mm")
-    draw.text((WIDTH // 2, HEIGHT - 25), "MERCY", font=subtitle_font, fill=(255, 230, 180, 150), anchor="mm")
-
-    # Save
-    img = img.convert('RGB')
-    img.save(os.path.join(OUTPUT_DIR, 'ending_mercy.png'), 'PNG', quality=95)
-    print("  -> ending_mercy.png saved!")
-
-def create_ending_justice():
-    """Create the Justice Ending illustration - cold, resolute"""
-    print("Creating ending_justice.png...")
-
-    # Base - cold deep blue/black
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (5, 10, 25, 255))
-    draw = ImageDraw.Draw(img)
-
-    # Cold light source - cyan/blue
-    center = (WIDTH // 2, HEIGHT // 2)
-
-    # Background gradient - cold cyan light
-    for radius in range(700, 0, -5):
-        ratio = radius / 700
-        r = int(30 * (1 - ratio))
-        g = int(180 * (1 - ratio))
-        b = int(220 * (1 - ratio))
-        alpha = int(150 * (1 - ratio * 0.6))
-
-        draw.ellipse([center[0] - radius, center[1] - radius - 100,
-                     center[0] + radius, center[1] + radius - 100],
-                    fill=(r, g, b, min(255, alpha)))
-
-    # Draw scales of justice symbol (cracked)
-    scale_center_x = WIDTH // 2
-    scale_center_y = HEIGHT // 3
-
-    # Main beam
-    beam_width = 300
-    beam_color = (0, 200, 255, 180)
-    draw.line([(scale_center_x - beam_width, scale_center_y),
-               (scale_center_x + beam_width, scale_center_y)],
-              fill=beam_color, width=4)
-
-    # Center pillar
-    draw.line([(scale_center_x, scale_center_y),
-               (scale_center_x, scale_center_y + 80)],
-              fill=beam_color, width=4)
-
-    # Left pan
-    draw.line([(scale_center_x - beam_width, scale_center_y),
-               (scale_center_x - beam_width, scale_center_y + 100)],
-              fill=beam_color, width=2)
-    draw.arc([scale_center_x - beam_width - 60, scale_center_y + 80,
-              scale_center_x - beam_width + 60, scale_center_y + 140],
-             0, 180, fill=beam_color, width=3)
-
-    # Right pan
-    draw.line([(scale_center_x + beam_width, scale_center_y),
-               (scale_center_x + beam_width, scale_center_y + 100)],
-              fill=beam_color, width=2)
-    draw.arc([scale_center_x + beam_width - 60, scale_center_y + 80,
-              scale_center_x + beam_width + 60, scale_center_y + 140],
-             0, 180, fill=beam_color, width=3)
-
-    # Crack in the scales
-    crack_points = [
-        (scale_center_x - 20, scale_center_y - 10),
-        (scale_center_x - 5, scale_center_y + 5),
-        (scale_center_x + 15, scale_center_y - 5),
-        (scale_center_x + 5, scale_center_y + 15),
-        (scale_center_x + 25, scale_center_y + 10),
-    ]
-    for i in range(len(crack_points) - 1):
-        draw.line([crack_points[i], crack_points[i + 1]], fill=(0, 255, 255, 200), width=2)
-
-    # Add glow to scales
-    for _ in range(3):
-        img = img.filter(ImageFilter.GaussianBlur(1))
-        draw = ImageDraw.Draw(img)
-
-    # Redraw on blurred image for glow effect
-    img2 = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    draw2 = ImageDraw.Draw(img2)
-
-    # Angular shadow patterns (harsh, geometric)
-    for i in range(0, WIDTH, 80):
-        alpha = random.randint(10, 30)
+    draw.text((WIDTH // 2, HEIGHT - 50), title, font=title_font, fill=(*color, alpha), anchor="mm")
+    draw.text((WIDTH // 2, HEIGHT - 25), subtitle, font=subtitle_font, fill=(*color, subtitle_alpha), anchor="mm")
+
+# Layer-graph node types for this file's motifs
+NODES = {}
+
+@node_type("coat_figure", LAYER, registry=NODES)
+def coat_figure_node(view, params):
+    """One draw_silhouette() figure"""
+    def draw(img):
+        draw_silhouette(view.draw(img), params["x"], params["y"], scale=params["scale"],
+                        color=tuple(params["color"]))
+        return img
+    return Drawing(view.size, draw)
+
+@node_type("reflection", LAYER, registry=NODES)
+def reflection_node(view, params):
+    """Floor reflection: `rows` 2px lines under the figure fading from `alpha`"""
+    x, y0, half_width, rows = params["x"], params["y"], params["half_width"], params["rows"]
+
+    def draw(img):
+        draw = view.draw(img)
+        for i in range(rows):
+            y = y0 + i
+            alpha = int(params["alpha"] * (1 - i / rows))
+            draw.line([(x - half_width, y), (x + half_width, y)],
+                     fill=(*params["color"], alpha), width=2)
+        return img
+    return Drawing(view.size, draw)
+
+def sample_orbs(params, rng):
+    """Pick a (color, glow) pair and an alpha for each [x, y, radius]"""
+    orbs = []
+    for x, y, r in params["positions"]:
+        color_choice = rng.choice(params["palette"])
+        orbs.append([x, y, r, color_choice[0], color_choice[1], rng.randint(*params["alpha"])])
+    return dict(params, orbs=orbs)
+
+def bob_orbs(params, t):
+    """Bob each orb motion.bob pixels up and down"""
+    offsets = np.rint(params["motion"]["bob"] * wave(t, phases(len(params["orbs"])))).astype(int)
+    orbs = [[x, y + int(dy), *rest] for (x, y, *rest), dy in zip(params["orbs"], offsets)]
+    return dict(params, orbs=orbs)
+
+@node_type("orbs", LAYER, sample=sample_orbs, animate=bob_orbs, registry=NODES)
+def orbs_node(view, params):
+    """Glowing memory orbs, overwriting what is under them as plain ImageDraw does"""
+    orbs = Particles()
+    for x, y, r, color, glow_color, alpha in params["orbs"]:
+        draw_memory_orb(orbs, x, y, r, tuple(color), tuple(glow_color), alpha=alpha)
+    columns = orbs.columns()
+    return Drawing(view.size, lambda img: view.splat(img, *columns, blend=False),
+                   view.disc_box(*columns[:3]))
+
+@node_type("scales", LAYER, registry=NODES)
+def scales_node(view, params):
+    """Scales of justice symbol (cracked)"""
+    scale_center_x, scale_center_y = params["center"]
+    beam_width = params["beam_width"]
+    beam_color = tuple(params["color"])
+
+    def draw(img):
+        draw = view.draw(img)
+
+        # Main beam
+        draw.line([(scale_center_x - beam_width, scale_center_y),
+                   (scale_center_x + beam_width, scale_center_y)],
+                  fill=beam_color, width=4)
+
+        # Center pillar
+        draw.line([(scale_center_x, scale_center_y),
+                   (scale_center_x, scale_center_y + 80)],
+                  fill=beam_color, width=4)
+
+        # Left pan
+        draw.line([(scale_center_x - beam_width, scale_center_y),
+                   (scale_center_x - beam_width, scale_center_y + 100)],
+                  fill=beam_color, width=2)
+        draw.arc([scale_center_x - beam_width - 60, scale_center_y + 80,
+                  scale_center_x - beam_width + 60, scale_center_y + 140],
+                 0, 180, fill=beam_color, width=3)
+
+        # Right pan
+        draw.line([(scale_center_x + beam_width, scale_center_y),
+                   (scale_center_x + beam_width, scale_center_y + 100)],
+                  fill=beam_color, width=2)
+        draw.arc([scale_center_x + beam_width - 60, scale_center_y + 80,
+                  scale_center_x + beam_width + 60, scale_center_y + 140],
+                 0, 180, fill=beam_color, width=3)
+
+        # Crack in the scales
+        crack_points = [
+            (scale_center_x - 20, scale_center_y - 10),
+            (scale_center_x - 5, scale_center_y + 5),
+            (scale_center_x + 15, scale_center_y - 5),
+            (scale_center_x + 5, scale_center_y + 15),
+            (scale_center_x + 25, scale_center_y + 10),
+        ]
+        for i in range(len(crack_points) - 1):
+            draw.line([crack_points[i], crack_points[i + 1]], fill=(0, 255, 255, 200), width=2)
+        return img
+    return Drawing(view.size, draw)
+
+def sample_shadows(params, rng):
+    """One alpha per `step`-px column across the frame"""
+    return dict(params, alphas=[rng.randint(*params["alpha"]) for _ in range(0, WIDTH, params["step"])])
+
+@node_type("shadows", LAYER, sample=sample_shadows, registry=NODES)
+def shadows_node(view, params):
+    """Angular shadow patterns (harsh, geometric), blended over what is below"""
+    w, h = view.design
+    img2 = Image.new('RGBA', view.size, (0, 0, 0, 0))
+    draw2 = view.draw(img2)
+    for i, alpha in zip(range(0, w, params["step"]), params["alphas"]):
         draw2.polygon([
             (i, 0),
             (i + 40, 0),
-            (i + 200, HEIGHT),
-            (i + 160, HEIGHT),
-        ], fill=(0, 50, 80, alpha))
-
-    img = Image.alpha_composite(img, img2)
-    draw = ImageDraw.Draw(img)
-
-    # Draw floating memory orbs (cold, precise)
-    orb_positions = [
-        (280, 250, 10), (400, 400, 7), (200, 600, 9),
-        (1640, 220, 9), (1520, 450, 8), (1720, 600, 6),
-        (550, 200, 5), (1350, 180, 7), (350, 700, 8),
-        (1600, 700, 7), (750, 150, 6), (1150, 130, 5),
-    ]
-
-    for x, y, r in orb_positions:
-        color_choice = random.choice([
-            ((0, 200, 255), (0, 150, 200)),
-            ((100, 220, 255), (50, 180, 220)),
-            ((150, 230, 255), (100, 200, 240)),
-        ])
-        draw_memory_orb(draw, x, y, r, color_choice[0], color_choice[1], alpha=random.randint(120, 180))
-
-    # Draw the silhouette (standing firm)
-    silhouette_x = WIDTH // 2
-    silhouette_y = HEIGHT - 120
-    draw_silhouette(draw, silhouette_x, silhouette_y, scale=1.35, color=(0, 5, 15))
-
-    # Cold floor reflection
-    for i in range(40):
-        y = HEIGHT - 80 + i
-        alpha = int(40 * (1 - i / 40))
-        draw.line([(silhouette_x - 90, y), (silhouette_x + 90, y)],
-                 fill=(0, 180, 220, alpha), width=2)
-
-    # Strong vignette
-    vignette = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    vignette_draw = ImageDraw.Draw(vignette)
-    for i in range(250):
-        alpha = int(i * 0.5)
-        vignette_draw.rectangle([0, i, WIDTH, i + 1], fill=(5, 10, 25, alpha))
-        vignette_draw.rectangle([0, HEIGHT - i - 1, WIDTH, HEIGHT - i], fill=(5, 10, 25, alpha))
-        vignette_draw.rectangle([i, 0, i + 1, HEIGHT], fill=(5, 10, 25, int(alpha * 0.6)))
-        vignette_draw.rectangle([WIDTH - i - 1, 0, WIDTH - i, HEIGHT], fill=(5, 10, 25, int(alpha * 0.6)))
-
-    img = Image.alpha_composite(img, vignette)
-
-    # Add title
-    draw = ImageDraw.Draw(img)
-    try:
-        font_path = "C:/Users/user/.claude/skills/canvas-design/canvas-fonts/Jura-Light.ttf"
-        title_font = ImageFont.truetype(font_path, 28)
-        subtitle_font = ImageFont.truetype(font_path, 18)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
+            (i + 200, h),
+            (i + 160, h),
+        ], fill=(*params["color"], alpha))
+    return Raster((0, 0), img2, None)
+
+@node_type("coins", LAYER, registry=NODES)
+def coins_node(view, params):
+    """Golden coins in perspective, [x, y, radius] each"""
+    def draw(img):
+        draw = view.draw(img)
+        for x, y, r in params["coins"]:
+            # Golden coin
+            gold_color = (200, 160, 50)
+            highlight = (255, 220, 100)
+            shadow = (120, 90, 20)
+
+            # Coin shadow
+            draw.ellipse([x - r - 3, y - r//3 + 3, x + r + 3, y + r//3 + 6],
+                        fill=(20, 15, 5, 100))
+
+            # Coin body (ellipse for perspective)
+            draw.ellipse([x - r, y - r//3, x + r, y + r//3],
+                        fill=(*gold_color, 220))
+
+            # Coin highlight
+            draw.ellipse([x - r//2, y - r//4, x, y],
+                        fill=(*highlight, 150))
+
+            # Coin edge detail
+            draw.arc([x - r, y - r//3, x + r, y + r//3], 0, 180,
+                    fill=(*shadow, 200), width=2)
+        return img
+    return Drawing(view.size, draw)
+
+@node_type("title", FILTER, registry=NODES)
+def title_node(img, view, params):
+    """draw_title() on a copy; antialiased text blends, so it is a filter"""
+    img = img.copy()
+    draw_title(view.draw(img), params["title"], params["subtitle"], tuple(params["color"]),
+               *params.get("alpha", [200, 150]))
+    return img
 
-    draw.text((WIDTH // 2, HEIGHT - 50), "정 의", font=title_font, fill=(0, 220, 255, 200), anchor="mm")
-    draw.text((WIDTH // 2, HEIGHT - 25), "JUSTICE", font=subtitle_font, fill=(0, 220, 255, 150), anchor="mm")
+# Endings as layer graphs; coordinates are for WIDTH x HEIGHT (center 960, 540)
+SPECS = {
+    # Mercy Ending - warm, hopeful
+    "ending_mercy": {
+        "id": "ending_mercy",
+        "size": [WIDTH, HEIGHT],
+        "layers": [
+            # Base - deep dark blue transitioning to warm
+            {"name": "background", "type": "solid", "color": [10, 8, 20, 255]},
+            # Warm golden light from behind the figure (sunrise effect):
+            # gold -> soft orange
+            {"name": "light_gradient", "type": "radial_light", "center": [960, 440], "radius": 800,
+             "steps": 160, "color": [[255, 220, 150], [255, 180, 80]], "alpha": {"start": 180, "fade": 0.7}},
+            # Tapered rays, 21px half-width at the source, fading along their length
+            {"name": "light_rays", "type": "rays", "center": [960, 440], "count": 16, "length": 600,
+             "width": 21, "color": [255, 230, 180], "alpha": 30, "taper": 1.0, "profile": "fade"},
+            # Floating memory orbs (warm, gentle): gold, amber, soft white
+            {"name": "memory_orbs", "type": "orbs", "positions": [
+                [300, 200, 12], [450, 350, 8], [250, 500, 10],
+                [1620, 180, 11], [1500, 400, 9], [1700, 550, 7],
+                [600, 150, 6], [1300, 200, 8], [400, 650, 9],
+                [1550, 650, 10], [800, 100, 7], [1100, 120, 6],
+                [200, 350, 5], [1750, 350, 6], [550, 500, 7],
+                [1400, 500, 5], [700, 280, 8], [1200, 350, 7]],
+             "palette": [[[255, 220, 150], [255, 200, 100]],
+                         [[255, 240, 200], [255, 220, 150]],
+                         [[255, 200, 120], [255, 180, 80]]],
+             "alpha": [150, 220], "motion": {"bob": 6}},
+            # Figure standing in light
+            {"name": "silhouette", "type": "coat_figure", "x": 960, "y": 930, "scale": 1.3,
+             "color": [5, 5, 15]},
+            # Subtle floor reflection
+            {"name": "reflection", "type": "reflection", "x": 960, "y": 980, "half_width": 80,
+             "rows": 50, "color": [255, 220, 150], "alpha": 30},
+            {"name": "vignette", "type": "vignette", "depth": 200, "strength": 80, "sides": 0.5,
+             "color": [10, 8, 20]},
+            # Korean title at bottom
+            {"name": "title", "type": "title", "title": "자 비", "subtitle": "MERCY",
+             "color": [255, 230, 180]},
+        ],
+    },
+    # Justice Ending - cold, resolute
+    "ending_justice": {
+        "id": "ending_justice",
+        "size": [WIDTH, HEIGHT],
+        "layers": [
+            # Base - cold deep blue/black
+            {"name": "background", "type": "solid", "color": [5, 10, 25, 255]},
+            # Cold cyan light
+            {"name": "light_gradient", "type": "radial_light", "center": [960, 440], "radius": 700,
+             "steps": 140, "color": [[30, 180, 220], [0, 0, 0]], "alpha": {"start": 150, "fade": 0.6}},
+            {"name": "scales", "type": "scales", "center": [960, 360], "beam_width": 300,
+             "color": [0, 200, 255, 180]},
+            # Glow: the whole frame blurred as three chained radius-1 passes
+            {"name": "scales_glow", "type": "blur", "radius": 1, "passes": 3},
+            {"name": "shadows", "type": "shadows", "step": 80, "alpha": [10, 30], "color": [0, 50, 80]},
+            # Floating memory orbs (cold, precise)
+            {"name": "memory_orbs", "type": "orbs", "positions": [
+                [280, 250, 10], [400, 400, 7], [200, 600, 9],
+                [1640, 220, 9], [1520, 450, 8], [1720, 600, 6],
+                [550, 200, 5], [1350, 180, 7], [350, 700, 8],
+                [1600, 700, 7], [750, 150, 6], [1150, 130, 5]],
+             "palette": [[[0, 200, 255], [0, 150, 200]],
+                         [[100, 220, 255], [50, 180, 220]],
+                         [[150, 230, 255], [100, 200, 240]]],
+             "alpha": [120, 180], "motion": {"bob": 4}},
+            # Standing firm
+            {"name": "silhouette", "type": "coat_figure", "x": 960, "y": 960, "scale": 1.35,
+             "color": [0, 5, 15]},
+            # Cold floor reflection
+            {"name": "reflection", "type": "reflection", "x": 960, "y": 1000, "half_width": 90,
+             "rows": 40, "color": [0, 180, 220], "alpha": 40},
+            # Strong vignette
+            {"name": "vignette", "type": "vignette", "depth": 250, "strength": 125, "sides": 0.6,
+             "color": [5, 10, 25]},
+            {"name": "title", "type": "title", "title": "정 의", "subtitle": "JUSTICE",
+             "color": [0, 220, 255]},
+        ],
+    },
+    # Profit Ending - golden but lonely
+    "ending_profit": {
+        "id": "ending_profit",
+        "size": [WIDTH, HEIGHT],
+        "layers": [
+            # Base - very dark, almost black
+            {"name": "background", "type": "solid", "color": [8, 5, 10, 255]},
+            # Dim golden glow around the figure only
+            {"name": "light_gradient", "type": "radial_light", "center": [960, 880], "radius": 400,
+             "steps": 80, "color": {"start": [180, 140, 40], "fade": [0.5, 0.6, 0.8]},
+             "alpha": {"start": 80, "fade": 0.7}},
+            # Coins scattered around, more near the figure
+            {"name": "coins", "type": "coins", "coins": [
+                [400, 750, 25], [500, 800, 20], [350, 850, 18],
+                [1520, 780, 22], [1400, 830, 19], [1600, 870, 16],
+                [600, 820, 15], [1300, 790, 17], [450, 900, 14],
+                [1550, 900, 13], [700, 870, 12], [1200, 850, 15],
+                [300, 800, 12], [1700, 820, 14], [550, 880, 11],
+                [850, 850, 20], [1070, 860, 18], [920, 890, 16],
+                [1000, 880, 15], [880, 920, 14], [1050, 910, 13]]},
+            # Floating memory orbs (golden but dim, fewer)
+            {"name": "memory_orbs", "type": "orbs", "positions": [
+                [350, 300, 8], [1600, 350, 7], [280, 550, 6],
+                [1680, 500, 5], [500, 450, 5], [1450, 420, 6],
+                [420, 600, 4], [1550, 580, 5]],
+             "palette": [[[200, 160, 60], [150, 120, 30]],
+                         [[180, 140, 40], [130, 100, 20]]],
+             "alpha": [80, 130], "motion": {"bob": 3}},
+            # Alone, surrounded by wealth
+            {"name": "silhouette", "type": "coat_figure", "x": 960, "y": 980, "scale": 1.25,
+             "color": [3, 2, 5]},
+            # Minimal golden reflection
+            {"name": "reflection", "type": "reflection", "x": 960, "y": 1020, "half_width": 70,
+             "rows": 30, "color": [180, 140, 50], "alpha": 25},
+            # Heavy vignette (emphasize isolation)
+            {"name": "vignette", "type": "vignette", "depth": 350, "strength": 210, "sides": 0.8,
+             "color": [8, 5, 10]},
+            {"name": "title", "type": "title", "title": "이 익", "subtitle": "PROFIT",
+             "color": [200, 160, 60], "alpha": [180, 130]},
+        ],
+    },
+}
+
+def render_ending(asset_id, output_path=None, variants=None):
+    """Evaluate an ending's layer graph, then save it and its variants"""
+    print(f"Creating {asset_id}.png...")
+    spec = SPECS[asset_id]
+    timer = StageTimer(spec["size"])
+    img = evaluate(spec, NODES, timer=timer)
 
+    # Save
+    timer("save")
     img = img.convert('RGB')
-    img.save(os.path.join(OUTPUT_DIR, 'ending_justice.png'), 'PNG', quality=95)
-    print("  -> ending_justice.png saved!")
-
-def create_ending_profit():
-    """Create the Profit Ending illustration - golden but lonely"""
-    print("Creating ending_profit.png...")
-
-    # Base - very dark, almost black
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (8, 5, 10, 255))
-    draw = ImageDraw.Draw(img)
-
-    # Minimal golden light - isolated pools
-    center = (WIDTH // 2, HEIGHT - 200)
-
-    # Dim golden glow around figure only
-    for radius in range(400, 0, -5):
-        ratio = radius / 400
-        r = int(180 * (1 - ratio * 0.5))
-        g = int(140 * (1 - ratio * 0.6))
-        b = int(40 * (1 - ratio * 0.8))
-        alpha = int(80 * (1 - ratio * 0.7))
-
-        draw.ellipse([center[0] - radius, center[1] - radius,
-                     center[0] + radius, center[1] + radius],
-                    fill=(r, g, b, min(255, alpha)))
-
-    # Draw coins scattered around
-    coin_positions = [
-        (400, 750, 25), (500, 800, 20), (350, 850, 18),
-        (1520, 780, 22), (1400, 830, 19), (1600, 870, 16),
-        (600, 820, 15), (1300, 790, 17), (450, 900, 14),
-        (1550, 900, 13), (700, 870, 12), (1200, 850, 15),
-        (300, 800, 12), (1700, 820, 14), (550, 880, 11),
-        # More coins near the figure
-        (850, 850, 20), (1070, 860, 18), (920, 890, 16),
-        (1000, 880, 15), (880, 920, 14), (1050, 910, 13),
-    ]
+    output_path = output_path or os.path.join(OUTPUT_DIR, f'{asset_id}.png')
+    save_image(img, output_path)
+    timer("variants")
+    save_variants(img, output_path, variants,
+                  render=lambda scale: render_scaled(spec, scale, NODES).convert('RGB'))
+    timer.done()
+    print(f"  -> {asset_id}.png saved!")
+
+def create_ending_mercy(output_path=None, variants=None):
+    """Create the Mercy Ending illustration - warm, hopeful"""
+    render_ending("ending_mercy", output_path, variants)
 
-    for x, y, r in coin_positions:
-        # Golden coin
-        gold_color = (200, 160, 50)
-        highlight = (255, 220, 100)
-        shadow = (120, 90, 20)
-
-        # Coin shadow
-        draw.ellipse([x - r - 3, y - r//3 + 3, x + r + 3, y + r//3 + 6],
-                    fill=(20, 15, 5, 100))
-
-        # Coin body (ellipse for perspective)
-        draw.ellipse([x - r, y - r//3, x + r, y + r//3],
-                    fill=(*gold_color, 220))
-
-        # Coin highlight
-        draw.ellipse([x - r//2, y - r//4, x, y],
-                    fill=(*highlight, 150))
-
-        # Coin edge detail
-        draw.arc([x - r, y - r//3, x + r, y + r//3], 0, 180,
-                fill=(*shadow, 200), width=2)
-
-    # Floating memory orbs (golden but dim, fewer)
-    orb_positions = [
-        (350, 300, 8), (1600, 350, 7), (280, 550, 6),
-        (1680, 500, 5), (500, 450, 5), (1450, 420, 6),
-        (420, 600, 4), (1550, 580, 5),
-    ]
+def create_ending_justice(output_path=None, variants=None):
+    """Create the Justice Ending illustration - cold, resolute"""
+    render_ending("ending_justice", output_path, variants)
 
-    for x, y, r in orb_positions:
-        color_choice = random.choice([
-            ((200, 160, 60), (150, 120, 30)),
-            ((180, 140, 40), (130, 100, 20)),
-        ])
-        draw_memory_orb(draw, x, y, r, color_choice[0], color_choice[1], alpha=random.randint(80, 130))
-
-    # Draw the silhouette (alone, surrounded by wealth)
-    silhouette_x = WIDTH // 2
-    silhouette_y = HEIGHT - 100
-    draw_silhouette(draw, silhouette_x, silhouette_y, scale=1.25, color=(3, 2, 5))
-
-    # Minimal golden reflection
-    for i in range(30):
-        y = HEIGHT - 60 + i
-        alpha = int(25 * (1 - i / 30))
-        draw.line([(silhouette_x - 70, y), (silhouette_x + 70, y)],
-                 fill=(180, 140, 50, alpha), width=2)
-
-    # Heavy vignette (emphasize isolation)
-    vignette = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    vignette_draw = ImageDraw.Draw(vignette)
-    for i in range(350):
-        alpha = int(i * 0.6)
-        vignette_draw.rectangle([0, i, WIDTH, i + 1], fill=(8, 5, 10, min(255, alpha)))
-        vignette_draw.rectangle([0, HEIGHT - i - 1, WIDTH, HEIGHT - i], fill=(8, 5, 10, min(255, alpha)))
-        vignette_draw.rectangle([i, 0, i + 1, HEIGHT], fill=(8, 5, 10, min(255, int(alpha * 0.8))))
-        vignette_draw.rectangle([WIDTH - i - 1, 0, WIDTH - i, HEIGHT], fill=(8, 5, 10, min(255, int(alpha * 0.8))))
-
-    img = Image.alpha_composite(img, vignette)
-
-    # Add title
-    draw = ImageDraw.Draw(img)
-    try:
-        font_path = "C:/Users/user/.claude/skills/canvas-design/canvas-fonts/Jura-Light.ttf"
-        title_font = ImageFont.truetype(font_path, 28)
-        subtitle_font = ImageFont.truetype(font_path, 18)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
+def create_ending_profit(output_path=None, variants=None):
+    """Create the Profit Ending illustration - golden but lonely"""
+    render_ending("ending_profit", output_path, variants)
 
-    draw.text((WIDTH // 2, HEIGHT - 50), "이 익", font=title_font, fill=(200, 160, 60, 180), anchor="mm")
-    draw.text((WIDTH // 2, HEIGHT - 25), "PROFIT", font=subtitle_font, fill=(200, 160, 60, 130), anchor="mm")
+# Layered scenes for the frame-sequence mode (animate_endings.py)
+SCENES = {asset_id: partial(to_scene, spec, NODES) for asset_id, spec in SPECS.items()}
 
-    img = img.convert('RGB')
-    img.save(os.path.join(OUTPUT_DIR, 'ending_profit.png'), 'PNG', quality=95)
-    print("  -> ending_profit.png saved!")
+def jobs(output_dir=OUTPUT_DIR):
+    """List (asset_id, create function, args) for every ending"""
+    endings = [
+        ("ending_mercy", create_ending_mercy),
+        ("ending_justice", create_ending_justice),
+        ("ending_profit", create_ending_profit),
+    ]
+    return [(asset_id, func, (os.path.join(output_dir, asset_id + ".png"),))
+            for asset_id, func in endings]
 
 if __name__ == "__main__":
     print("=" * 50)
@@ -484,9 +413,8 @@ if __name__ == "__main__":
     print("=" * 50)
     print()
 
-    create_ending_mercy()
-    create_ending_justice()
-    create_ending_profit()
+    for asset_id, func, args in jobs():
+        func(*args)
 
     print()
     print("=" * 50)
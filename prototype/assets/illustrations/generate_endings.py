@@ -4,39 +4,25 @@ Spectral Emergence Design Philosophy
 For 기억의 전당포 (Memory Pawnshop)
 """
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
-import math
-import random
+from functools import partial
 import os
+import sys
 
-random.seed(42)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.encode import save_image
+from pipeline.layergraph import LAYER, Drawing, node_type, evaluate, render_scaled, to_scene
+from pipeline.profiling import StageTimer
+from pipeline.variants import ENDING_VARIANTS, save_variants
+
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Resolution variants written by the batch builder's --variants mode
+VARIANTS = ENDING_VARIANTS
 
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-def create_gradient_background(size, colors, direction='vertical'):
-    """Create smooth gradient background"""
-    img = Image.new('RGB', size, colors[0])
-    draw = ImageDraw.Draw(img)
-
-    if direction == 'vertical':
-        for y in range(size[1]):
-            ratio = y / size[1]
-            r = int(colors[0][0] * (1-ratio) + colors[1][0] * ratio)
-            g = int(colors[0][1] * (1-ratio) + colors[1][1] * ratio)
-            b = int(colors[0][2] * (1-ratio) + colors[1][2] * ratio)
-            draw.line([(0, y), (size[0], y)], fill=(r, g, b))
-    else:
-        for x in range(size[0]):
-            ratio = x / size[0]
-            r = int(colors[0][0] * (1-ratio) + colors[1][0] * ratio)
-            g = int(colors[0][1] * (1-ratio) + colors[1][1] * ratio)
-            b = int(colors[0][2] * (1-ratio) + colors[1][2] * ratio)
-            draw.line([(x, 0), (x, size[1])], fill=(r, g, b))
-
-    return img
-
 def draw_silhouette_figure(draw, cx, cy, scale, color):
     """Draw a single standing figure silhouette"""
     # Head
@@ -53,274 +39,241 @@ def draw_silhouette_figure(draw, cx, cy, scale, color):
     ]
     draw.polygon(body_points, fill=color)
 
-def add_light_rays(img, center, color, num_rays=12, length=400):
-    """Add dramatic light rays"""
-    draw = ImageDraw.Draw(img, 'RGBA')
-    cx, cy = center
-
-    for i in range(num_rays):
-        angle = (i / num_rays) * 2 * math.pi + random.uniform(-0.1, 0.1)
-        end_x = cx + int(math.cos(angle) * length)
-        end_y = cy + int(math.sin(angle) * length)
-
-        # Draw ray with gradient alpha
-        for w in range(30, 0, -1):
-            alpha = int(30 * (w / 30))
-            ray_color = (*color, alpha)
-            draw.line([(cx, cy), (end_x, end_y)], fill=ray_color, width=w)
-
-    return img
-
-def add_particles(draw, size, color, density=100, particle_size=3):
-    """Add floating particles/memories"""
-    for _ in range(density):
-        x = random.randint(0, size[0])
-        y = random.randint(0, size[1])
-        s = random.randint(1, particle_size)
-        alpha = random.randint(50, 200)
-        draw.ellipse([x-s, y-s, x+s, y+s], fill=(*color, alpha))
-
-def create_ending_liberator(output_path):
-    """Liberator ending - exposing the truth"""
-    size = (1920, 1080)
-    # Dark red/crimson theme
-    img = create_gradient_background(size, [(20, 8, 8), (50, 15, 20)])
-    img = img.convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    # Add dramatic red light from center
-    cx, cy = size[0]//2, size[1]//2
-    color = hex_to_rgb("#FF4444")
-
-    # Light burst effect
-    for r in range(500, 0, -5):
-        alpha = int(30 * (1 - r/500))
-        draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=(*color, alpha))
-
-    # Two silhouettes standing together (protagonist and sister)
-    draw_silhouette_figure(draw, cx - 80, cy + 100, 1.0, (15, 10, 10, 255))
-    draw_silhouette_figure(draw, cx + 80, cy + 100, 0.9, (15, 10, 10, 255))
-
-    # Add broken chain/shattered glass effect
-    for _ in range(50):
-        x = random.randint(cx-300, cx+300)
-        y = random.randint(cy-200, cy+100)
-        size_s = random.randint(5, 20)
-        points = [
-            (x, y - size_s),
-            (x + size_s, y),
-            (x, y + size_s),
-            (x - size_s, y),
-        ]
-        alpha = random.randint(100, 200)
-        draw.polygon(points, fill=(200, 50, 50, alpha))
-
-    # Add particles
-    add_particles(draw, size, color, 150)
-
-    # Add subtle vignette
-    for i in range(200):
-        alpha = int(200 * (i/200))
-        draw.rectangle([i, i, size[0]-i, size[1]-i], outline=(0, 0, 0, alpha))
-
+# Layer-graph node types for this file's motifs
+NODES = {}
+
+@node_type("figures", LAYER, registry=NODES)
+def figures_node(view, params):
+    """Standing figures, [x, y, scale, rgba] each"""
+    def draw(img):
+        draw = view.draw(img)
+        for x, y, scale, color in params["figures"]:
+            draw_silhouette_figure(draw, x, y, scale, tuple(color))
+        return img
+    return Drawing(view.size, draw)
+
+def sample_shards(params, rng):
+    x0, y0, x1, y1 = params["box"]
+    shards = []
+    for _ in range(params["count"]):
+        x = rng.randint(x0, x1)
+        y = rng.randint(y0, y1)
+        size_s = rng.randint(*params["size"])
+        alpha = rng.randint(*params["alpha"])
+        shards.append([x, y, size_s, alpha])
+    return dict(params, shards=shards)
+
+@node_type("shards", LAYER, sample=sample_shards, registry=NODES)
+def shards_node(view, params):
+    """Broken chain/shattered glass diamonds"""
+    def draw(img):
+        draw = view.draw(img)
+        for x, y, size_s, alpha in params["shards"]:
+            points = [
+                (x, y - size_s),
+                (x + size_s, y),
+                (x, y + size_s),
+                (x - size_s, y),
+            ]
+            draw.polygon(points, fill=(*params["color"], alpha))
+        return img
+    return Drawing(view.size, draw)
+
+@node_type("horizon_line", LAYER, registry=NODES)
+def horizon_line_node(view, params):
+    """Rows fading out linearly `falloff` rows either side of `row`"""
+    row, falloff, peak = params["row"], params["falloff"], params["alpha"]
+
+    def draw(img):
+        draw = view.draw(img)
+        for y in range(row - falloff, row + falloff):
+            alpha = int(peak * (1 - abs(y - row)/falloff))
+            draw.line([(0, y), (view.design[0], y)], fill=(*params["color"], max(0, alpha)))
+        return img
+    return Drawing(view.size, draw)
+
+# Endings as layer graphs; coordinates are for 1920x1080 (center 960, 540)
+SPECS = {
+    # Liberator ending - exposing the truth
+    "ending_liberator": {
+        "id": "ending_liberator",
+        "size": [1920, 1080],
+        "layers": [
+            # Dark red/crimson theme
+            {"name": "background", "type": "linear_gradient", "colors": [[20, 8, 8], [50, 15, 20]]},
+            # Dramatic red light burst from center
+            {"name": "light_burst", "type": "radial_light", "center": [960, 540], "radius": 500,
+             "steps": 100, "color": [255, 68, 68], "alpha": [30, 0]},
+            # Two silhouettes standing together (protagonist and sister)
+            {"name": "silhouettes", "type": "figures", "figures": [
+                [880, 640, 1.0, [15, 10, 10, 255]], [1040, 640, 0.9, [15, 10, 10, 255]]]},
+            # Broken chain/shattered glass effect
+            {"name": "shards", "type": "shards", "count": 50, "box": [660, 340, 1260, 640],
+             "size": [5, 20], "alpha": [100, 200], "color": [200, 50, 50]},
+            {"name": "particles", "type": "particles", "count": 150, "box": [0, 0, 1920, 1080],
+             "size": [1, 3], "alpha": [50, 200], "color": [255, 68, 68],
+             "motion": {"rise": 1, "sway": 6}},
+            # Subtle vignette
+            {"name": "vignette", "type": "vignette", "depth": 200, "strength": 200},
+        ],
+    },
+    # Forgotten ending - erased memories, solitude
+    "ending_forgotten": {
+        "id": "ending_forgotten",
+        "size": [1920, 1080],
+        "layers": [
+            # Muted purple/gray theme
+            {"name": "background", "type": "linear_gradient", "colors": [[15, 15, 25], [40, 35, 55]]},
+            # Single solitary figure, fading
+            {"name": "silhouettes", "type": "figures", "figures": [
+                [960, 640, 1.0, [20, 18, 30, 250]], [970, 640, 1.0, [20, 18, 30, 200]],
+                [980, 640, 1.0, [20, 18, 30, 150]], [990, 640, 1.0, [20, 18, 30, 100]],
+                [1000, 640, 1.0, [20, 18, 30, 50]]]},
+            # Fading/dissolving particles rising upward
+            {"name": "particles", "type": "particles", "count": 200, "box": [810, 0, 1110, 1080],
+             "size": [1, 4], "alpha": {"fade": 150}, "color": [153, 153, 187],
+             "motion": {"rise": 1, "sway": 4}},
+            # Fog/mist at bottom, its top edge slowly breathing
+            {"name": "fog", "type": "band", "rows": [540, 1080], "color": [100, 95, 120],
+             "alpha": [0, 80], "motion": {"breathe": 30}},
+            {"name": "vignette", "type": "vignette", "depth": 250, "strength": 220},
+        ],
+    },
+    # Returner ending - family reunion, warm
+    "ending_return": {
+        "id": "ending_return",
+        "size": [1920, 1080],
+        "layers": [
+            # Warm gold/amber theme
+            {"name": "background", "type": "linear_gradient", "colors": [[25, 18, 10], [60, 45, 25]]},
+            # Warm light glow from behind figures, gently pulsing
+            {"name": "glow", "type": "radial_light", "center": [960, 490], "radius": 400,
+             "steps": 100, "color": [255, 215, 0], "alpha": [40, 0], "motion": {"pulse": 0.2}},
+            # Two figures close together (reunion)
+            {"name": "silhouettes", "type": "figures", "figures": [
+                [910, 640, 1.0, [20, 15, 8, 255]], [1010, 640, 0.9, [20, 15, 8, 255]]]},
+            # Warm floating particles (memories returning), gold to orange
+            {"name": "particles", "type": "particles", "count": 120, "box": [0, 0, 1920, 1080],
+             "size": [2, 5], "alpha": [80, 180], "color": [[200, 255], [150, 220], 50],
+             "motion": {"rise": 1, "sway": 8}},
+            # Subtle light rays from top, fanned 0.1 rad apart up to y=0
+            {"name": "light_rays", "type": "rays", "center": [960, 440], "width": 10,
+             "targets": [[727, 0], [783, 0], [841, 0], [901, 0], [960, 0], [1019, 0],
+                         [1079, 0], [1137, 0]],
+             "color": [255, 220, 100], "profile": "solid"},
+            {"name": "vignette", "type": "vignette", "depth": 200, "strength": 180},
+        ],
+    },
+    # Perfect ending - golden, harmonious
+    "ending_perfect": {
+        "id": "ending_perfect",
+        "size": [1920, 1080],
+        "layers": [
+            # Bright gold/white theme
+            {"name": "background", "type": "linear_gradient", "colors": [[30, 28, 20], [80, 70, 50]]},
+            # Radiant light burst; the widest of the old 30 stacked strokes
+            # always covered the rest, so each ray is a solid 30px band
+            {"name": "light_rays", "type": "rays", "center": [960, 440], "count": 16,
+             "length": 600, "width": 15, "color": [255, 250, 200], "profile": "solid"},
+            # Bright center glow
+            {"name": "glow", "type": "radial_light", "center": [960, 440], "radius": 350,
+             "steps": 350 / 3, "color": [255, 250, 220], "alpha": [60, 0]},
+            # Single confident figure in light
+            {"name": "silhouettes", "type": "figures", "figures": [[960, 640, 1.1, [25, 22, 15, 255]]]},
+            # Many bright particles (all memories aligned)
+            {"name": "particles", "type": "particles", "count": 200, "box": [0, 0, 1920, 1080],
+             "size": [2, 6], "alpha": [100, 220], "color": [255, 250, 200],
+             "motion": {"rise": 1, "sway": 6}},
+            # Circular halo, pulsing
+            {"name": "halo", "type": "ring", "center": [960, 440], "radius": 300, "width": 20,
+             "color": [255, 240, 180], "alpha": [255, 15], "motion": {"pulse": 0.15}},
+            # Light vignette
+            {"name": "vignette", "type": "vignette", "depth": 150, "strength": 120},
+        ],
+    },
+    # New start ending - fresh, sky blue, hopeful
+    "ending_new_start": {
+        "id": "ending_new_start",
+        "size": [1920, 1080],
+        "layers": [
+            # Sky blue/cyan theme
+            {"name": "background", "type": "linear_gradient", "colors": [[15, 25, 35], [40, 70, 90]]},
+            # Soft light from horizon
+            {"name": "horizon_glow", "type": "radial_light", "center": [960, 1080],
+             "radii": [600, 300], "steps": 120, "color": [135, 206, 235], "alpha": [25, 0]},
+            # Single figure walking toward horizon (back view)
+            {"name": "silhouettes", "type": "figures", "figures": [[960, 690, 0.8, [10, 15, 20, 255]]]},
+            # Path/road leading to horizon
+            {"name": "road", "type": "polygon", "points": [[760, 1080], [1160, 1080], [980, 740], [940, 740]],
+             "color": [20, 30, 40, 100]},
+            # Soft particles rising (new memories forming)
+            {"name": "particles", "type": "particles", "count": 100, "box": [0, 540, 1920, 1080],
+             "size": [1, 4], "alpha": {"fade": 120}, "color": [135, 206, 235],
+             "motion": {"rise": 1, "sway": 4}},
+            # Horizon line glow
+            {"name": "horizon_line", "type": "horizon_line", "row": 740, "falloff": 20,
+             "alpha": 100, "color": [135, 206, 235]},
+            {"name": "vignette", "type": "vignette", "depth": 200, "strength": 160},
+        ],
+    },
+}
+
+def render_ending(asset_id, output_path, variants=None):
+    """Evaluate an ending's layer graph, then save it and its variants"""
+    spec = SPECS[asset_id]
+    timer = StageTimer(spec["size"])
+    img = evaluate(spec, NODES, timer=timer)
+
+    timer("save")
     img = img.convert('RGB')
-    img.save(output_path, 'PNG')
+    output_path = save_image(img, output_path)
+    timer("variants")
+    save_variants(img, output_path, variants,
+                  render=lambda scale: render_scaled(spec, scale, NODES).convert('RGB'))
+    timer.done()
     print(f"Created: {output_path}")
 
-def create_ending_forgotten(output_path):
-    """Forgotten ending - erased memories, solitude"""
-    size = (1920, 1080)
-    # Muted purple/gray theme
-    img = create_gradient_background(size, [(15, 15, 25), (40, 35, 55)])
-    img = img.convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    color = hex_to_rgb("#9999BB")
-    cx, cy = size[0]//2, size[1]//2
-
-    # Single solitary figure, fading
-    for fade in range(5, 0, -1):
-        alpha = int(50 * fade)
-        offset = (5 - fade) * 10
-        draw_silhouette_figure(draw, cx + offset, cy + 100, 1.0, (20, 18, 30, alpha))
-
-    # Fading/dissolving particles rising upward
-    for _ in range(200):
-        x = random.randint(cx-150, cx+150)
-        y = random.randint(0, size[1])
-        s = random.randint(1, 4)
-        alpha = int(150 * (1 - y/size[1]))
-        draw.ellipse([x-s, y-s, x+s, y+s], fill=(*color, alpha))
-
-    # Fog/mist effect at bottom
-    for y in range(size[1]//2, size[1]):
-        alpha = int(80 * ((y - size[1]//2) / (size[1]//2)))
-        draw.line([(0, y), (size[0], y)], fill=(100, 95, 120, alpha))
-
-    # Add vignette
-    for i in range(250):
-        alpha = int(220 * (i/250))
-        draw.rectangle([i, i, size[0]-i, size[1]-i], outline=(0, 0, 0, alpha))
+def create_ending_liberator(output_path, variants=None):
+    """Liberator ending - exposing the truth"""
+    render_ending("ending_liberator", output_path, variants)
 
-    img = img.convert('RGB')
-    img.save(output_path, 'PNG')
-    print(f"Created: {output_path}")
+def create_ending_forgotten(output_path, variants=None):
+    """Forgotten ending - erased memories, solitude"""
+    render_ending("ending_forgotten", output_path, variants)
 
-def create_ending_return(output_path):
+def create_ending_return(output_path, variants=None):
     """Returner ending - family reunion, warm"""
-    size = (1920, 1080)
-    # Warm gold/amber theme
-    img = create_gradient_background(size, [(25, 18, 10), (60, 45, 25)])
-    img = img.convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    color = hex_to_rgb("#FFD700")
-    cx, cy = size[0]//2, size[1]//2
+    render_ending("ending_return", output_path, variants)
 
-    # Warm light glow from behind figures
-    for r in range(400, 0, -4):
-        alpha = int(40 * (1 - r/400))
-        draw.ellipse([cx-r, cy-50-r, cx+r, cy-50+r], fill=(*color, alpha))
-
-    # Two figures close together (reunion)
-    draw_silhouette_figure(draw, cx - 50, cy + 100, 1.0, (20, 15, 8, 255))
-    draw_silhouette_figure(draw, cx + 50, cy + 100, 0.9, (20, 15, 8, 255))
-
-    # Warm floating particles (memories returning)
-    for _ in range(120):
-        x = random.randint(0, size[0])
-        y = random.randint(0, size[1])
-        s = random.randint(2, 5)
-        alpha = random.randint(80, 180)
-        # Gold to orange variation
-        r_var = random.randint(200, 255)
-        g_var = random.randint(150, 220)
-        draw.ellipse([x-s, y-s, x+s, y+s], fill=(r_var, g_var, 50, alpha))
-
-    # Subtle light rays from top
-    for i in range(8):
-        angle = math.pi/2 + (i - 4) * 0.1
-        x1 = cx + int(math.cos(angle + math.pi) * 600)
-        y1 = 0
-        for w in range(20, 0, -1):
-            alpha = int(20 * (w/20))
-            draw.line([(cx, cy-100), (x1, y1)], fill=(255, 220, 100, alpha), width=w)
-
-    # Vignette
-    for i in range(200):
-        alpha = int(180 * (i/200))
-        draw.rectangle([i, i, size[0]-i, size[1]-i], outline=(0, 0, 0, alpha))
-
-    img = img.convert('RGB')
-    img.save(output_path, 'PNG')
-    print(f"Created: {output_path}")
-
-def create_ending_perfect(output_path):
+def create_ending_perfect(output_path, variants=None):
     """Perfect ending - golden, harmonious"""
-    size = (1920, 1080)
-    # Bright gold/white theme
-    img = create_gradient_background(size, [(30, 28, 20), (80, 70, 50)])
-    img = img.convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    color = hex_to_rgb("#FFFACD")
-    cx, cy = size[0]//2, size[1]//2
-
-    # Radiant light burst
-    img = add_light_rays(img, (cx, cy-100), (255, 250, 200), 16, 600)
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    # Bright center glow
-    for r in range(350, 0, -3):
-        alpha = int(60 * (1 - r/350))
-        draw.ellipse([cx-r, cy-100-r, cx+r, cy-100+r], fill=(255, 250, 220, alpha))
-
-    # Single confident figure in light
-    draw_silhouette_figure(draw, cx, cy + 100, 1.1, (25, 22, 15, 255))
-
-    # Many bright particles (all memories aligned)
-    for _ in range(200):
-        x = random.randint(0, size[0])
-        y = random.randint(0, size[1])
-        s = random.randint(2, 6)
-        alpha = random.randint(100, 220)
-        draw.ellipse([x-s, y-s, x+s, y+s], fill=(255, 250, 200, alpha))
-
-    # Circular halo effect
-    for r in range(280, 320):
-        alpha = 255 - int(abs(r - 300) * 12)
-        draw.ellipse([cx-r, cy-100-r, cx+r, cy-100+r], outline=(255, 240, 180, max(0, alpha)))
+    render_ending("ending_perfect", output_path, variants)
 
-    # Light vignette
-    for i in range(150):
-        alpha = int(120 * (i/150))
-        draw.rectangle([i, i, size[0]-i, size[1]-i], outline=(0, 0, 0, alpha))
-
-    img = img.convert('RGB')
-    img.save(output_path, 'PNG')
-    print(f"Created: {output_path}")
-
-def create_ending_new_start(output_path):
+def create_ending_new_start(output_path, variants=None):
     """New start ending - fresh, sky blue, hopeful"""
-    size = (1920, 1080)
-    # Sky blue/cyan theme
-    img = create_gradient_background(size, [(15, 25, 35), (40, 70, 90)])
-    img = img.convert('RGBA')
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    color = hex_to_rgb("#87CEEB")
-    cx, cy = size[0]//2, size[1]//2
-
-    # Soft light from horizon
-    for r in range(600, 0, -5):
-        alpha = int(25 * (1 - r/600))
-        draw.ellipse([cx-r, size[1]-r//2, cx+r, size[1]+r], fill=(135, 206, 235, alpha))
-
-    # Single figure walking toward horizon (back view)
-    figure_y = cy + 150
-    draw_silhouette_figure(draw, cx, figure_y, 0.8, (10, 15, 20, 255))
-
-    # Path/road leading to horizon
-    road_points = [
-        (cx - 200, size[1]),
-        (cx + 200, size[1]),
-        (cx + 20, cy + 200),
-        (cx - 20, cy + 200),
+    render_ending("ending_new_start", output_path, variants)
+
+# Layered scenes for the frame-sequence mode (animate_endings.py)
+SCENES = {asset_id: partial(to_scene, spec, NODES) for asset_id, spec in SPECS.items()}
+
+def jobs(output_dir=OUTPUT_DIR):
+    """List (asset_id, create function, args) for every ending"""
+    endings = [
+        ("ending_liberator", create_ending_liberator),
+        ("ending_forgotten", create_ending_forgotten),
+        ("ending_return", create_ending_return),
+        ("ending_perfect", create_ending_perfect),
+        ("ending_new_start", create_ending_new_start),
     ]
-    draw.polygon(road_points, fill=(20, 30, 40, 100))
-
-    # Soft particles rising (new memories forming)
-    for _ in range(100):
-        x = random.randint(0, size[0])
-        y = random.randint(cy, size[1])
-        s = random.randint(1, 4)
-        alpha = int(120 * (1 - (y - cy)/(size[1] - cy)))
-        draw.ellipse([x-s, y-s, x+s, y+s], fill=(*color, alpha))
-
-    # Horizon line glow
-    for y in range(cy + 180, cy + 220):
-        alpha = int(100 * (1 - abs(y - cy - 200)/20))
-        draw.line([(0, y), (size[0], y)], fill=(135, 206, 235, max(0, alpha)))
-
-    # Vignette
-    for i in range(200):
-        alpha = int(160 * (i/200))
-        draw.rectangle([i, i, size[0]-i, size[1]-i], outline=(0, 0, 0, alpha))
-
-    img = img.convert('RGB')
-    img.save(output_path, 'PNG')
-    print(f"Created: {output_path}")
+    return [(asset_id, func, (os.path.join(output_dir, asset_id + ".png"),))
+            for asset_id, func in endings]
 
 def main():
-    output_dir = r"C:\Users\user\projects\2026_active\neowiz_quest\prototype\assets\illustrations"
-    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # Generate each ending illustration
-    create_ending_liberator(os.path.join(output_dir, "ending_liberator.png"))
-    create_ending_forgotten(os.path.join(output_dir, "ending_forgotten.png"))
-    create_ending_return(os.path.join(output_dir, "ending_return.png"))
-    create_ending_perfect(os.path.join(output_dir, "ending_perfect.png"))
-    create_ending_new_start(os.path.join(output_dir, "ending_new_start.png"))
+    for asset_id, func, args in jobs(OUTPUT_DIR):
+        func(*args)
 
     print("\nAll ending illustrations generated successfully!")
 
@@ -0,0 +1,7 @@
+"""
+Shared rendering pipeline for the asset generators
+For 기억의 전당포 (Memory Pawnshop)
+
+The scripts under illustrations/, portraits/ and ui/ import these modules
+after adding the assets directory to sys.path.
+"""
@@ -0,0 +1,141 @@
+"""
+Texture atlas packer for portraits and UI icons
+Shelf-packs generated PNGs into a few atlas pages with padding and edge
+extrusion, and writes a JSON manifest plus one Godot AtlasTexture .tres
+per key, so a scene binds one texture instead of one per character
+"""
+
+from collections import namedtuple
+import json
+import os
+
+from PIL import Image
+
+from pipeline.encode import save_image
+
+Region = namedtuple('Region', ['page', 'x', 'y', 'w', 'h'])
+
+def res_path(path):
+    """Godot res:// path of a file inside the project, or None outside it"""
+    path = os.path.abspath(path)
+    root = os.path.dirname(path)
+    while not os.path.exists(os.path.join(root, "project.godot")):
+        parent = os.path.dirname(root)
+        if parent == root:
+            return None
+        root = parent
+    return "res://" + os.path.relpath(path, root).replace(os.sep, "/")
+
+def _align(value, multiple=4):
+    return -(-value // multiple) * multiple
+
+def pack(sizes, max_size=4096, padding=2):
+    """Shelf-pack (w, h) rects onto pages of at most max_size square
+
+    Tallest rects are placed first, left to right on shelves. Every rect
+    keeps `padding` free pixels on each side. Returns ([(page, x, y)]
+    in input order, [page (w, h)]); page sizes are trimmed to what is
+    used and rounded up to a multiple of 4 for block compression.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placed = [None] * len(sizes)
+    pages = []  # [shelves, used_w, used_h]; shelf = [y, height, next_x]
+
+    for i in order:
+        w, h = sizes[i][0] + 2 * padding, sizes[i][1] + 2 * padding
+        if w > max_size or h > max_size:
+            raise ValueError(f"{sizes[i]} does not fit a {max_size}px atlas page")
+        for page_index, page in enumerate(pages):
+            shelves = page[0]
+            shelf = next((s for s in shelves if s[1] >= h and s[2] + w <= max_size), None)
+            if shelf is None:
+                top = shelves[-1][0] + shelves[-1][1]
+                if top + h > max_size:
+                    continue
+                shelf = [top, h, 0]
+                shelves.append(shelf)
+            break
+        else:
+            shelf = [0, h, 0]
+            pages.append([[shelf], 0, 0])
+            page_index = len(pages) - 1
+        placed[i] = (page_index, shelf[2] + padding, shelf[0] + padding)
+        shelf[2] += w
+        page = pages[page_index]
+        page[1] = max(page[1], shelf[2])
+        page[2] = max(page[2], shelf[0] + shelf[1])
+
+    return placed, [(_align(pw), _align(ph)) for _, pw, ph in pages]
+
+def _extrude(page, img, x, y, amount):
+    """Paste img at (x, y) and repeat its edge pixels `amount` px outward"""
+    w, h = img.size
+    page.paste(img, (x, y))
+    if amount <= 0:
+        return
+    # Columns first, then rows taken from the widened strip so the
+    # corners get the corner pixel
+    page.paste(img.crop((0, 0, 1, h)).resize((amount, h)), (x - amount, y))
+    page.paste(img.crop((w - 1, 0, w, h)).resize((amount, h)), (x + w, y))
+    row = page.crop((x - amount, y, x + w + amount, y + 1))
+    page.paste(row.resize((w + 2 * amount, amount)), (x - amount, y - amount))
+    row = page.crop((x - amount, y + h - 1, x + w + amount, y + h))
+    page.paste(row.resize((w + 2 * amount, amount)), (x - amount, y + h))
+
+def _tres(texture_path, region):
+    return (
+        '[gd_resource type="AtlasTexture" load_steps=2 format=3]\n\n'
+        f'[ext_resource type="Texture2D" path="{texture_path}" id="1_page"]\n\n'
+        '[resource]\n'
+        'atlas = ExtResource("1_page")\n'
+        f'region = Rect2({region.x}, {region.y}, {region.w}, {region.h})\n'
+    )
+
+def build_atlas(sources, output_dir, name, aliases=None, max_size=4096, padding=2,
+                extrude=None, mode='RGBA', profile=None):
+    """Pack {key: png path} into `name`_N.png pages under output_dir
+
+    aliases maps extra keys (e.g. dialogue portrait_keys) onto source
+    keys. Writes the pages, `name`.json and `name`/<key>.tres for every
+    key and alias; returns {key: Region}. Padding is filled by extruding
+    each image's edges (extrude defaults to the full padding) so
+    filtering never samples a neighbour. Pages are encoded with the
+    given encode profile.
+    """
+    extrude = padding if extrude is None else min(extrude, padding)
+    keys = list(sources)
+    images = [Image.open(sources[key]).convert(mode) for key in keys]
+    placed, page_sizes = pack([img.size for img in images], max_size, padding)
+
+    pages = [Image.new(mode, size, (0,) * len(mode)) for size in page_sizes]
+    regions = {}
+    for key, img, (page, x, y) in zip(keys, images, placed):
+        _extrude(pages[page], img, x, y, extrude)
+        regions[key] = Region(page, x, y, *img.size)
+    for alias, key in (aliases or {}).items():
+        if key in regions:
+            regions[alias] = regions[key]
+
+    os.makedirs(output_dir, exist_ok=True)
+    page_paths = [save_image(page, os.path.join(output_dir, f"{name}_{i}.png"), profile)
+                  for i, page in enumerate(pages)]
+
+    tres_dir = os.path.join(output_dir, name)
+    os.makedirs(tres_dir, exist_ok=True)
+    for key, region in regions.items():
+        page_path = page_paths[region.page]
+        # Outside a Godot project, fall back to a path relative to the .tres
+        texture = res_path(page_path) or os.path.relpath(page_path, tres_dir).replace(os.sep, "/")
+        with open(os.path.join(tres_dir, f"{key}.tres"), "w", encoding="utf-8") as f:
+            f.write(_tres(texture, region))
+
+    manifest = {
+        "pages": [os.path.basename(p) for p in page_paths],
+        "padding": padding,
+        "regions": {key: r._asdict() for key, r in sorted(regions.items())},
+    }
+    with open(os.path.join(output_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"Atlas: {name} ({len(sources)} images, {len(pages)} page(s) "
+          f"{', '.join(f'{w}x{h}' for w, h in page_sizes)})")
+    return regions
@@ -0,0 +1,107 @@
+"""
+Band-parallel filtering and compositing for large images
+Pillow releases the GIL inside filter() and alpha_composite(), so an
+image split into horizontal bands is processed on every core. Each band
+is filtered with `halo` extra rows above and below what it keeps, so the
+stitched result is identical to the single-threaded call.
+
+    glow = band_filter(glow, ImageFilter.GaussianBlur(80))
+    img = band_composite(img, glow)
+
+ASSET_THREADS caps the threads per process; process pools start their
+workers with share_cores() so the cores are divided between them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from PIL import Image, ImageFilter
+
+THREADS_ENV = "ASSET_THREADS"
+
+# Smaller images are cheaper to process in one call than to split
+MIN_PIXELS = 1 << 19
+
+# Bands are at least this many times their halo tall, so the overlap
+# stays a small share of the work
+MIN_BAND_HALOS = 4
+
+_pool = {"pid": None, "threads": 0, "executor": None}
+
+def thread_count():
+    """Threads to split work over: ASSET_THREADS, else every core"""
+    env = os.environ.get(THREADS_ENV)
+    return max(1, int(env)) if env else (os.cpu_count() or 1)
+
+def share_cores(workers):
+    """Process pool initializer: give each of `workers` an equal share of the cores
+
+        ProcessPoolExecutor(workers, initializer=share_cores, initargs=(workers,))
+
+    An ASSET_THREADS set by the user is left alone.
+    """
+    if not os.environ.get(THREADS_ENV):
+        os.environ[THREADS_ENV] = str(max(1, (os.cpu_count() or 1) // max(1, workers)))
+
+def _executor(threads):
+    # A pool inherited through fork has no threads behind it
+    if _pool["pid"] != os.getpid() or _pool["threads"] != threads:
+        _pool.update(pid=os.getpid(), threads=threads,
+                     executor=ThreadPoolExecutor(threads, thread_name_prefix="bands"))
+    return _pool["executor"]
+
+def filter_halo(image_filter):
+    """Rows beyond a band image_filter reads, or None if not known"""
+    if isinstance(image_filter, (ImageFilter.GaussianBlur, ImageFilter.BoxBlur)):
+        radius = image_filter.radius
+        ry = radius[1] if isinstance(radius, (tuple, list)) else radius
+        if isinstance(image_filter, ImageFilter.BoxBlur):
+            return int(ry) + 1
+        # Three extended box passes, each at most sigma + 1 wide
+        return 3 * (int(ry) + 2)
+    if isinstance(image_filter, ImageFilter.RankFilter):
+        return image_filter.size // 2
+    if isinstance(image_filter, ImageFilter.Kernel):
+        return image_filter.filterargs[0][1] // 2
+    return None
+
+def _rows(height, threads, halo):
+    count = min(threads, max(1, height // max(1, MIN_BAND_HALOS * halo)))
+    edges = [height * i // count for i in range(count + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+def banded(func, images, halo=0, threads=None):
+    """func(*bands) -> image over horizontal bands of same-size images
+
+    func gets crops extended by `halo` rows (clipped at the edges) and
+    must return an image of the crop's size; the rows it was given for
+    context are cut off again before stitching.
+    """
+    threads = threads or thread_count()
+    w, h = images[0].size
+    bands = _rows(h, threads, halo)
+    if len(bands) == 1 or w * h < MIN_PIXELS:
+        return func(*images)
+
+    def run(rows):
+        y0, y1 = rows
+        top, bottom = max(0, y0 - halo), min(h, y1 + halo)
+        out = func(*(img.crop((0, top, w, bottom)) for img in images))
+        return out.crop((0, y0 - top, w, y1 - top))
+
+    parts = list(_executor(threads).map(run, bands))
+    out = Image.new(parts[0].mode, (w, h))
+    for (y0, _), part in zip(bands, parts):
+        out.paste(part, (0, y0))
+    return out
+
+def band_filter(img, image_filter, threads=None):
+    """img.filter(image_filter), split over threads when the filter's reach is known"""
+    halo = filter_halo(image_filter)
+    if halo is None:
+        return img.filter(image_filter)
+    return banded(lambda band: band.filter(image_filter), [img], halo, threads)
+
+def band_composite(dst, src, threads=None):
+    """Image.alpha_composite(dst, src), split over threads"""
+    return banded(Image.alpha_composite, [dst, src], 0, threads)
@@ -0,0 +1,138 @@
+"""
+Process-pool batch renderer for the asset generators
+Collects every create_* job from the generator scripts and renders them
+across a ProcessPoolExecutor, reporting per-job wall time
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import namedtuple
+import importlib
+import os
+import sys
+import time
+
+from pipeline import encode, profiling
+from pipeline.bands import share_cores
+from pipeline.cache import job_key
+
+ASSETS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (module, directory under assets/) for every generator script; each
+# module's jobs() lists its assets with the output path as the last arg
+GENERATORS = [
+    ("generate_endings", "illustrations"),
+    ("create_endings", "illustrations"),
+    ("generate_portraits", "portraits"),
+    ("create_icons", "ui"),
+    ("generate_orbs", "effects"),
+]
+
+class Job(namedtuple('Job', ['asset_id', 'module', 'func', 'args', 'kwargs', 'key'])):
+    __slots__ = ()
+
+    @property
+    def output(self):
+        return self.args[-1]
+
+# events holds the job's trace events when profiling is enabled;
+# encoded lists (path, bytes, seconds) for every file the job wrote
+JobResult = namedtuple('JobResult', ['asset_id', 'wall', 'cpu', 'pid', 'events', 'encoded'])
+
+def load_generator(module):
+    """Import a generator script by module name"""
+    for name, subdir in GENERATORS:
+        path = os.path.join(ASSETS_DIR, subdir)
+        if name == module and path not in sys.path:
+            sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+def collect_jobs(output_root=None, variants=False, expressions=False):
+    """Collect every generator's jobs, optionally redirected under output_root
+
+    variants=True asks generators that define VARIANTS to also write
+    their resolution variants. expressions=True passes each job of a
+    generator that defines job_expressions() the emotions it returns.
+    """
+    collected = []
+    for module, subdir in GENERATORS:
+        mod = load_generator(module)
+        output_dir = mod.OUTPUT_DIR
+        if output_root:
+            output_dir = os.path.join(output_root, subdir)
+        kwargs = {}
+        if variants and getattr(mod, "VARIANTS", None):
+            kwargs["variants"] = mod.VARIANTS
+        for asset_id, func, args in mod.jobs(output_dir):
+            job_kwargs = dict(kwargs)
+            if expressions and hasattr(mod, "job_expressions"):
+                job_kwargs["expressions"] = mod.job_expressions(args[-1])
+            # The output folder does not change the pixels, the file name may
+            params = args[:-1] + (os.path.basename(args[-1]), sorted(job_kwargs.items()),
+                                  encode.active_profile())
+            key = job_key(func, asset_id, params)
+            collected.append(Job(asset_id, module, func.__name__, args, job_kwargs, key))
+    return collected
+
+def run_job(job):
+    """Render one job; runs in a worker process"""
+    func = getattr(load_generator(job.module), job.func)
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    with profiling.stage(job.asset_id, func=job.func):
+        func(*job.args, **job.kwargs)
+    return JobResult(job.asset_id, time.perf_counter() - start_wall,
+                     time.process_time() - start_cpu, os.getpid(),
+                     profiling.drain() if profiling.enabled() else [], encode.drain())
+
+def run_jobs(jobs, workers=None):
+    """Run jobs on a process pool; results come back in job order
+
+    workers=1 renders in-process, which is handy under a debugger.
+    """
+    for job in jobs:
+        os.makedirs(os.path.dirname(job.output), exist_ok=True)
+
+    if workers == 1:
+        results = [run_job(job) for job in jobs]
+        for result in results:
+            profiling.record(result.events)
+        return results
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=share_cores,
+                             initargs=(workers or os.cpu_count(),)) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.asset_id] = result
+            profiling.record(result.events)
+    return [results[job.asset_id] for job in jobs]
+
+def run_post_build(modules, output_root=None):
+    """Call post_build(output_dir) on the given generators that define it
+
+    Used for stages that combine a generator's outputs, such as atlas
+    packing; run after all of that generator's jobs have finished.
+    """
+    for module, subdir in GENERATORS:
+        if module not in modules:
+            continue
+        mod = load_generator(module)
+        hook = getattr(mod, "post_build", None)
+        if hook:
+            hook(os.path.join(output_root, subdir) if output_root else mod.OUTPUT_DIR)
+
+def format_report(results, total_wall):
+    """Format a per-job timing table"""
+    lines = [f"{'asset':<28}{'wall (s)':>10}{'cpu (s)':>10}{'encode (s)':>12}{'KiB':>9}{'pid':>8}"]
+    for r in results:
+        encode_s = sum(e[2] for e in r.encoded)
+        kib = sum(e[1] for e in r.encoded) / 1024
+        lines.append(f"{r.asset_id:<28}{r.wall:>10.3f}{r.cpu:>10.3f}{encode_s:>12.3f}{kib:>9.1f}{r.pid:>8}")
+    busy = sum(r.wall for r in results)
+    encoded = [e for r in results for e in r.encoded]
+    lines.append(f"{len(results)} jobs, {busy:.2f}s of work in {total_wall:.2f}s wall; "
+                 f"{len(encoded)} files, {sum(e[1] for e in encoded) / 1024:.0f} KiB "
+                 f"encoded in {sum(e[2] for e in encoded):.2f}s")
+    return "\n".join(lines)
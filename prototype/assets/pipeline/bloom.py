@@ -0,0 +1,65 @@
+"""
+Downsampled-pyramid bloom for the asset generators
+Large-radius glows are blurred on a mip level where the radius is small,
+then upsampled back, so cost stays near constant as the radius grows
+"""
+
+import math
+
+from PIL import Image, ImageFilter
+
+from pipeline.bands import band_filter, band_composite
+
+# Smallest radius (in pixels of the working level) kept per quality;
+# higher keeps more detail but stops downsampling earlier
+QUALITY = {
+    'draft': 2,
+    'medium': 4,
+    'high': 8,
+}
+
+def pyramid_levels(radius, quality='medium'):
+    """Number of 2x reductions to apply before blurring at `radius`"""
+    if quality == 'exact':
+        return 0
+    floor_radius = QUALITY[quality]
+    levels = 0
+    while radius / (2 ** (levels + 1)) >= floor_radius:
+        levels += 1
+    return levels
+
+def pyramid_blur(img, radius, quality='medium'):
+    """Approximate GaussianBlur(radius) on a downsampled mip pyramid
+
+    Reduces by 2x per level with a box filter, blurs at radius / 2**levels,
+    then walks back up the pyramid with bilinear upsampling.
+    quality='exact' falls back to a full-resolution GaussianBlur. Large
+    working levels are blurred in parallel bands.
+    """
+    levels = pyramid_levels(radius, quality)
+    sizes = [img.size]
+    work = img
+    for _ in range(levels):
+        if min(work.size) < 4:
+            break
+        work = work.reduce(2)
+        sizes.append(work.size)
+
+    scale = 2 ** (len(sizes) - 1)
+    work = band_filter(work, ImageFilter.GaussianBlur(radius / scale))
+
+    for size in reversed(sizes[:-1]):
+        work = work.resize(size, Image.BILINEAR)
+    return work
+
+def chained_radius(radius, passes):
+    """Radius of one blur equivalent to `passes` chained blurs of `radius`
+
+    Gaussian variances add, so n passes of sigma equal one of sigma*sqrt(n).
+    """
+    return radius * math.sqrt(passes)
+
+def bloom(img, radius, quality='medium'):
+    """Composite a blurred glow copy of img underneath it"""
+    glow = pyramid_blur(img, radius, quality)
+    return band_composite(glow, img)
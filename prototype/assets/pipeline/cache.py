@@ -0,0 +1,194 @@
+"""
+Content-addressed incremental build cache
+An asset is re-rendered only when the code that draws it, its parameters
+or the imaging libraries change; otherwise its PNG is left untouched so
+Godot does not reimport it
+"""
+
+from functools import lru_cache
+import hashlib
+import inspect
+import json
+import os
+import types
+
+import numpy as np
+import PIL
+
+CACHE_FILE = ".build_cache.json"
+CACHE_VERSION = 3
+
+def _is_pipeline_module(module):
+    return getattr(module, "__name__", "").startswith("pipeline")
+
+def _names(code):
+    """Global names used by a code object and any nested lambdas/comprehensions"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _names(const)
+    return names
+
+def _owner(value):
+    if isinstance(value, types.ModuleType):
+        return value
+    if isinstance(value, (types.FunctionType, type)):
+        return inspect.getmodule(value)
+    return None
+
+@lru_cache(maxsize=None)
+def _pipeline_closure(module):
+    """module and every pipeline module it imports, transitively, in a fixed order"""
+    order, stack = [], [module]
+    while stack:
+        current = stack.pop()
+        if current in order:
+            continue
+        order.append(current)
+        for _, value in sorted(vars(current).items(), reverse=True):
+            owner = _owner(value)
+            if _is_pipeline_module(owner) and owner not in order:
+                stack.append(owner)
+    return tuple(order)
+
+@lru_cache(maxsize=None)
+def _module_source(module):
+    return inspect.getsource(module)
+
+def _pipeline_sources(module, seen):
+    """Source of a pipeline module and of every pipeline module it imports"""
+    for dependency in _pipeline_closure(module):
+        if dependency not in seen:
+            seen.add(dependency)
+            yield _module_source(dependency)
+
+def _code_dependencies(func, seen):
+    """Yield source snippets for func and everything it reaches by name
+
+    Follows module-level functions in the generator script recursively,
+    hashes whole pipeline modules along with the pipeline modules they
+    import (helpers there may be shared by many generators) and includes
+    plain constants such as WIDTH/HEIGHT.
+    """
+    if func in seen:
+        return
+    seen.add(func)
+    yield inspect.getsource(func)
+
+    module_globals = func.__globals__
+    for name in sorted(_names(func.__code__)):
+        value = module_globals.get(name)
+        owner = _owner(value)
+        if _is_pipeline_module(owner):
+            yield from _pipeline_sources(owner, seen)
+        elif isinstance(value, types.FunctionType):
+            if value.__module__ == func.__module__:
+                yield from _code_dependencies(value, seen)
+        elif isinstance(value, (int, float, str, tuple)):
+            yield f"{name}={value!r}"
+        elif isinstance(value, (dict, list)):
+            yield from _data_dependencies(name, value, seen)
+
+def _data_dependencies(name, value, seen):
+    """Source for a dict/list constant such as a scene spec or node table
+
+    Plain data is hashed by value; functions stored in it are followed
+    like ones called by name.
+    """
+    funcs = []
+
+    def plain(v):
+        if isinstance(v, dict):
+            return {k: plain(x) for k, x in v.items()}
+        if isinstance(v, (list, tuple)):
+            return [plain(x) for x in v]
+        if isinstance(v, types.FunctionType):
+            funcs.append(v)
+            return f"<{v.__module__}.{v.__qualname__}>"
+        return v
+
+    yield f"{name}={plain(value)!r}"
+    for func in funcs:
+        yield from _code_dependencies(func, seen)
+
+def code_digest(func):
+    """Hash of the code func reaches and the imaging library versions"""
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_VERSION} PIL={PIL.__version__} numpy={np.__version__}\n".encode())
+    for snippet in _code_dependencies(func, set()):
+        h.update(snippet.encode("utf-8"))
+    return h.hexdigest()
+
+def job_key(func, asset_id, params):
+    """Hash of the drawing code, the job parameters and library versions"""
+    return hashlib.sha256(f"{code_digest(func)}{asset_id}:{params!r}".encode("utf-8")).hexdigest()
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class BuildCache:
+    """Maps each output file to the key that produced it
+
+    Stored as JSON next to the outputs. Dot-prefixed so Godot's
+    importer ignores it.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(root, CACHE_FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def _rel(self, output):
+        return os.path.relpath(os.path.abspath(output), self.root).replace(os.sep, "/")
+
+    def _unchanged(self, path, key):
+        entry = self.entries.get(self._rel(path))
+        if not entry or entry["key"] != key or not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return _file_digest(path) == entry["digest"]
+
+    def outputs(self, output):
+        """Every file recorded as written by output's job, output first"""
+        entry = self.entries.get(self._rel(output), {})
+        return [output] + [os.path.join(self.root, rel) for rel in entry.get("outputs", [])]
+
+    def is_fresh(self, output, key):
+        """True if output and every other file its job wrote exist, were
+        built from key and have not been edited since"""
+        return all(self._unchanged(path, key) for path in self.outputs(output))
+
+    def record(self, output, key, written=()):
+        """Remember that output's job just wrote output and `written` from key"""
+        others = sorted({self._rel(path) for path in written} - {self._rel(output)})
+        for path in [output] + [os.path.join(self.root, rel) for rel in others]:
+            stat = os.stat(path)
+            self.entries[self._rel(path)] = {
+                "key": key,
+                "digest": _file_digest(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        self.entries[self._rel(output)]["outputs"] = others
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,75 @@
+"""
+Readers for the dialogue JSON in prototype/resources/dialogues
+Which portrait each customer uses and which emotions their lines are
+tagged with, for the generators that build art the dialogue asks for
+"""
+
+import glob
+import json
+import os
+
+ASSETS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIALOGUE_DIR = os.path.join(os.path.dirname(ASSETS_DIR), "resources", "dialogues")
+
+def load_dialogues(dialogue_dir=DIALOGUE_DIR):
+    """{file stem: parsed JSON} for every dialogue, in file name order"""
+    dialogues = {}
+    for path in sorted(glob.glob(os.path.join(dialogue_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            dialogues[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    return dialogues
+
+def dialogue_lines(node):
+    """Every {"speaker": ..., "text": ...} line under node, in file order"""
+    if isinstance(node, dict):
+        if "speaker" in node:
+            yield node
+        for value in node.values():
+            yield from dialogue_lines(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from dialogue_lines(value)
+
+def dialogue_portraits(dialogue_dir=DIALOGUE_DIR):
+    """Map each dialogue's metadata.portrait_key to its portrait file name"""
+    keys = {}
+    for data in load_dialogues(dialogue_dir).values():
+        meta = data.get("metadata", {})
+        if meta.get("portrait_key") and meta.get("portrait"):
+            keys[meta["portrait_key"]] = os.path.basename(meta["portrait"])
+    return keys
+
+def portrait_emotions(dialogue_dir=DIALOGUE_DIR):
+    """Map each portrait file name to the emotions its customer speaks with
+
+    Only the customer's own lines count (speaker == the dialogue's name),
+    not the protagonist's or narration. Emotions are sorted; dialogues
+    sharing a portrait are merged.
+    """
+    emotions = {}
+    for data in load_dialogues(dialogue_dir).values():
+        portrait = data.get("metadata", {}).get("portrait")
+        if not portrait:
+            continue
+        found = emotions.setdefault(os.path.basename(portrait), set())
+        found.update(line["emotion"] for line in dialogue_lines(data.get("dialogue", {}))
+                     if line.get("speaker") == data.get("name") and line.get("emotion"))
+    return {filename: sorted(found) for filename, found in emotions.items()}
+
+def memory_accent(color):
+    """metadata.memory_color ([r, g, b, a] floats) as an "#RRGGBB" accent"""
+    return "#" + "".join(f"{round(max(0.0, min(1.0, c)) * 255):02X}" for c in color[:3])
+
+def dialogue_characters(dialogue_dir=DIALOGUE_DIR):
+    """Map each portrait file name to (name, accent hex) of its customer
+
+    The accent is the customer's memory_color. The first dialogue (by
+    file name) to use a portrait wins.
+    """
+    characters = {}
+    for data in load_dialogues(dialogue_dir).values():
+        meta = data.get("metadata", {})
+        if meta.get("portrait") and data.get("name"):
+            accent = memory_accent(meta["memory_color"]) if meta.get("memory_color") else None
+            characters.setdefault(os.path.basename(meta["portrait"]), (data["name"], accent))
+    return characters
@@ -0,0 +1,96 @@
+"""
+Output encoder backend for the asset generators
+Named PNG/WebP profiles trading file size against encode time, with a
+per-file log of encoded bytes and seconds for the build report
+
+    ASSET_ENCODE=fast python generate_endings.py
+    python build_assets.py --encode release
+"""
+
+import io
+import os
+import time
+
+from PIL import Image
+
+ENCODE_ENV = "ASSET_ENCODE"
+
+# zlib strategies Pillow passes through as compress_type
+Z_DEFAULT, Z_FILTERED = 0, 1
+
+PROFILES = {
+    # Pillow's defaults, what a bare img.save(path, 'PNG') did
+    'standard': {'format': 'PNG', 'options': [{}]},
+    # Iteration builds: light zlib, about half the encode time, ~2x bytes
+    'fast': {'format': 'PNG', 'options': [{'compress_level': 1}]},
+    # Max compression; every candidate is encoded and the smallest kept.
+    # Pillow always picks each row's PNG filter adaptively; the candidates
+    # vary only the zlib strategy (Z_RLE was tried and never won on this
+    # art). optimize would just force level 9 and add the Average filter,
+    # which never won either
+    'release': {'format': 'PNG', 'options': [
+        {'compress_level': 9, 'compress_type': Z_DEFAULT},
+        {'compress_level': 9, 'compress_type': Z_FILTERED},
+    ]},
+    # <=256 colour palette PNG with alpha, for small flat art like the icons
+    'palette': {'format': 'PNG', 'quantize': 256, 'options': [{'optimize': True}]},
+    # Lossless WebP, written with a .webp extension
+    'webp': {'format': 'WEBP', 'ext': '.webp',
+             'options': [{'lossless': True, 'quality': 100, 'method': 4}]},
+}
+
+DEFAULT_PROFILE = 'standard'
+
+_log = []
+
+def active_profile(profile=None):
+    """Profile to encode with: ASSET_ENCODE overrides the caller's choice"""
+    name = os.environ.get(ENCODE_ENV) or profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"unknown encode profile {name!r}; "
+                         f"expected one of {', '.join(PROFILES)}")
+    return name
+
+def set_profile(profile):
+    """Select a profile for this process and the workers it starts"""
+    os.environ[ENCODE_ENV] = active_profile(profile)
+
+def encoded_path(path, profile=None):
+    """Path a file is written to under a profile (.png -> .webp for webp)"""
+    ext = PROFILES[active_profile(profile)].get('ext')
+    return os.path.splitext(path)[0] + ext if ext else path
+
+def _quantize(img, colors):
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA')
+    # Fast octree is the quantizer that keeps alpha
+    return img.quantize(colors, method=Image.Quantize.FASTOCTREE)
+
+def save_image(img, path, profile=None):
+    """Encode img to path with a profile; returns the path written
+
+    Records (path, bytes, seconds) for drain().
+    """
+    name = active_profile(profile)
+    spec = PROFILES[name]
+    path = encoded_path(path, name)
+
+    start = time.perf_counter()
+    if 'quantize' in spec:
+        img = _quantize(img, spec['quantize'])
+    best = None
+    for options in spec['options']:
+        buf = io.BytesIO()
+        img.save(buf, spec['format'], **options)
+        if best is None or buf.tell() < len(best):
+            best = buf.getvalue()
+    with open(path, 'wb') as f:
+        f.write(best)
+    _log.append((path, len(best), time.perf_counter() - start))
+    return path
+
+def drain():
+    """Return and clear the [(path, bytes, seconds)] encoded so far"""
+    entries = list(_log)
+    _log.clear()
+    return entries
@@ -0,0 +1,169 @@
+"""
+Fonts subset to the characters the game actually draws
+Collects every character in the dialogue JSON, the generators' captions
+(ending titles, portrait names) and the string literals of the scenes and
+scripts, and cuts each font in assets/fonts down to them with fontTools
+(optional: pip install fonttools). A used character a font has no glyph
+for fails the build rather than rendering as a missing-glyph box.
+
+    texts = used_text()
+    print(format_report(subset_fonts(font_files(), texts)))
+"""
+
+from collections import namedtuple
+import glob
+import os
+import re
+import unicodedata
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont, TTLibError
+except ImportError:
+    subset = None
+
+from pipeline.batch import GENERATORS, load_generator
+from pipeline.dialogues import DIALOGUE_DIR, load_dialogues
+
+ASSETS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(ASSETS_DIR)
+FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+SUBSET_DIR = os.path.join(FONTS_DIR, "subset")
+
+# Game files whose string literals are UI text, relative to the project
+UI_GLOBS = ["scripts/**/*.gd", "scenes/**/*.tscn"]
+
+# Double-quoted literals; .tscn text may span lines. Comments are skipped
+STRING_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+# Spec keys of text a generator draws into its images
+CAPTION_KEYS = ("title", "subtitle")
+
+# Printable ASCII is always kept: scripts build numbers and labels at runtime
+ALWAYS = "".join(chr(c) for c in range(0x20, 0x7F))
+
+# Emoji are left to Godot's system font fallback (allow_system_fallback
+# in the fonts' .import), so neither kept nor required
+SYSTEM_FALLBACK = re.compile("[\u2600-\u27BF\U0001F000-\U0001FAFF]")
+
+def _drawn(c):
+    return unicodedata.category(c)[0] != "C" and not SYSTEM_FALLBACK.match(c)
+
+FontSubset = namedtuple('FontSubset', ['source', 'output', 'glyphs', 'bytes_before', 'bytes_after'])
+
+def font_files(fonts_dir=FONTS_DIR):
+    """Every .ttf / .otf in fonts_dir, in file name order"""
+    return sorted(glob.glob(os.path.join(fonts_dir, "*.ttf")) +
+                  glob.glob(os.path.join(fonts_dir, "*.otf")))
+
+def _strings(node):
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for value in node.values():
+            yield from _strings(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _strings(value)
+
+def caption_text():
+    """Text the generators draw: spec titles and subtitles, portrait names"""
+    captions = []
+    for module, subdir in GENERATORS:
+        mod = load_generator(module)
+        for spec in getattr(mod, "SPECS", {}).values():
+            captions += [layer[key] for layer in spec.get("layers", [])
+                         for key in CAPTION_KEYS if key in layer]
+        if hasattr(mod, "characters"):
+            captions += [character[0] for character in mod.characters()]
+    return "\n".join(captions)
+
+def dialogue_text(dialogue_dir=DIALOGUE_DIR):
+    """{dialogues/<stem>.json: every string in it}"""
+    return {f"dialogues/{stem}.json": "\n".join(_strings(data))
+            for stem, data in load_dialogues(dialogue_dir).items()}
+
+def used_text(project_dir=PROJECT_DIR, dialogue_dir=DIALOGUE_DIR):
+    """{source: text} of everything the game or its art draws with a font"""
+    texts = dialogue_text(dialogue_dir)
+    for pattern in UI_GLOBS:
+        for path in sorted(glob.glob(os.path.join(project_dir, pattern), recursive=True)):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                texts[os.path.relpath(path, project_dir).replace(os.sep, "/")] = \
+                    "\n".join(STRING_PATTERN.findall(f.read()))
+    texts["generator captions"] = caption_text()
+    return texts
+
+def codepoints(texts):
+    """Sorted codepoints of ALWAYS and every character in texts a font must draw"""
+    chars = set(ALWAYS).union(*texts.values())
+    return sorted(ord(c) for c in chars if _drawn(c))
+
+def missing_glyphs(font, texts):
+    """{character: [sources]} for used characters the font's cmap lacks"""
+    cmap = font.getBestCmap() or {}
+    missing = {}
+    for source, text in texts.items():
+        for c in set(text):
+            if ord(c) not in cmap and _drawn(c):
+                missing.setdefault(c, []).append(source)
+    return {c: sorted(sources) for c, sources in sorted(missing.items())}
+
+def subset_font(path, texts, output_dir=SUBSET_DIR):
+    """Write path cut down to the characters of texts; returns a FontSubset
+
+    Raises ValueError if path is not a font, or naming each used
+    character it has no glyph for and the files that use it.
+    """
+    if subset is None:
+        raise ImportError("font subsetting needs fontTools: pip install fonttools")
+    name = os.path.basename(path)
+    try:
+        font = TTFont(path)
+    except TTLibError as e:
+        raise ValueError(f"{name} is not a font file ({e})")
+    missing = missing_glyphs(font, texts)
+    if missing:
+        raise ValueError(f"{name} has no glyph for {len(missing)} used characters:\n" +
+                         "\n".join(f"  {c!r} U+{ord(c):04X}  <- {', '.join(sources)}"
+                                   for c, sources in missing.items()))
+
+    options = subset.Options()
+    # Keep every OpenType feature and name record; only glyphs are dropped
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    subsetter = subset.Subsetter(options)
+    cmap = font.getBestCmap()
+    subsetter.populate(unicodes=[c for c in codepoints(texts) if c in cmap])
+    subsetter.subset(font)
+
+    os.makedirs(output_dir, exist_ok=True)
+    output = os.path.join(output_dir, name)
+    font.save(output)
+    return FontSubset(path, output, len(font.getGlyphOrder()),
+                      os.path.getsize(path), os.path.getsize(output))
+
+def subset_fonts(paths, texts, output_dir=SUBSET_DIR):
+    """Subset every font; raises one ValueError listing all the fonts' problems"""
+    results, errors = [], []
+    for path in paths:
+        try:
+            results.append(subset_font(path, texts, output_dir))
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        raise ValueError("\n".join(errors))
+    return results
+
+def format_report(results):
+    """Per-font glyph count and bytes saved table"""
+    lines = [f"{'font':<32}{'glyphs':>7}{'full KiB':>10}{'subset KiB':>12}{'saved':>8}"]
+    for r in results:
+        lines.append(f"{os.path.basename(r.source):<32}{r.glyphs:>7}{r.bytes_before / 1024:>10.0f}"
+                     f"{r.bytes_after / 1024:>12.0f}{1 - r.bytes_after / r.bytes_before:>8.0%}")
+    before = sum(r.bytes_before for r in results)
+    after = sum(r.bytes_after for r in results)
+    lines.append(f"{len(results)} fonts, {(before - after) / 1024:.0f} KiB saved "
+                 f"({before / 1024:.0f} -> {after / 1024:.0f} KiB)")
+    return "\n".join(lines)
@@ -0,0 +1,120 @@
+"""
+Pre-rasterized glyph atlases for the dialogue text
+Renders every character the dialogue uses at the dialogue scene's font
+sizes, shelf-packs them onto atlas pages and writes a BMFont .fnt per
+size, which Godot imports as a FontFile. Godot's dynamic font then never
+has to rasterize a Hangul syllable the first time it appears
+mid-conversation. The neon variant draws each glyph over the glow of the
+portraits' name captions (draw_glow_text).
+
+    font = ImageFont.truetype(path, 24)
+    write_bmfont(rasterize(font, fonts.codepoints(fonts.dialogue_text())), font,
+                 output_dir, "dialogue_24")
+"""
+
+from collections import namedtuple
+import os
+import re
+
+from PIL import Image, ImageDraw
+
+from pipeline.atlas import pack
+from pipeline.encode import save_image
+
+# Glow copies behind neon text are offset 1..this many px left and right
+GLOW_SPREAD = 3
+
+# Square atlas page size; every page of a font is this size or smaller
+PAGE_SIZE = 1024
+
+FONT_SIZE_PATTERN = re.compile(r'font_size = (\d+)')
+
+# image: RGBA (None for blank glyphs like space); offset: its top-left
+# relative to the pen position at the line top; advance: pen advance
+Glyph = namedtuple('Glyph', ['codepoint', 'image', 'offset', 'advance'])
+
+def draw_glow_text(draw, xy, text, font, color, glow_color=None, spread=GLOW_SPREAD, **kwargs):
+    """Draw text over copies of itself shifted 1..spread px left and right
+
+    The copies, in glow_color (default: color), are the neon edge of the
+    portraits' name captions.
+    """
+    x, y = xy
+    glow_color = color if glow_color is None else glow_color
+    for offset in range(spread, 0, -1):
+        draw.text((x - offset, y), text, font=font, fill=glow_color, **kwargs)
+        draw.text((x + offset, y), text, font=font, fill=glow_color, **kwargs)
+    draw.text(xy, text, font=font, fill=color, **kwargs)
+
+def scene_font_sizes(scene_path):
+    """Sorted distinct font sizes a .tscn overrides"""
+    with open(scene_path, encoding="utf-8") as f:
+        return sorted({int(size) for size in FONT_SIZE_PATTERN.findall(f.read())})
+
+def rasterize(font, codepoints, glow_color=None):
+    """Glyph for each codepoint; with glow_color, drawn over a neon glow
+
+    Plain glyphs are white so a label's font_color tints them; neon
+    glyphs are white over their coloured glow, meant to be drawn untinted.
+    """
+    pad = GLOW_SPREAD if glow_color else 0
+    glyphs = []
+    for codepoint in codepoints:
+        char = chr(codepoint)
+        advance = round(font.getlength(char))
+        left, top, right, bottom = font.getbbox(char, anchor="la")
+        if right <= left or bottom <= top:
+            glyphs.append(Glyph(codepoint, None, (0, 0), advance))
+            continue
+        img = Image.new('RGBA', (right - left + 2 * pad, bottom - top + 2 * pad), (255, 255, 255, 0))
+        draw = ImageDraw.Draw(img)
+        xy = (pad - left, pad - top)
+        if glow_color:
+            draw_glow_text(draw, xy, char, font, (255, 255, 255, 255), (*glow_color[:3], 255),
+                           anchor="la")
+        else:
+            draw.text(xy, char, font=font, fill=(255, 255, 255, 255), anchor="la")
+        glyphs.append(Glyph(codepoint, img, (left - pad, top - pad), advance))
+    return glyphs
+
+def _bmfont(face, size, line_height, base, page_size, page_files, chars):
+    lines = [f'info face="{face}" size={size} bold=0 italic=0 charset="" unicode=1 '
+             f'stretchH=100 smooth=1 aa=1 padding=0,0,0,0 spacing=1,1 outline=0',
+             f'common lineHeight={line_height} base={base} scaleW={page_size[0]} '
+             f'scaleH={page_size[1]} pages={len(page_files)} packed=0']
+    lines += [f'page id={i} file="{name}"' for i, name in enumerate(page_files)]
+    lines.append(f'chars count={len(chars)}')
+    lines += [f'char id={c[0]} x={c[1]} y={c[2]} width={c[3]} height={c[4]} xoffset={c[5]} '
+              f'yoffset={c[6]} xadvance={c[7]} page={c[8]} chnl=15' for c in chars]
+    return "\n".join(lines) + "\n"
+
+def write_bmfont(glyphs, font, output_dir, name, padding=1):
+    """Pack font's glyphs onto `name`_N.png pages and write `name`.fnt beside them
+
+    Every page has the same size, as BMFont expects. Returns the .fnt path.
+    """
+    drawn = [g for g in glyphs if g.image]
+    placed, page_sizes = pack([g.image.size for g in drawn], PAGE_SIZE, padding)
+    page_size = (max(w for w, h in page_sizes), max(h for w, h in page_sizes)) if page_sizes else (4, 4)
+    pages = [Image.new('RGBA', page_size, (255, 255, 255, 0)) for _ in page_sizes or [None]]
+
+    where = {}
+    for glyph, (page, x, y) in zip(drawn, placed):
+        pages[page].paste(glyph.image, (x, y))
+        where[glyph.codepoint] = (page, x, y)
+
+    os.makedirs(output_dir, exist_ok=True)
+    page_files = [os.path.basename(save_image(page, os.path.join(output_dir, f"{name}_{i}.png")))
+                  for i, page in enumerate(pages)]
+    chars = []
+    for g in glyphs:
+        page, x, y = where.get(g.codepoint, (0, 0, 0))
+        w, h = g.image.size if g.image else (0, 0)
+        chars.append((g.codepoint, x, y, w, h, g.offset[0], g.offset[1], g.advance, page))
+
+    ascent, descent = font.getmetrics()
+    path = os.path.join(output_dir, f"{name}.fnt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_bmfont(" ".join(font.getname()), font.size, ascent + descent, ascent,
+                        page_size, page_files, chars))
+    return path
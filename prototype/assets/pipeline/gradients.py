@@ -0,0 +1,188 @@
+"""
+Analytic gradient engine for the asset generators
+Linear, radial, elliptical and ring falloffs evaluated as per-pixel
+distance fields in one vectorized pass, instead of stacks of draw calls
+"""
+
+from PIL import Image
+import numpy as np
+
+def _axes(size, center):
+    """Return broadcastable (1, W) and (H, 1) pixel offsets from center"""
+    w, h = size
+    cx, cy = center
+    dx = np.arange(w, dtype=np.float32)[None, :] - np.float32(cx)
+    dy = np.arange(h, dtype=np.float32)[:, None] - np.float32(cy)
+    return dx, dy
+
+def distance_field(size, center):
+    """Euclidean pixel distance from center, shape (H, W)"""
+    dx, dy = _axes(size, center)
+    return np.sqrt(dx * dx + dy * dy)
+
+def radial_field(size, center, radius):
+    """Normalized distance: 0 at center, 1 on the circle of `radius`"""
+    return distance_field(size, center) / np.float32(radius)
+
+def elliptical_field(size, center, radii):
+    """Normalized elliptical distance: 1 on the ellipse with half-axes `radii`"""
+    dx, dy = _axes(size, center)
+    rx, ry = radii
+    return np.sqrt((dx / np.float32(rx)) ** 2 + (dy / np.float32(ry)) ** 2)
+
+def ring_field(size, center, radius, width):
+    """Normalized distance from a ring: 0 on the circle, 1 at +/-width"""
+    return np.abs(distance_field(size, center) - np.float32(radius)) / np.float32(width)
+
+def linear_field(size, direction='vertical'):
+    """Position along the image: y/h (vertical) or x/w, broadcastable"""
+    w, h = size
+    if direction == 'vertical':
+        return (np.arange(h, dtype=np.float64) / h)[:, None]
+    return (np.arange(w, dtype=np.float64) / w)[None, :]
+
+def band_field(size, start, end, direction='vertical'):
+    """Position within the rows (or columns) [start, end): 0 to 1 inside,
+    inf outside, broadcastable like linear_field"""
+    w, h = size
+    n = h if direction == 'vertical' else w
+    pos = np.arange(n, dtype=np.float32)
+    t = np.where((pos >= start) & (pos < end), (pos - start) / np.float32(end - start), np.inf)
+    return t[:, None] if direction == 'vertical' else t[None, :]
+
+def _rings(field, steps):
+    return np.maximum(np.ceil(field * steps), 1)
+
+def ring_steps(field, steps):
+    """Snap a normalized field to the radii of a `range(radius, 0, -step)` stack
+
+    `steps` is radius / step. Each pixel takes the ratio of the smallest
+    ellipse that would have covered it, so fills that replaced the
+    previous ring keep their stepped banding.
+    """
+    return _rings(field, steps) / np.float32(steps)
+
+def _bbox(inside):
+    """Bounding box (x0, y0, x1, y1) of a boolean mask, or None if empty"""
+    rows = np.flatnonzero(inside.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(inside.any(axis=0))
+    return cols[0], rows[0], cols[-1] + 1, rows[-1] + 1
+
+def _shade_region(t, color, alpha):
+    """Shade a field crop; returns (uint8 RGBA array, inside mask)"""
+    inside = t <= 1
+    out = np.zeros(t.shape + (4,), dtype=np.uint8)
+    for i, value in enumerate((*(color(t) if callable(color) else color), alpha)):
+        if callable(value):
+            value = value(t)
+        value = np.clip(np.asarray(value, dtype=np.float32), 0, 255)
+        # A constant channel is one uint8 times the mask
+        out[..., i] = (inside * value.astype(np.uint8) if value.ndim == 0
+                       else np.where(inside, value, 0))
+    return out, inside
+
+def shade(field, color, alpha=255):
+    """Color a normalized field into an RGBA layer
+
+    `color` is an (r, g, b) tuple or a callable returning (r, g, b) arrays
+    for t; `alpha` is a number or callable of t. Values are truncated
+    like int(). Pixels outside the shape (t > 1) are fully transparent,
+    and only the shape's bounding box is evaluated.
+    """
+    t = np.asarray(field, dtype=np.float32)
+    h, w = t.shape
+    out = np.zeros((h, w, 4), dtype=np.uint8)
+    box = _bbox(t <= 1)
+    if box is not None:
+        x0, y0, x1, y1 = box
+        out[y0:y1, x0:x1], _ = _shade_region(t[y0:y1, x0:x1], color, alpha)
+    return Image.fromarray(out, 'RGBA')
+
+def coverage(field):
+    """'L' mask of the pixels a field's shape covers (t <= 1)"""
+    return Image.fromarray(np.where(np.asarray(field) <= 1, 255, 0).astype(np.uint8), 'L')
+
+def _painted_strip(size, t, color, alpha):
+    # t varies along one axis: shade a one-pixel strip and stretch it across
+    w, h = size
+    t = np.broadcast_to(t, (h, 1) if t.shape[1] == 1 else (1, w))
+    box = _bbox(t <= 1)
+    if box is None:
+        return None
+    x0, y0, x1, y1 = box
+    layer, inside = _shade_region(t[y0:y1, x0:x1], color, alpha)
+    if t.shape[1] == 1:
+        x0, x1 = 0, w
+    else:
+        y0, y1 = 0, h
+    region = (x1 - x0, y1 - y0)
+    mask = Image.fromarray(inside.astype(np.uint8) * 255, 'L').resize(region, Image.NEAREST)
+    return (x0, int(y0)), Image.fromarray(layer, 'RGBA').resize(region, Image.NEAREST), mask
+
+def painted(size, field, color, alpha=255, steps=None):
+    """What paint() would write, as ((x, y), RGBA image, 'L' mask) over
+    the shape's bounding box, or None if the shape is empty
+
+    steps paints ring_steps(field, steps), shading each ring once and
+    looking its pixels up by ring. A field that varies along one axis
+    only (band_field) is shaded as a strip and stretched.
+    """
+    field = np.asarray(field, dtype=np.float32)
+    if steps is None and 1 in field.shape:
+        return _painted_strip(size, field, color, alpha)
+    if steps is None:
+        t = np.broadcast_to(field, (size[1], size[0]))
+        box = _bbox(t <= 1)
+        if box is None:
+            return None
+        x0, y0, x1, y1 = box
+        layer, inside = _shade_region(t[y0:y1, x0:x1], color, alpha)
+    else:
+        rings = _rings(np.broadcast_to(field, (size[1], size[0])), steps)
+        # ring_steps() values of every ring up to the largest in the frame
+        t = np.arange(int(rings.max()) + 1, dtype=np.float32) / np.float32(steps)
+        last = np.flatnonzero(t <= 1)[-1]
+        box = _bbox(rings <= last) if last else None
+        if box is None:
+            return None
+        x0, y0, x1, y1 = box
+        table, _ = _shade_region(t, color, alpha)
+        ring = rings[y0:y1, x0:x1].astype(np.intp)
+        # Look up whole RGBA pixels, not four bytes each
+        layer = table.view(np.uint32)[:, 0].take(ring).view(np.uint8).reshape(ring.shape + (4,))
+        inside = ring <= last
+    mask = Image.fromarray(inside.astype(np.uint8) * 255, 'L')
+    return (int(x0), int(y0)), Image.fromarray(layer, 'RGBA'), mask
+
+def paint(img, field, color, alpha=255):
+    """Write a shaded field into img, replacing covered pixels
+
+    Equivalent to ImageDraw fills on an RGBA image, which overwrite color
+    and alpha rather than blending. Use Image.alpha_composite with
+    shade() instead when the layer should blend.
+    """
+    layer = painted(img.size, field, color, alpha)
+    if layer is not None:
+        offset, shaded, mask = layer
+        img.paste(shaded, offset, mask)
+    return img
+
+def linear_gradient(size, colors, direction='vertical', box=None):
+    """Two-color linear gradient as an RGB image
+
+    Evaluated per row (or column) in float64 and broadcast, so it matches
+    the old one-draw.line-per-row version exactly. box (x0, y0, x1, y1)
+    returns just that window of the size-sized gradient.
+    """
+    t = linear_field(size, direction)[..., None]
+    c0 = np.asarray(colors[0], dtype=np.float64)
+    c1 = np.asarray(colors[1], dtype=np.float64)
+    line = (c0 * (1 - t) + c1 * t).astype(np.uint8)
+    strip = Image.fromarray(np.ascontiguousarray(line), 'RGB')
+    if box is None:
+        return strip.resize(size, Image.NEAREST)
+    x0, y0, x1, y1 = box
+    strip = strip.crop((0, y0, 1, y1) if direction == 'vertical' else (x0, 0, x1, 1))
+    return strip.resize((x1 - x0, y1 - y0), Image.NEAREST)
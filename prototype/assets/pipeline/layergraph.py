@@ -0,0 +1,690 @@
+"""
+Declarative layer graphs for the ending illustrations
+An ending is data: a list of named nodes, each a node type plus plain
+parameters. Evaluation treats it as a DAG: every layer is rasterized on
+its own and composited onto the output of the node below, and every node
+output is memoized by a hash of its type, code and parameters. A layer
+shared by several endings renders once per build, and tweaking one node
+re-evaluates only it and the composites above it.
+
+    SPEC = {
+        "id": "ending_forgotten",
+        "size": [1920, 1080],
+        "layers": [
+            {"name": "background", "type": "linear_gradient",
+             "colors": [[15, 15, 25], [40, 35, 55]]},
+            {"name": "fog", "type": "band", "rows": [540, 1080],
+             "color": [100, 95, 120], "alpha": [0, 80], "motion": {"breathe": 30}},
+            {"name": "vignette", "type": "vignette", "depth": 250, "strength": 220},
+        ],
+    }
+    img = evaluate(SPEC)
+
+Random parameters (particle positions, ray jitter) are drawn from the
+ending's asset_rng in layer order when the spec is resolved, so they are
+part of each node's hash. Nodes with a "motion" entry animate in the
+frame-sequence mode (to_scene).
+
+Nodes render through a pipeline.view.View: coordinates in a spec are
+design pixels, and render_view() evaluates any scaled window of the
+composition, which is how poster exports are tiled (pipeline.tiles), and
+how a frame redraws only the window its moving nodes touch.
+"""
+
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+import hashlib
+import json
+import math
+import os
+
+from PIL import Image, ImageChops
+import numpy as np
+
+from pipeline import profiling
+from pipeline.bands import band_composite
+from pipeline.bloom import pyramid_blur, pyramid_levels, chained_radius
+from pipeline.cache import code_digest
+from pipeline.gradients import (
+    linear_gradient, radial_field, elliptical_field, ring_field, band_field,
+    painted,
+)
+from pipeline.rays import ray_angles, rays_layer, linear_profile
+from pipeline.rng import asset_rng
+from pipeline.sequence import Scene, drift, wave
+from pipeline.view import View
+from pipeline.vignette import rect_vignette_mask, rect_vignette_window, apply_vignette
+
+NODE_CACHE_ENV = "ASSET_NODE_CACHE"
+
+# Node kinds. render signatures:
+#   source: (view, params) -> RGBA image of view.size
+#   layer:  (view, params) -> Raster, Drawing or None, composited onto the
+#           node below
+#   filter: (img, view, params) -> new RGBA image (never modifies img)
+SOURCE, LAYER, FILTER = 'source', 'layer', 'filter'
+
+# sample(params, rng) -> params fills in random values at resolve time;
+# animate(params, t) -> params moves a node with a "motion" entry;
+# reach(params, scale) -> how many output pixels around a pixel a filter
+# reads, so tiles overlap enough
+NodeType = namedtuple('NodeType', ['kind', 'render', 'sample', 'animate', 'reach'])
+
+# A layer's pixels over its bounding box. With a mask the covered pixels
+# replace what is below (ImageDraw on RGBA); without one, alpha-composited
+Raster = namedtuple('Raster', ['offset', 'image', 'mask'])
+
+# Replace-mode drawing not yet rasterized: draw(img) -> img draws the layer
+# onto an image of size in place. It is drawn straight onto the composite;
+# only a still memoized in a cache directory is rasterize()d. box bounds
+# the pixels it writes, None for anywhere
+Drawing = namedtuple('Drawing', ['size', 'draw', 'box'], defaults=(None,))
+
+# Window edges and margins are multiples of this when filters reach past
+# them, so pyramid_blur's 2x reductions fall on the same grid in every
+# window (6 levels, radii < 512)
+ALIGN = 64
+
+Node = namedtuple('Node', ['name', 'type', 'params', 'key'])
+
+NODE_TYPES = {}
+
+_MISSING = object()
+
+def node_type(name, kind, sample=None, animate=None, reach=None, registry=None):
+    """Decorator registering a render function as a node type
+
+    Generators register their own motifs into a module-level dict
+    (registry=NODES) and pass it to evaluate(), so the build cache sees
+    the drawing code.
+    """
+    def register(render):
+        (NODE_TYPES if registry is None else registry)[name] = NodeType(kind, render, sample, animate, reach)
+        return render
+    return register
+
+def rasterize(size, draw):
+    """Raster of what draw(img) -> img writes onto a transparent canvas
+
+    draw runs once; every pixel it leaves other than transparent black
+    counts as written and replaces what is below, which is what
+    replace-mode drawing (ImageDraw fills on RGBA, paint(),
+    splat(blend=False)) does, colours written with alpha 0 included.
+    Only the bounding box of the written pixels is read back.
+    """
+    img = draw(Image.new('RGBA', size, (0, 0, 0, 0)))
+    box = img.getbbox(alpha_only=False)
+    if box is None:
+        return None
+    image = img.crop(box)
+    r, g, b, a = image.split()
+    written = ImageChops.lighter(ImageChops.lighter(r, g), ImageChops.lighter(b, a))
+    return Raster(box[:2], image, written.point([0] + [255] * 255))
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+@lru_cache(maxsize=None)
+def _type_digest(render):
+    return code_digest(render)
+
+def _type_key(render, durable):
+    # Hashing the code a type reaches reads every pipeline module's source;
+    # a cache that dies with the process only needs the type's identity
+    return _type_digest(render) if durable else f"{render.__module__}.{render.__qualname__}"
+
+def resolve(spec, types=None, durable=False):
+    """(size, [Node]) with random parameters drawn and hashes computed
+
+    durable=True keys each node by a hash of the code its type reaches,
+    as a cache kept across runs needs.
+    """
+    registry = {**NODE_TYPES, **(types or {})}
+    rng = asset_rng(spec["id"])
+    size = tuple(spec["size"])
+    nodes = []
+    for layer in spec["layers"]:
+        node = registry[layer["type"]]
+        params = {k: v for k, v in layer.items() if k not in ("name", "type")}
+        if node.sample:
+            params = node.sample(params, rng)
+        # motion only matters to frames, so editing it keeps the still cached
+        still = {k: v for k, v in params.items() if k != "motion"}
+        key = _digest(layer["type"], _type_key(node.render, durable), repr(size),
+                      json.dumps(still, sort_keys=True))
+        nodes.append(Node(layer["name"], layer["type"], params, key))
+    return size, nodes
+
+class NodeCache:
+    """Node outputs by hash: an LRU in memory, optionally backed by a directory
+
+    The directory keeps outputs across runs and worker processes (images
+    as fast PNGs, rasters as .npz) so an edit re-renders only what it
+    touches.
+    """
+
+    def __init__(self, directory=None, budget=512 << 20):
+        self.directory = directory
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _size(value):
+        if value is None:
+            return 0
+        img = value.image if isinstance(value, Raster) else value
+        return img.size[0] * img.size[1] * len(img.getbands())
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".png", base + ".npz"
+
+    def __contains__(self, key):
+        return key in self.entries or (
+            self.directory is not None and any(map(os.path.exists, self._paths(key))))
+
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.directory:
+            png, npz = self._paths(key)
+            value = default
+            if os.path.exists(png):
+                value = Image.open(png)
+                value.load()
+                os.utime(png)
+            elif os.path.exists(npz):
+                with np.load(npz) as data:
+                    mask = Image.fromarray(data["mask"], 'L') if data["mask"].size else None
+                    value = Raster(tuple(int(v) for v in data["offset"]),
+                                   Image.fromarray(data["image"], 'RGBA'), mask)
+                os.utime(npz)
+            if value is not default:
+                self.hits += 1
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.bytes += self._size(value)
+        while self.bytes > self.budget and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= self._size(old)
+
+    def put(self, key, value):
+        if key in self.entries:
+            return
+        self._remember(key, value)
+        if not self.directory or value is None:
+            return
+        png, npz = self._paths(key)
+        if isinstance(value, Raster):
+            mask = np.asarray(value.mask) if value.mask is not None else np.zeros(0, np.uint8)
+            np.savez(npz, offset=np.asarray(value.offset), image=np.asarray(value.image), mask=mask)
+        else:
+            value.save(png, 'PNG', compress_level=1)
+
+    def prune(self, max_bytes):
+        """Delete the least recently used files until the directory fits max_bytes"""
+        if not self.directory:
+            return
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+        files.sort(key=os.path.getmtime, reverse=True)
+        total = 0
+        for path in files:
+            total += os.path.getsize(path)
+            if total > max_bytes:
+                os.remove(path)
+
+_default_cache = None
+
+def default_cache():
+    """The per-process NodeCache, on disk under ASSET_NODE_CACHE if set"""
+    global _default_cache
+    directory = os.environ.get(NODE_CACHE_ENV) or None
+    if _default_cache is None or _default_cache.directory != directory:
+        _default_cache = NodeCache(directory)
+    return _default_cache
+
+def _composite(below, raster):
+    """Composite raster onto below in place, over the raster's box only"""
+    if isinstance(raster, Drawing):
+        return raster.draw(below)
+    if raster is not None:
+        if raster.mask is None:
+            x0, y0 = raster.offset
+            box = (x0, y0, x0 + raster.image.width, y0 + raster.image.height)
+            below.paste(band_composite(below.crop(box), raster.image), box)
+        else:
+            below.paste(raster.image, raster.offset, raster.mask)
+    return below
+
+def _moves(node, kind):
+    return kind.animate is not None and "motion" in node.params
+
+def _params(node, kind, t):
+    return kind.animate(node.params, t) if t is not None and _moves(node, kind) else node.params
+
+def _render(node, kind, view, cache, t=None):
+    """A source's image or a layer's output; the still's are memoized"""
+    params = _params(node, kind, t)
+    # Node keys describe the whole still, so only it is memoized
+    if params is not node.params or cache is None or not view.identity:
+        return kind.render(view, params)
+    out = cache.get(node.key, _MISSING)
+    if out is _MISSING:
+        out = kind.render(view, params)
+        if isinstance(out, Drawing):
+            # Rasterizing costs more than drawing; only a raster kept
+            # across runs pays it back
+            if not cache.directory:
+                return out
+            out = rasterize(out.size, out.draw)
+        cache.put(node.key, out)
+    return out
+
+def _apply(node, kind, below, view, cache, t=None):
+    """below with node applied; layers are composited onto below in place"""
+    if kind.kind == FILTER:
+        return kind.render(below, view, _params(node, kind, t))
+    out = _render(node, kind, view, cache, t)
+    # Layers composite onto a source in place; a cached one stays clean
+    return out.copy() if kind.kind == SOURCE else _composite(below, out)
+
+def evaluate(spec, types=None, cache=None, timer=None):
+    """Render a spec's still, reusing every memoized node it can
+
+    Starts from the highest composite already in the cache; timer gets a
+    stage per node actually evaluated. Composites below the top are only
+    kept by an on-disk cache: a process renders each ending once, so in
+    memory they would just be copies that never hit. The image returned
+    is the caller's to draw on.
+    """
+    registry = {**NODE_TYPES, **(types or {})}
+    cache = default_cache() if cache is None else cache
+    size, nodes = resolve(spec, types, durable=cache.directory is not None)
+    view = View(size)
+
+    chain, key = [], ""
+    for node in nodes:
+        key = _digest(key, node.key)
+        chain.append(key)
+
+    start = next((i for i in reversed(range(len(nodes))) if chain[i] in cache), -1)
+    # Layers composite in place, so never onto a cached image
+    img = cache.get(chain[start]).copy() if start >= 0 else None
+    for i in range(start + 1, len(nodes)):
+        if timer:
+            timer(nodes[i].name)
+        img = _apply(nodes[i], registry[nodes[i].type], img, view, cache)
+        if i == len(nodes) - 1 or cache.directory:
+            cache.put(chain[i], img.copy())
+    return img
+
+def render_view(nodes, view, types=None):
+    """Composite resolved nodes through any view, uncached"""
+    registry = {**NODE_TYPES, **(types or {})}
+    img = None
+    for node in nodes:
+        img = _apply(node, registry[node.type], img, view, None)
+    return img
+
+def render_scaled(spec, scale, types=None):
+    """A spec's still drawn natively at scale times its size, uncached"""
+    size, nodes = resolve(spec, types)
+    return render_view(nodes, View(size, scale), types)
+
+def reach(nodes, scale, types=None):
+    """Output pixels a window must extend past its edges for its filters
+
+    Filters stack, so their reaches add up.
+    """
+    registry = {**NODE_TYPES, **(types or {})}
+    total = 0
+    for node in nodes:
+        kind = registry[node.type]
+        if kind.reach:
+            total += kind.reach(node.params, scale)
+    return total
+
+def _bounds(out, size):
+    """Box of the pixels a node output can change, None for none"""
+    if out is None:
+        return None
+    if isinstance(out, Raster):
+        x0, y0 = out.offset
+        return (x0, y0, x0 + out.image.width, y0 + out.image.height)
+    if isinstance(out, Drawing) and out.box is not None:
+        return tuple(out.box)
+    return (0, 0, *size)
+
+def _union(a, b):
+    if a is None or b is None:
+        return a or b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def _grow(box, margin, size, align=1):
+    """box grown by margin on every side, snapped out to align, within size"""
+    return (max(0, (box[0] - margin) // align * align), max(0, (box[1] - margin) // align * align),
+            min(size[0], -(-(box[2] + margin) // align) * align),
+            min(size[1], -(-(box[3] + margin) // align) * align))
+
+def _window(raster, box):
+    """raster clipped to box, with its offset relative to the box"""
+    x0, y0 = raster.offset
+    clip = (max(x0, box[0]), max(y0, box[1]),
+            min(x0 + raster.image.width, box[2]), min(y0 + raster.image.height, box[3]))
+    if clip[0] >= clip[2] or clip[1] >= clip[3]:
+        return None
+    crop = (clip[0] - x0, clip[1] - y0, clip[2] - x0, clip[3] - y0)
+    return Raster((clip[0] - box[0], clip[1] - box[1]), raster.image.crop(crop),
+                  raster.mask.crop(crop) if raster.mask is not None else None)
+
+class GraphScene(Scene):
+    """to_scene()'s Scene: each frame redraws only what its moving nodes touch
+
+    The plate (the nodes below the first dynamic one) and the backdrop
+    (every static node, the dynamic ones left out) render once. A frame
+    renders the dynamic nodes at t, re-applies everything from the first
+    dynamic node up over the plate in the window their boxes cover, grown
+    by the reach of the filters above, and pastes it into the backdrop.
+    """
+
+    def __init__(self, size, nodes, registry, cache):
+        super().__init__(size)
+        self.nodes = nodes
+        self.registry = registry
+        self.cache = cache
+        view = View(size)
+        for node in nodes:
+            kind = registry[node.type]
+            if _moves(node, kind):
+                self.dynamic(node.name)(
+                    lambda img, t, node=node, kind=kind: _apply(node, kind, img, view, cache, t))
+            else:
+                self.static(node.name)(
+                    lambda img, node=node, kind=kind: _apply(node, kind, img, view, cache))
+
+    def frames(self, count):
+        """Yield `count` RGBA frames of one loop, as Scene.frames() draws them"""
+        kinds = [self.registry[node.type] for node in self.nodes]
+        moving = [_moves(node, kind) for node, kind in zip(self.nodes, kinds)]
+        first = moving.index(True) if any(moving) else len(self.nodes)
+        if first == 0 or first == len(self.nodes):
+            yield from super().frames(count)
+            return
+        view = View(self.size)
+        above = list(zip(self.nodes, kinds, moving))[first:]
+        with profiling.stage("plate", self.size):
+            plate = None
+            for node, kind in zip(self.nodes[:first], kinds):
+                plate = _apply(node, kind, plate, view, self.cache)
+            backdrop = plate.copy()
+            for node, kind, moves in above:
+                if not moves:
+                    backdrop = _apply(node, kind, backdrop, view, self.cache)
+        margin = reach(self.nodes[first:], 1, self.registry)
+        margin = -(-margin // ALIGN) * ALIGN
+
+        for i in range(count):
+            t = i / count
+            with profiling.stage("frame", self.size, frame=i):
+                outs, dirty = {}, None
+                for j, (node, kind, moves) in enumerate(above):
+                    if not moves:
+                        continue
+                    if kind.kind == FILTER:
+                        dirty = (0, 0, *self.size)
+                    else:
+                        outs[j] = _render(node, kind, view, None, t)
+                        dirty = _union(dirty, _bounds(outs[j], self.size))
+                if dirty is None:
+                    img = backdrop.copy()
+                else:
+                    box = _grow(dirty, 2 * margin, self.size, ALIGN if margin else 1)
+                    img = self._redraw(plate, above, outs, View(self.size, 1, box), t)
+                    if box != (0, 0, *self.size):
+                        inner = _grow(dirty, margin, self.size)
+                        frame = backdrop.copy()
+                        frame.paste(img.crop((inner[0] - box[0], inner[1] - box[1],
+                                              inner[2] - box[0], inner[3] - box[1])), inner[:2])
+                        img = frame
+            yield img
+
+    def _redraw(self, plate, above, outs, window, t):
+        """The nodes from the first dynamic one up over the plate, in window"""
+        img = plate.crop(window.box)
+        for j, (node, kind, moves) in enumerate(above):
+            if kind.kind == LAYER:
+                out = outs[j] if moves else _render(node, kind, View(self.size), self.cache)
+                if isinstance(out, Drawing):
+                    # Drawn again through the window, straight onto the crop
+                    _composite(img, _render(node, kind, window, None, t if moves else None))
+                elif out is not None:
+                    _composite(img, _window(out, window.box))
+            else:
+                # Filters see the whole window
+                img = _apply(node, kind, img, window, None, t if moves else None)
+        return img
+
+def to_scene(spec, types=None, cache=None):
+    """A GraphScene of the spec: nodes with a "motion" entry are dynamic,
+    the rest static and served from the node cache"""
+    registry = {**NODE_TYPES, **(types or {})}
+    cache = default_cache() if cache is None else cache
+    size, nodes = resolve(spec, types, durable=cache.directory is not None)
+    return GraphScene(size, nodes, registry, cache)
+
+# Parameter helpers
+
+def _lerp(start, end, t):
+    # Exact for the common start*(1 - t) fades to 0
+    return start * (1 - t) + end * t
+
+def _fade(start, fade, t):
+    return start * (1 - t * fade)
+
+def _ramp(value):
+    """Constant, [start, end] or {"start": s, "fade": k} -> value for t from 0 to 1
+
+    The fade form dims start by the fraction k at t=1, s * (1 - t*k),
+    as the hand-written glows do; start and k may be per-channel lists.
+    """
+    if isinstance(value, dict):
+        start, fade = value["start"], value["fade"]
+        if isinstance(start, (list, tuple)):
+            fades = fade if isinstance(fade, (list, tuple)) else [fade] * len(start)
+            return lambda t: tuple(_fade(s, k, t) for s, k in zip(start, fades))
+        return lambda t: _fade(start, fade, t)
+    if isinstance(value, (list, tuple)) and len(value) == 2 and isinstance(value[0], (int, float)):
+        start, end = value
+        return lambda t: _lerp(start, end, t)
+    return value
+
+def _shade_spec(params, scale=1.0):
+    color = params["color"]
+    if isinstance(color, dict):
+        color = _ramp(color)
+    elif isinstance(color[0], (list, tuple)):
+        c0, c1 = color
+        color = lambda t: tuple(_lerp(a, b, t) for a, b in zip(c0, c1))
+    alpha = _ramp(params.get("alpha", 255))
+    if scale != 1.0:
+        base = alpha
+        alpha = (lambda t: base(t) * scale) if callable(base) else base * scale
+    return color, alpha
+
+def _pulse(params, t):
+    """Scale alpha by 1 + motion.pulse * wave(t)"""
+    params = dict(params)
+    params["scale"] = 1 + params["motion"].get("pulse", 0.0) * float(wave(t))
+    return params
+
+# Sources
+
+@node_type("solid", SOURCE)
+def solid_node(view, params):
+    return Image.new('RGBA', view.size, tuple(params["color"]))
+
+@node_type("linear_gradient", SOURCE)
+def linear_gradient_node(view, params):
+    colors = [tuple(c) for c in params["colors"]]
+    return linear_gradient(view.full, colors, params.get("direction", "vertical"),
+                           view.crop).convert('RGBA')
+
+# Shaded fields (replace covered pixels, like paint())
+
+def _field_raster(view, field, params, steps=None):
+    color, alpha = _shade_spec(params, params.get("scale", 1.0))
+    painted_layer = painted(view.size, field, color, alpha, steps)
+    return Raster(*painted_layer) if painted_layer else None
+
+@node_type("radial_light", LAYER, animate=_pulse)
+def radial_light_node(view, params):
+    """Stepped radial (or, with radii, elliptical) glow"""
+    center = view.point(params["center"])
+    if "radii" in params:
+        field = elliptical_field(view.size, center, view.length(params["radii"]))
+    else:
+        field = radial_field(view.size, center, view.length(params["radius"]))
+    return _field_raster(view, field, params, params["steps"])
+
+@node_type("ring", LAYER, animate=_pulse)
+def ring_node(view, params):
+    field = ring_field(view.size, view.point(params["center"]), view.length(params["radius"]),
+                       view.length(params["width"]))
+    return _field_raster(view, field, params)
+
+def _breathe(params, t):
+    """Move a band's start by motion.breathe * wave(t) rows"""
+    params = dict(params)
+    start, end = params["rows"]
+    params["rows"] = [start + int(round(params["motion"]["breathe"] * float(wave(t)))), end]
+    return params
+
+@node_type("band", LAYER, animate=_breathe)
+def band_node(view, params):
+    start, end = params["rows"]
+    return _field_raster(view, band_field(view.size, view.y(start), view.y(end)), params)
+
+# Shapes
+
+@node_type("polygon", LAYER)
+def polygon_node(view, params):
+    points = [tuple(p) for p in params["points"]]
+
+    def draw(img):
+        view.draw(img).polygon(points, fill=tuple(params["color"]))
+        return img
+    return Drawing(view.size, draw)
+
+# Particles
+
+def _particle_alpha(params, ys):
+    """Per-particle alpha fading from `fade` at the box top to 0 at its bottom"""
+    fade = params["alpha"]["fade"]
+    y0, y1 = params["box"][1], params["box"][3]
+    return [int(fade * (1 - (y - y0)/(y1 - y0))) for y in ys]
+
+def _sample_particles(params, rng):
+    """Draw x, y, size, then alpha and colour ranges for each particle"""
+    x0, y0, x1, y1 = params["box"]
+    lo, hi = params["size"]
+    alpha, color = params["alpha"], params["color"]
+    points = []
+    for _ in range(params["count"]):
+        x = rng.randint(x0, x1)
+        y = rng.randint(y0, y1)
+        s = rng.randint(lo, hi)
+        a = rng.randint(*alpha) if isinstance(alpha, list) else None
+        rgb = [rng.randint(*c) if isinstance(c, list) else c for c in color]
+        points.append([x, y, s, a, *rgb])
+    params = dict(params, points=points)
+    if isinstance(alpha, dict):
+        params["points"] = [p[:3] + [a] + p[4:] for p, a in
+                            zip(points, _particle_alpha(params, [p[1] for p in points]))]
+    return params
+
+def _drift_particles(params, t):
+    points = np.asarray(params["points"], dtype=np.int64)
+    motion = params["motion"]
+    xs, ys = drift(points[:, 0], points[:, 1], t, params["box"],
+                   rise=motion.get("rise", 0), sway=motion.get("sway", 0.0))
+    points[:, 0], points[:, 1] = xs, ys
+    if isinstance(params["alpha"], dict):
+        points[:, 3] = _particle_alpha(params, ys)
+    return dict(params, points=points.tolist())
+
+@node_type("particles", LAYER, sample=_sample_particles, animate=_drift_particles)
+def particles_node(view, params):
+    """Discs that overwrite what is below, as ImageDraw does on RGBA"""
+    points = np.asarray(params["points"], dtype=np.int64)
+    xs, ys, radii = points[:, 0], points[:, 1], points[:, 2]
+    return Drawing(view.size, lambda img: view.splat(img, xs, ys, radii, points[:, 4:7], points[:, 3],
+                                                     blend=False),
+                   view.disc_box(xs, ys, radii))
+
+# Rays
+
+RAY_PROFILES = {
+    "solid": lambda u, t: 1,
+    "fade": lambda u, t: 1 - t,
+    "linear": linear_profile,
+}
+
+def _sample_rays(params, rng):
+    """Angles: given, aimed at `targets`, or `count` jittered ones from rng"""
+    params = dict(params)
+    if "targets" in params:
+        cx, cy = params["center"]
+        params["angles"] = [math.atan2(y - cy, x - cx) for x, y in params["targets"]]
+        params["length"] = [math.hypot(x - cx, y - cy) for x, y in params["targets"]]
+    elif "angles" not in params:
+        params["angles"] = ray_angles(rng, params["count"], params.get("jitter", 0.1))
+    return params
+
+@node_type("rays", LAYER, sample=_sample_rays)
+def rays_node(view, params):
+    """Analytic light rays, alpha-composited over what is below"""
+    layer = rays_layer(view.size, view.point(params["center"]), params["angles"],
+                       view.length(params["length"]), view.length(params["width"]),
+                       tuple(params["color"]), params.get("alpha", 255),
+                       params.get("taper", 0.0), RAY_PROFILES[params.get("profile", "linear")])
+    return Raster(layer[0], layer[1], None) if layer else None
+
+# Filters
+
+@node_type("vignette", FILTER)
+def vignette_node(img, view, params):
+    """Rectangular vignette; strength in 0-255 like the old alpha ramps"""
+    args = (view.length(params["depth"]), params["strength"] / 255, params.get("sides", 1.0))
+    if view.crop is None:
+        mask = rect_vignette_mask(view.full, *args)
+    else:
+        mask = rect_vignette_window(view.full, *args, view.crop)
+    return apply_vignette(img, mask, color=tuple(params.get("color", (0, 0, 0))))
+
+def _blur_radius(params, scale=1):
+    return chained_radius(params["radius"], params.get("passes", 1)) * scale
+
+def _blur_reach(params, scale):
+    # Gaussian support plus one texel of the coarsest pyramid level
+    radius = _blur_radius(params, scale)
+    return int(math.ceil(3 * radius)) + 2 ** pyramid_levels(radius)
+
+@node_type("blur", FILTER, reach=_blur_reach)
+def blur_node(img, view, params):
+    """pyramid_blur, `passes` chained blurs of `radius`"""
+    return pyramid_blur(img, _blur_radius(params, view.scale))
@@ -0,0 +1,101 @@
+"""
+Build manifest derived from what the game references
+Scans the dialogue JSON, GDScript, scenes and resources for the res://
+paths of generated art, so a build runs only the jobs whose output the
+game loads (and then only the missing or stale ones). Jobs nothing
+references are skipped; references no generator can satisfy and files
+an earlier build left behind are reported.
+
+    plan = plan_build(jobs, scan_references(), BuildCache(root), root)
+    print(format_plan(plan))
+"""
+
+from collections import namedtuple
+import glob
+import os
+import re
+
+from pipeline import encode
+from pipeline.atlas import res_path
+from pipeline.dialogues import DIALOGUE_DIR, load_dialogues
+
+ASSETS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(ASSETS_DIR)
+
+# Game files whose res:// paths are scanned, relative to the project
+SOURCE_GLOBS = ["scripts/**/*.gd", "scenes/**/*.tscn", "resources/**/*.tres"]
+
+RES_PATTERN = re.compile(r'res://[^"\'\s)]+')
+
+# referenced / unreferenced: the jobs whose output the game does / does
+# not load; missing: {path: sources} referenced, absent and made by no
+# job; orphans: outputs recorded by an earlier build that no job makes
+Plan = namedtuple('Plan', ['referenced', 'unreferenced', 'missing', 'orphans'])
+
+def _stem(rel):
+    # The encode profile may swap .png for .webp
+    return os.path.splitext(rel.replace(os.sep, "/"))[0]
+
+def scan_references(project_dir=PROJECT_DIR, dialogue_dir=DIALOGUE_DIR):
+    """{path relative to assets/: [files referencing it]} for every asset the game loads"""
+    prefix = (res_path(ASSETS_DIR) or "res://assets") + "/"
+    refs = {}
+
+    def add(path, source):
+        if path.startswith(prefix):
+            refs.setdefault(path[len(prefix):], set()).add(source)
+
+    for pattern in SOURCE_GLOBS:
+        for path in sorted(glob.glob(os.path.join(project_dir, pattern), recursive=True)):
+            source = os.path.relpath(path, project_dir).replace(os.sep, "/")
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for match in RES_PATTERN.findall(f.read()):
+                    add(match, source)
+    for stem, data in load_dialogues(dialogue_dir).items():
+        meta = data.get("metadata", {})
+        source = f"dialogues/{stem}.json"
+        if meta.get("portrait"):
+            add(meta["portrait"], source)
+    return {path: sorted(sources) for path, sources in sorted(refs.items())}
+
+def plan_build(jobs, references, cache, output_root=None, subdirs=None):
+    """Split jobs by whether the game references their output
+
+    Outputs are matched to references by their path under output_root
+    (default: the assets folder), ignoring the extension. Only
+    references inside `subdirs` (the generator folders) can be missing;
+    orphans come from the build cache's records, and a job makes every
+    file the cache recorded it writing (variants, expressions).
+    """
+    root = os.path.abspath(output_root or ASSETS_DIR)
+    wanted = {_stem(path) for path in references}
+    referenced, unreferenced = [], []
+    made = set()
+    for job in jobs:
+        output = encode.encoded_path(job.output)
+        rel = _stem(os.path.relpath(os.path.abspath(output), root))
+        made.update(_stem(os.path.relpath(os.path.abspath(path), root))
+                     for path in cache.outputs(output))
+        (referenced if rel in wanted else unreferenced).append(job)
+
+    missing = {path: sources for path, sources in references.items()
+               if _stem(path) not in made
+               and (subdirs is None or path.split("/")[0] in subdirs)
+               and not os.path.exists(os.path.join(ASSETS_DIR, path))}
+    orphans = sorted(rel for rel in cache.entries
+                     if _stem(rel) not in made and os.path.exists(os.path.join(root, rel)))
+    return Plan(referenced, unreferenced, missing, orphans)
+
+def format_plan(plan):
+    """Warnings for what a plan leaves out, one line per asset ("" if none)"""
+    lines = []
+    if plan.unreferenced:
+        lines.append(f"Not referenced by the game, skipped ({len(plan.unreferenced)}):")
+        lines += [f"  {job.asset_id}" for job in plan.unreferenced]
+    if plan.missing:
+        lines.append(f"Referenced but missing, and no generator makes them ({len(plan.missing)}):")
+        lines += [f"  {path}  <- {', '.join(sources)}" for path, sources in plan.missing.items()]
+    if plan.orphans:
+        lines.append(f"Orphaned outputs of earlier builds ({len(plan.orphans)}):")
+        lines += [f"  {rel}" for rel in plan.orphans]
+    return "\n".join(lines)
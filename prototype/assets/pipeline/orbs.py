@@ -0,0 +1,129 @@
+"""
+Glowing memory orbs: the ending illustrations' orbs and the Luminous
+Drift orb textures (effects/memory_orb_philosophy.md)
+An orb is a core with stepped glow rings and a highlight. The texture
+adds memory fragments on tilted orbits and a breathing pulse that pulls
+them in as the core swells. Every orb and frame of a batch is queued on
+one Particles list and splatted in a single vectorized pass.
+
+    orb = memory_orb((76, 230, 230), asset_rng("orb_jinwoo_sister"))
+    [[still, frame_1, ...]] = render_orbs([orb], [None] + loop_times(16))
+"""
+
+from collections import namedtuple
+import math
+
+from PIL import Image
+import numpy as np
+
+from pipeline.bloom import bloom
+from pipeline.particles import Particles
+from pipeline.sequence import wave
+
+ORB_SIZE = 128
+
+# Drawn this many times larger, then box-filtered down
+SUPERSAMPLE = 2
+
+# Core radius and its breathing swell, as fractions of the texture size
+CORE = 0.2
+PULSE = 0.08
+
+# Fragments' orbit radii (fractions of the size) and how much a full
+# breath pulls them in
+ORBIT = (0.28, 0.4)
+PULL = 1.5
+
+# Empty border around each cell of a batch, so one cell's glow never
+# reaches the next; size + 2 * this stays a multiple of 64, so the glow's
+# blur pyramid falls the same way for a batch as for a single orb
+GUTTER = 32
+
+# core / glow: RGB; fragments: per-fragment arrays (see orbit_fragments)
+Orb = namedtuple('Orb', ['color', 'glow', 'fragments'])
+
+def draw_memory_orb(particles, x, y, radius, color, glow_color, alpha=200):
+    """Queue the discs of a glowing memory orb on a Particles batch"""
+    # Outer glow
+    for i in range(3, 0, -1):
+        glow_radius = radius + i * 4
+        glow_alpha = int(alpha / (i + 1))
+        # Create glow effect
+        particles.add(x, y, glow_radius, glow_color, glow_alpha)
+
+    # Core
+    particles.add(x, y, radius, color, alpha)
+
+    # Highlight
+    highlight_offset = radius // 3
+    highlight_radius = radius // 4
+    particles.add(x - highlight_offset, y - highlight_offset, highlight_radius,
+                  (255, 255, 255), 150)
+
+def orbit_fragments(rng, count):
+    """Orbits for `count` fragments: a dict of per-fragment arrays
+
+    Each fragment circles on an ellipse of radius `orbit` squashed to
+    `squash` and tilted by `tilt`, making a whole number of `laps` per
+    loop so the animation wraps, starting at `phase`.
+    """
+    rows = [(rng.uniform(*ORBIT), rng.uniform(0.25, 0.6), rng.uniform(0, math.pi),
+             rng.choice((-2, -1, 1, 2)), rng.random(), rng.randint(1, 3),
+             rng.randint(90, 210), rng.uniform(0.2, 0.7))
+            for _ in range(count)]
+    keys = ["orbit", "squash", "tilt", "laps", "phase", "radius", "alpha", "whiten"]
+    return {key: np.array(column) for key, column in zip(keys, zip(*rows))}
+
+def memory_orb(color, rng, fragments=14):
+    """Orb for an RGB memory colour; its glow is the colour lifted toward white"""
+    color = tuple(int(c) for c in color[:3])
+    glow = tuple(int(c + (255 - c) * 0.35) for c in color)
+    return Orb(color, glow, orbit_fragments(rng, fragments))
+
+def loop_times(frames):
+    """Loop phases t for `frames` evenly spaced frames"""
+    return [i / frames for i in range(frames)]
+
+def queue_orb(particles, cx, cy, size, orb, t=None):
+    """Queue orb centred on (cx, cy), size px across, at loop phase t (None: at rest)"""
+    breath = float(wave(t)) * PULSE
+    draw_memory_orb(particles, cx, cy, int(round(size * CORE * (1 + breath))),
+                    orb.color, orb.glow, alpha=230)
+
+    f = orb.fragments
+    angle = 2 * np.pi * (f["phase"] + f["laps"] * (t or 0))
+    reach = f["orbit"] * size * (1 - PULL * breath)
+    ox, oy = reach * np.cos(angle), reach * f["squash"] * np.sin(angle)
+    xs = cx + ox * np.cos(f["tilt"]) - oy * np.sin(f["tilt"])
+    ys = cy + ox * np.sin(f["tilt"]) + oy * np.cos(f["tilt"])
+    radii = np.maximum(1, np.rint(f["radius"] * size / ORB_SIZE))
+    colors = np.asarray(orb.glow) + (255 - np.asarray(orb.glow)) * f["whiten"][:, None]
+    for row in zip(np.rint(xs), np.rint(ys), radii, colors, f["alpha"]):
+        particles.add(*row)
+
+def render_orbs(orbs, times=(None,), size=ORB_SIZE):
+    """[[RGBA image per t in times] per orb], all drawn in one pass
+
+    The batch is laid out as a grid, one row per orb and one column per
+    time, drawn SUPERSAMPLE times larger with ImageDraw's replace
+    semantics like the ending orbs, box-filtered down, given one glow,
+    and cut back into cells.
+    """
+    pitch = size + 2 * GUTTER
+    big = size * SUPERSAMPLE
+    particles = Particles()
+    for row, orb in enumerate(orbs):
+        for col, t in enumerate(times):
+            cx = (col * pitch + GUTTER) * SUPERSAMPLE + big // 2
+            cy = (row * pitch + GUTTER) * SUPERSAMPLE + big // 2
+            queue_orb(particles, cx, cy, big, orb, t)
+
+    grid = (len(times) * pitch, len(orbs) * pitch)
+    canvas = Image.new('RGBA', (grid[0] * SUPERSAMPLE, grid[1] * SUPERSAMPLE), (0, 0, 0, 0))
+    canvas = particles.draw(canvas, blend=False)
+    # resize() premultiplies alpha, so the transparent ground doesn't darken the edges
+    canvas = bloom(canvas.resize(grid, Image.BOX), size * 0.05)
+    return [[canvas.crop((col * pitch + GUTTER, row * pitch + GUTTER,
+                          col * pitch + GUTTER + size, row * pitch + GUTTER + size))
+             for col in range(len(times))]
+            for row in range(len(orbs))]
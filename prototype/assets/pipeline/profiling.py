@@ -0,0 +1,126 @@
+"""
+Stage-level profiling for the render pipelines
+Records Chrome trace-event JSON (open in chrome://tracing or
+ui.perfetto.dev) with per-stage durations and image sizes
+
+Tracing is off unless enabled; disabled hooks return immediately.
+    ASSET_TRACE=trace.json python generate_endings.py
+    python build_assets.py --trace trace.json
+"""
+
+from contextlib import contextmanager
+import atexit
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+TRACE_ENV = "ASSET_TRACE"
+
+_events = []
+_state = {"enabled": False, "path": None}
+
+def enabled():
+    """True if stages are being recorded in this process"""
+    return _state["enabled"] or bool(os.environ.get(TRACE_ENV))
+
+def enable(path=None):
+    """Turn tracing on; with a path, write the trace when the process exits
+
+    Also exports the setting so worker processes started afterwards
+    record their stages too.
+    """
+    _state["enabled"] = True
+    if path:
+        os.environ[TRACE_ENV] = path
+        if _state["path"] is None:
+            atexit.register(lambda: write_trace(_state["path"]))
+        _state["path"] = path
+
+def _now_us():
+    return time.perf_counter_ns() // 1000
+
+def _size_arg(size):
+    if size is None:
+        return {}
+    if hasattr(size, "size"):
+        size = size.size
+    return {"size": f"{size[0]}x{size[1]}"}
+
+def _record(name, start_us, end_us, args):
+    _events.append({
+        "name": name, "ph": "X", "ts": start_us, "dur": end_us - start_us,
+        "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+    })
+
+@contextmanager
+def stage(name, size=None, **args):
+    """Time a block as one trace event; size may be a (w, h) or an image"""
+    if not enabled():
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _record(name, start, _now_us(), dict(_size_arg(size), **args))
+
+class StageTimer:
+    """Back-to-back stages inside one long function
+
+        timer = StageTimer(size)
+        timer("gradient")
+        ...
+        timer("vignette")
+        ...
+        timer.done()
+
+    Each call closes the previous stage and opens the next, so a
+    create_* function can be split into stages without re-indenting it.
+    """
+
+    def __init__(self, size=None):
+        self.active = enabled()
+        self.args = _size_arg(size)
+        self.current = None
+
+    def __call__(self, name):
+        if not self.active:
+            return
+        now = _now_us()
+        if self.current:
+            _record(self.current[0], self.current[1], now, self.args)
+        self.current = (name, now)
+
+    def done(self):
+        self("")
+        self.current = None
+
+def drain():
+    """Return and clear the events recorded so far in this process"""
+    events = list(_events)
+    _events.clear()
+    return events
+
+def record(events):
+    """Add events gathered from another process"""
+    _events.extend(events)
+
+def write_trace(path, events=None):
+    """Write a Chrome trace-event JSON file"""
+    events = drain() if events is None else events
+    if not events:
+        return
+    names = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+              "args": {"name": ("build" if pid == os.getpid() else f"worker {pid}")}}
+             for pid in sorted({e["pid"] for e in events})]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, f)
+    if multiprocessing.parent_process() is None:
+        print(f"Trace written: {path} ({len(events)} events)")
+
+# Running a generator script directly with ASSET_TRACE set writes its
+# trace on exit; worker processes hand their events back instead
+if os.environ.get(TRACE_ENV) and multiprocessing.parent_process() is None:
+    enable(os.environ[TRACE_ENV])
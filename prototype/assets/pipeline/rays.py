@@ -0,0 +1,143 @@
+"""
+Analytic light rays for the asset generators
+Each ray is shaded from every pixel's distance across and along it, over
+just the pixels of its own footprint, so render time follows the area
+the rays cover rather than overdrawn strokes or the whole frame
+
+A single polar pass (each pixel's angle -> nearest rays -> falloff) gives
+the same pixels but is 4-6x slower at 16 rays: finding a pixel's rays
+costs more than shading it, and it has to be paid over the whole disc
+the rays can reach.
+"""
+
+import math
+
+from PIL import Image
+import numpy as np
+
+def ray_angles(rng, num_rays, jitter=0.1, phase=0.0):
+    """Evenly spread ray angles, each jittered by rng.uniform(-jitter, jitter)
+
+    Draws one sample per ray in ray order, like the per-ray loops it
+    replaces.
+    """
+    return [phase + 2 * math.pi * i / num_rays + rng.uniform(-jitter, jitter)
+            for i in range(num_rays)]
+
+def linear_profile(u, t):
+    """Opacity fading from the ray axis (u=0) to its edge (u=1)"""
+    return 1 - u
+
+# Footprints are grown by this many pixels to hold the anti-aliased edge
+MARGIN = 1.5
+
+def _footprint(size, center, cos, sin, length, width, end_width):
+    """(ys, xs) of the pixels one ray can touch, or None
+
+    The ray's quad, grown by MARGIN, is scanned row by row: each row
+    takes the pixel centres between its crossings of the quad's edges.
+    """
+    w, h = size
+    cx, cy = center
+    corners = []
+    for along, half in ((-MARGIN, width + MARGIN), (length + MARGIN, end_width + MARGIN)):
+        x, y = cx + along * cos, cy + along * sin
+        corners += [(x - half * sin, y + half * cos), (x + half * sin, y - half * cos)]
+    corners[2:] = corners[:1:-1]
+    y0 = max(0, math.ceil(min(y for x, y in corners)))
+    y1 = min(h - 1, math.floor(max(y for x, y in corners)))
+    if y0 > y1:
+        return None
+
+    rows = np.arange(y0, y1 + 1, dtype=np.float64)
+    left = np.full(len(rows), np.inf)
+    right = np.full(len(rows), -np.inf)
+    for (xa, ya), (xb, yb) in zip(corners, corners[1:] + corners[:1]):
+        if ya == yb:
+            continue
+        crosses = (rows >= min(ya, yb)) & (rows <= max(ya, yb))
+        x = xa + (rows[crosses] - ya) * ((xb - xa) / (yb - ya))
+        left[crosses] = np.minimum(left[crosses], x)
+        right[crosses] = np.maximum(right[crosses], x)
+    x0 = np.maximum(np.ceil(left), 0).astype(np.int64)
+    x1 = np.minimum(np.floor(right), w - 1).astype(np.int64)
+    counts = np.maximum(x1 - x0 + 1, 0)
+    total = counts.sum()
+    if total == 0:
+        return None
+    starts = np.cumsum(counts) - counts
+    ys = np.repeat(rows.astype(np.int64), counts)
+    xs = np.arange(total) + np.repeat(x0 - starts, counts)
+    return ys, xs
+
+def ray_field(size, center, angles, length, width, taper=0.0, profile=linear_profile):
+    """Combined opacity (0..1, float32 (H, W)) of rays from center
+
+    Each ray runs `length` pixels (scalar or one per ray) along its angle
+    with half-width `width` at the source, narrowing to width*(1-taper)
+    at its end. profile(u, t) gives a ray's opacity at normalized
+    distance u from its axis (1 at the edge) and t along it (1 at the
+    end); that is where angular and radial falloff are shaped. Edges
+    are anti-aliased. Each ray is shaded only over its own footprint
+    and composited over the others where they overlap.
+    """
+    w, h = size
+    cx, cy = center
+    angles = np.asarray(angles, dtype=np.float64).ravel()
+    lengths = np.broadcast_to(np.asarray(length, dtype=np.float64), angles.shape)
+    end_width = width * (1 - taper)
+
+    transmit = np.ones((h, w), dtype=np.float32)
+    for angle, ray_length in zip(angles.tolist(), lengths.tolist()):
+        cos, sin = math.cos(angle), math.sin(angle)
+        pixels = _footprint(size, center, cos, sin, ray_length, width, end_width)
+        if pixels is None:
+            continue
+        dx = pixels[1].astype(np.float32) - np.float32(cx)
+        dy = pixels[0].astype(np.float32) - np.float32(cy)
+        along = dx * np.float32(cos) + dy * np.float32(sin)
+        across = np.abs(dx * np.float32(sin) - dy * np.float32(cos))
+        t = along / np.float32(ray_length)
+        half_width = np.float32(width) * (1 - np.float32(taper) * np.clip(t, 0, 1))
+        u = np.minimum(across / np.maximum(half_width, np.float32(1e-3)), 1)
+        # Anti-aliased over the last pixel of each side
+        edge = np.clip(half_width - across + np.float32(0.5), 0, 1)
+        edge[(along < 0) | (t > 1)] = 0
+        opacity = np.clip(profile(u, np.clip(t, 0, 1)) * edge, 0, 1)
+        transmit[pixels] *= 1 - opacity
+    return 1 - transmit
+
+def rays_layer(size, center, angles, length, width, color, alpha=255, taper=0.0,
+               profile=linear_profile):
+    """Rays of `color` as ((x, y), RGBA image) over the box they can reach
+
+    The box is clipped to an image of `size`; returns None when the rays
+    fall entirely outside it.
+    """
+    reach = float(np.max(length)) + width
+    cx, cy = center
+    x0, y0 = max(0, int(cx - reach)), max(0, int(cy - reach))
+    x1 = min(size[0], int(math.ceil(cx + reach)) + 1)
+    y1 = min(size[1], int(math.ceil(cy + reach)) + 1)
+    if x0 >= x1 or y0 >= y1:
+        return None
+
+    field = ray_field((x1 - x0, y1 - y0), (cx - x0, cy - y0), angles, length,
+                      width, taper, profile)
+    layer = np.empty(field.shape + (4,), dtype=np.uint8)
+    layer[..., :3] = color
+    layer[..., 3] = field * alpha + 0.5
+    return (x0, y0), Image.fromarray(layer, 'RGBA')
+
+def draw_rays(img, center, angles, length, width, color, alpha=255, taper=0.0,
+              profile=linear_profile):
+    """Composite rays of `color` over img; returns a new RGBA image
+
+    Only the box the rays can reach is evaluated.
+    """
+    layer = rays_layer(img.size, center, angles, length, width, color, alpha, taper, profile)
+    if layer is None:
+        return img
+    img = img.convert('RGBA')
+    img.alpha_composite(layer[1], layer[0])
+    return img
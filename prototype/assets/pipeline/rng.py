@@ -0,0 +1,20 @@
+"""
+Per-asset deterministic random streams
+Each asset draws from its own generator seeded from (base seed, asset id),
+so rendering one asset alone, in any order or in parallel gives the same
+bytes as a full run
+"""
+
+import hashlib
+import random
+
+BASE_SEED = 42
+
+def asset_seed(asset_id, base_seed=BASE_SEED):
+    """Stable 64-bit seed for an asset (unlike hash(), not salted per process)"""
+    digest = hashlib.sha256(f"{base_seed}:{asset_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def asset_rng(asset_id, base_seed=BASE_SEED):
+    """Fresh random.Random stream for one asset"""
+    return random.Random(asset_seed(asset_id, base_seed))
@@ -0,0 +1,149 @@
+"""
+Layered scenes and looping frame sequences for the ending illustrations
+An ending is a stack of named layers: static ones render once, dynamic
+ones (particles, fog, pulsing glows) are redrawn per frame at loop phase
+t in [0, 1). The still image is the same stack at rest (t=None).
+
+    scene = Scene((1920, 1080))
+
+    @scene.static("background")
+    def background(img):
+        return linear_gradient(scene.size, colors).convert('RGBA')
+
+    @scene.dynamic("particles")
+    def particles(img, t):
+        xs, ys = drift(px, py, t, box, rise=1)
+        return splat(img, xs, ys, radii, color, alphas, blend=False)
+
+    img = scene.render(timer)                        # the still
+    for frame in scene.frames(300): ...              # the loop
+"""
+
+from collections import namedtuple
+import math
+import os
+
+from PIL import Image
+import numpy as np
+
+from pipeline import profiling
+from pipeline.encode import save_image
+
+STATIC, DYNAMIC = 'static', 'dynamic'
+
+# draw is img -> img for static layers, img, t -> img for dynamic ones
+Layer = namedtuple('Layer', ['name', 'kind', 'draw'])
+
+# Golden-ratio phase offsets: spread evenly without drawing from the rng,
+# so animating an ending never changes its still
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+def phases(n):
+    """n deterministic loop phase offsets in [0, 1)"""
+    return np.remainder(np.arange(n) * _GOLDEN, 1.0)
+
+def wave(t, offsets=0.0):
+    """sin(2*pi*(t + offsets)); 0 for the still (t=None)"""
+    if t is None:
+        return np.zeros_like(np.asarray(offsets, dtype=np.float64))
+    return np.sin(2 * np.pi * (t + np.asarray(offsets, dtype=np.float64)))
+
+def drift(xs, ys, t, box, rise=0, sway=0.0):
+    """Particle positions at loop phase t; the rest positions for t=None
+
+    Particles rise `rise` whole box heights per loop, wrapping from the
+    top of box (x0, y0, x1, y1) back to its bottom, and sway `sway`
+    pixels side to side, so frame count-1 flows back into frame 0.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if t is None:
+        return xs.astype(np.int64), ys.astype(np.int64)
+    x0, y0, x1, y1 = box
+    if rise:
+        ys = y0 + np.remainder(ys - y0 - rise * t * (y1 - y0), y1 - y0)
+    if sway:
+        xs = xs + sway * wave(t, phases(len(xs)))
+    return np.rint(xs).astype(np.int64), np.rint(ys).astype(np.int64)
+
+class Scene:
+    """An ordered stack of static and dynamic layers"""
+
+    def __init__(self, size):
+        self.size = size
+        self.layers = []
+
+    def _add(self, name, kind):
+        def register(draw):
+            self.layers.append(Layer(name, kind, draw))
+            return draw
+        return register
+
+    def static(self, name):
+        """Register img -> img, drawn once"""
+        return self._add(name, STATIC)
+
+    def dynamic(self, name):
+        """Register (img, t) -> img, redrawn every frame"""
+        return self._add(name, DYNAMIC)
+
+    @staticmethod
+    def _apply(layer, img, t):
+        return layer.draw(img, t) if layer.kind == DYNAMIC else layer.draw(img)
+
+    def render(self, timer=None):
+        """The still: every layer in order at rest; timer gets one stage per layer"""
+        img = None
+        for layer in self.layers:
+            if timer:
+                timer(layer.name)
+            img = self._apply(layer, img, None)
+        return img
+
+    def frames(self, count):
+        """Yield `count` RGBA frames of one loop
+
+        Layers below the first dynamic one are flattened into a cached
+        plate; each frame copies the plate and applies the rest. Static
+        layers above the first dynamic one (vignette, title) are
+        re-applied per frame, so keep them cheap; layergraph.GraphScene
+        re-applies them only over the window the dynamic layers touch.
+        """
+        first = next((i for i, layer in enumerate(self.layers) if layer.kind == DYNAMIC),
+                     len(self.layers))
+        with profiling.stage("plate", self.size):
+            plate = None
+            for layer in self.layers[:first]:
+                plate = self._apply(layer, plate, None)
+
+        for i in range(count):
+            with profiling.stage("frame", self.size, frame=i):
+                img = plate.copy()
+                for layer in self.layers[first:]:
+                    img = self._apply(layer, img, i / count)
+            yield img
+
+def save_sequence(frames, output_dir, name, profile=None):
+    """Write frames as output_dir/name_0000.png ...; returns the paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    return [save_image(frame.convert('RGB'), os.path.join(output_dir, f"{name}_{i:04d}.png"), profile)
+            for i, frame in enumerate(frames)]
+
+def sprite_sheet(frames, count, columns=None, cell=None, mode='RGB'):
+    """Tile `count` frames left to right, top to bottom into one sheet
+
+    cell (w, h) downscales each frame; a 1080p loop has to be shrunk to
+    fit a texture. columns defaults to a roughly square grid. mode='RGBA'
+    keeps the frames' transparency.
+    """
+    columns = columns or math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    sheet = None
+    for i, frame in enumerate(frames):
+        if cell and frame.size != tuple(cell):
+            frame = frame.resize(cell, Image.Resampling.BOX)
+        if sheet is None:
+            w, h = frame.size
+            sheet = Image.new(mode, (w * columns, h * rows))
+        sheet.paste(frame.convert(mode), ((i % columns) * w, (i // columns) * h))
+    return sheet
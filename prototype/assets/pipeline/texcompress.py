@@ -0,0 +1,231 @@
+"""
+Offline GPU texture compression for generated art
+Pure NumPy BC1 (opaque) and BC3 (with alpha) encoders writing DDS files
+Godot imports as VRAM-compressed textures, with the PSNR cost per asset
+
+All 4x4 blocks of an image are encoded at once: endpoints from the
+block's principal colour axis, indices by nearest palette entry.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import namedtuple
+import os
+import struct
+
+from PIL import Image
+import numpy as np
+
+Compressed = namedtuple('Compressed', ['source', 'path', 'format', 'bytes', 'psnr'])
+
+# Godot import settings for a DDS that is already block compressed
+IMPORT_TEMPLATE = """[remap]
+
+importer="texture"
+type="CompressedTexture2D"
+metadata={{
+"vram_texture": true
+}}
+
+[deps]
+
+source_file="{source}"
+
+[params]
+
+compress/mode=2
+compress/high_quality=false
+compress/lossy_quality=0.7
+compress/hdr_compression=1
+compress/normal_map=0
+compress/channel_pack=0
+mipmaps/generate=false
+mipmaps/limit=-1
+roughness/mode=0
+roughness/src_normal=""
+process/fix_alpha_border=true
+process/premult_alpha=false
+process/normal_map_invert_y=false
+process/hdr_as_srgb=false
+process/hdr_clamp_exposure=false
+process/size_limit=0
+detect_3d/compress_to=0
+"""
+
+def _blocks(arr):
+    """(H, W, C) -> (N, 16, C) 4x4 blocks, edge-padded to a multiple of 4"""
+    h, w, c = arr.shape
+    ph, pw = -h % 4, -w % 4
+    if ph or pw:
+        arr = np.pad(arr, ((0, ph), (0, pw), (0, 0)), mode='edge')
+    h, w = arr.shape[:2]
+    blocks = arr.reshape(h // 4, 4, w // 4, 4, c).swapaxes(1, 2)
+    return blocks.reshape(-1, 16, c), (h // 4, w // 4)
+
+def _unblocks(blocks, grid, size):
+    gh, gw = grid
+    c = blocks.shape[-1]
+    arr = blocks.reshape(gh, gw, 4, 4, c).swapaxes(1, 2).reshape(gh * 4, gw * 4, c)
+    return arr[:size[1], :size[0]]
+
+def _to565(rgb):
+    q = np.rint(rgb * np.array([31, 63, 31], dtype=np.float32) / 255).astype(np.uint16)
+    return (q[..., 0] << 11) | (q[..., 1] << 5) | q[..., 2]
+
+def _from565(c):
+    r, g, b = (c >> 11) & 31, (c >> 5) & 63, c & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)],
+                    axis=-1).astype(np.float32)
+
+def _color_palette(c0, c1):
+    p0, p1 = _from565(c0), _from565(c1)
+    return np.stack([p0, p1, (2 * p0 + p1) / 3, (p0 + 2 * p1) / 3], axis=1)
+
+def _pack_indices(indices, bits):
+    """Pack 16 per-texel indices into one little-endian integer per block"""
+    shifts = np.arange(16, dtype=np.uint64) * np.uint64(bits)
+    return (indices.astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+
+def _encode_color(rgb):
+    """BC1 4-colour blocks for (N, 16, 3) float32 texels -> (N, 8) uint8"""
+    mean = rgb.mean(axis=1, keepdims=True)
+    centered = rgb - mean
+    cov = np.einsum('nki,nkj->nij', centered, centered)
+    # Principal axis by power iteration, starting from the luma direction
+    axis = np.broadcast_to(np.float32([0.577, 0.577, 0.577]), (len(rgb), 3)).copy()
+    for _ in range(4):
+        axis = np.einsum('nij,nj->ni', cov, axis)
+        norm = np.linalg.norm(axis, axis=1, keepdims=True)
+        axis = np.where(norm > 1e-6, axis / np.maximum(norm, 1e-6), np.float32(0.577))
+    proj = np.einsum('nki,ni->nk', centered, axis)
+    lo = mean[:, 0] + proj.min(axis=1, keepdims=True) * axis
+    hi = mean[:, 0] + proj.max(axis=1, keepdims=True) * axis
+    c0 = _to565(np.clip(hi, 0, 255))
+    c1 = _to565(np.clip(lo, 0, 255))
+    # c0 > c1 selects the 4-colour mode
+    swap = c0 < c1
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+
+    palette = _color_palette(c0, c1)
+    dist = ((rgb[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+    indices = dist.argmin(axis=2)
+    indices[c0 == c1] = 0
+
+    out = np.empty((len(rgb), 8), dtype=np.uint8)
+    out[:, 0:2] = c0.astype('<u2').view(np.uint8).reshape(-1, 2)
+    out[:, 2:4] = c1.astype('<u2').view(np.uint8).reshape(-1, 2)
+    out[:, 4:8] = _pack_indices(indices, 2).astype('<u4').view(np.uint8).reshape(-1, 4)
+    return out
+
+def _alpha_palette(a0, a1):
+    a0, a1 = a0.astype(np.float32), a1.astype(np.float32)
+    steps = [a0, a1] + [((7 - i) * a0 + i * a1) / 7 for i in range(1, 7)]
+    return np.floor(np.stack(steps, axis=1) + 0.5)
+
+def _encode_alpha(alpha):
+    """BC3 alpha blocks (8-value mode) for (N, 16) float32 -> (N, 8) uint8"""
+    a0 = alpha.max(axis=1).astype(np.uint8)
+    a1 = alpha.min(axis=1).astype(np.uint8)
+    palette = _alpha_palette(a0, a1)
+    indices = np.abs(alpha[:, :, None] - palette[:, None, :]).argmin(axis=2)
+    indices[a0 == a1] = 0
+    bits = _pack_indices(indices, 3)
+
+    out = np.empty((len(alpha), 8), dtype=np.uint8)
+    out[:, 0] = a0
+    out[:, 1] = a1
+    out[:, 2:8] = bits.astype('<u8').view(np.uint8).reshape(-1, 8)[:, :6]
+    return out
+
+def _decode_color(data):
+    c0 = data[:, 0:2].copy().view('<u2')[:, 0]
+    c1 = data[:, 2:4].copy().view('<u2')[:, 0]
+    bits = data[:, 4:8].copy().view('<u4')[:, 0].astype(np.uint64)
+    indices = (bits[:, None] >> (np.arange(16, dtype=np.uint64) * np.uint64(2))) & np.uint64(3)
+    palette = np.floor(_color_palette(c0, c1) + 0.5)
+    return np.take_along_axis(palette, indices.astype(np.int64)[:, :, None], axis=1)
+
+def _decode_alpha(data):
+    bits = np.zeros((len(data), 8), dtype=np.uint8)
+    bits[:, :6] = data[:, 2:8]
+    bits = bits.view('<u8')[:, 0]
+    indices = (bits[:, None] >> (np.arange(16, dtype=np.uint64) * np.uint64(3))) & np.uint64(7)
+    palette = _alpha_palette(data[:, 0], data[:, 1])
+    return np.take_along_axis(palette, indices.astype(np.int64), axis=1)
+
+def encode(img):
+    """Block-compress an image; returns (fourcc, bytes, decoded RGBA array)
+
+    Images with any transparency become BC3 (DXT5), the rest BC1 (DXT1).
+    """
+    rgba = np.asarray(img.convert('RGBA'), dtype=np.float32)
+    blocks, grid = _blocks(rgba)
+    color = _encode_color(blocks[..., :3])
+    decoded = np.empty_like(blocks)
+    decoded[..., :3] = _decode_color(color)
+    if (blocks[..., 3] < 255).any():
+        alpha = _encode_alpha(blocks[..., 3])
+        decoded[..., 3] = _decode_alpha(alpha)
+        fourcc, data = b'DXT5', np.concatenate([alpha, color], axis=1)
+    else:
+        decoded[..., 3] = 255
+        fourcc, data = b'DXT1', color
+    return fourcc, data.tobytes(), _unblocks(decoded, grid, img.size)
+
+def psnr(a, b):
+    """Peak signal-to-noise ratio in dB between two uint8-range arrays"""
+    mse = np.mean((np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)) ** 2)
+    return float('inf') if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+def dds_header(size, fourcc, linear_size):
+    """128-byte DDS header for a single-level block-compressed texture"""
+    w, h = size
+    flags = 0x1 | 0x2 | 0x4 | 0x1000 | 0x80000  # CAPS|HEIGHT|WIDTH|PIXELFORMAT|LINEARSIZE
+    pixel_format = struct.pack('<II4s5I', 32, 0x4, fourcc, 0, 0, 0, 0, 0)
+    return (b'DDS ' + struct.pack('<7I', 124, flags, h, w, linear_size, 0, 1)
+            + b'\0' * 44 + pixel_format + struct.pack('<5I', 0x1000, 0, 0, 0, 0))
+
+def dds_path(path):
+    """The .dds compress_file() writes beside path"""
+    return os.path.splitext(path)[0] + '.dds'
+
+def is_stale(path):
+    """True if path exists and its .dds is missing or older than it"""
+    if not os.path.exists(path):
+        return False
+    dds = dds_path(path)
+    return not os.path.exists(dds) or os.path.getmtime(dds) < os.path.getmtime(path)
+
+def compress_file(path):
+    """Write path's .dds and .dds.import beside it; returns a Compressed"""
+    # Imported here so worker processes stay light
+    from pipeline.atlas import res_path
+
+    img = Image.open(path)
+    img.load()
+    fourcc, data, decoded = encode(img)
+    dds = dds_path(path)
+    with open(dds, 'wb') as f:
+        f.write(dds_header(img.size, fourcc, len(data)) + data)
+    with open(dds + '.import', 'w', encoding='utf-8') as f:
+        f.write(IMPORT_TEMPLATE.format(source=res_path(dds) or os.path.basename(dds)))
+
+    source = np.asarray(img.convert('RGBA'))
+    channels = 4 if fourcc == b'DXT5' else 3
+    return Compressed(path, dds, 'BC3' if fourcc == b'DXT5' else 'BC1',
+                      len(data), psnr(source[..., :channels], decoded[..., :channels]))
+
+def compress_files(paths, workers=None):
+    """compress_file() over a process pool; results in input order"""
+    if workers == 1:
+        return [compress_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(compress_file, paths))
+
+def format_report(results):
+    """Per-asset VRAM size and PSNR table"""
+    lines = [f"{'texture':<32}{'format':>7}{'VRAM KiB':>10}{'RGBA8 KiB':>11}{'PSNR dB':>9}"]
+    for r in results:
+        w, h = Image.open(r.source).size
+        lines.append(f"{os.path.basename(r.source):<32}{r.format:>7}{r.bytes / 1024:>10.0f}"
+                     f"{w * h * 4 / 1024:>11.0f}{r.psnr:>9.2f}")
+    return "\n".join(lines)
@@ -0,0 +1,183 @@
+"""
+Tile-streamed rendering for poster-size exports
+Evaluates a layer-graph spec at any scale one tile at a time, each tile
+extended by its filters' reach so blurs see their whole neighbourhood,
+and streams every finished row of tiles into a PNG encoder. Peak memory
+follows the budget, not the output size.
+
+    size, path = render_tiled(SPECS["ending_mercy"], NODES, "mercy_8k.png",
+                              scale=4, budget=256 << 20)
+"""
+
+import math
+import struct
+import zlib
+
+import numpy as np
+
+from pipeline import profiling
+from pipeline.layergraph import ALIGN, resolve, reach, render_view
+from pipeline.view import View
+
+# Peak working set per pixel of an (extended) tile: the composite and
+# float32 fields (Drawing layers draw straight onto the composite); ~75
+# was measured on the endings at 4x when every layer was rasterized on a
+# canvas of its own, so this leaves extra headroom.
+TILE_BYTES_PER_PIXEL = 96
+
+# Per pixel of a row band: the RGB band it is assembled in
+BAND_BYTES_PER_PIXEL = 3
+
+# IDAT chunk size the stream flushes at
+CHUNK = 1 << 16
+
+# Raw bytes filtered per step; the int16 candidates take ~30x this
+FILTER_BYTES = 1 << 19
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+def _filter_rows(rows, prev, bpp):
+    """PNG-filter (n, stride) uint8 rows; returns (n, 1 + stride) bytes
+
+    Each row takes whichever of None, Sub, Up and Paeth has the
+    smallest sum of absolute signed residuals, libpng's heuristic.
+    """
+    up_src = np.concatenate([prev[None, :], rows[:-1]])
+    left = np.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+    up_left = np.zeros_like(rows)
+    up_left[:, bpp:] = up_src[:, :-bpp]
+
+    a, b, c = left.astype(np.int16), up_src.astype(np.int16), up_left.astype(np.int16)
+    pa, pb, pc = np.abs(b - c), np.abs(a - c), np.abs(a + b - 2 * c)
+    predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up_src, up_left))
+
+    candidates = np.stack([rows, rows - left, rows - up_src, rows - predictor])
+    cost = np.stack([np.abs(c.view(np.int8).astype(np.int16)).sum(axis=1, dtype=np.int64)
+                     for c in candidates])
+    choice = cost.argmin(axis=0)
+    out = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+    out[:, 0] = np.array([0, 1, 2, 4], dtype=np.uint8)[choice]
+    out[:, 1:] = candidates[choice, np.arange(len(rows))]
+    return out
+
+class PngStream:
+    """A PNG written band by band; only zlib's window and one chunk stay in memory
+
+        with PngStream(path, (w, h)) as png:
+            for band in bands:          # (rows, w, 3) uint8, top to bottom
+                png.write(band)
+    """
+
+    def __init__(self, path, size, mode='RGB', level=6):
+        self.path = path
+        self.size = size
+        self.channels = {'RGB': 3, 'RGBA': 4}[mode]
+        self.rows = 0
+        self._file = open(path, 'wb')
+        self._zlib = zlib.compressobj(level)
+        self._pending = []
+        self._pending_bytes = 0
+        self._prev = np.zeros(size[0] * self.channels, dtype=np.uint8)
+        color_type = 2 if mode == 'RGB' else 6
+        self._file.write(PNG_SIGNATURE + _chunk(
+            b'IHDR', struct.pack('>IIBBBBB', size[0], size[1], 8, color_type, 0, 0, 0)))
+
+    def _emit(self, data, force=False):
+        if data:
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+        if self._pending_bytes >= CHUNK or (force and self._pending_bytes):
+            self._file.write(_chunk(b'IDAT', b''.join(self._pending)))
+            self._pending, self._pending_bytes = [], 0
+
+    def write(self, band):
+        """Append (rows, width, channels) uint8 rows below those written so far"""
+        rows = np.ascontiguousarray(band, dtype=np.uint8).reshape(len(band), -1)
+        if rows.shape[1] != len(self._prev):
+            raise ValueError(f"band rows are {rows.shape[1]} bytes, expected {len(self._prev)}")
+        if self.rows + len(rows) > self.size[1]:
+            raise ValueError(f"{self.rows + len(rows)} rows written to a {self.size[1]}-row PNG")
+        step = max(1, FILTER_BYTES // rows.shape[1])
+        for i in range(0, len(rows), step):
+            chunk = rows[i:i + step]
+            self._emit(self._zlib.compress(_filter_rows(chunk, self._prev, self.channels).tobytes()))
+            self._prev = chunk[-1].copy()
+        self.rows += len(rows)
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self.rows != self.size[1]:
+                raise ValueError(f"PNG closed after {self.rows} of {self.size[1]} rows")
+            self._emit(self._zlib.flush(), force=True)
+            self._file.write(_chunk(b'IEND', b''))
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self._file.close()
+
+def tile_shape(size, margin, budget):
+    """(tile width, tile height) for an output of size within budget bytes
+
+    Tiles are as square as the budget allows, then widened with what is
+    left; a full-width band needs no horizontal overlap at all.
+    """
+    w, h = size
+
+    def cost(tw, th):
+        return ((tw + 2 * margin) * (th + 2 * margin) * TILE_BYTES_PER_PIXEL
+                + w * th * BAND_BYTES_PER_PIXEL)
+
+    side = ALIGN
+    if cost(side, side) > budget:
+        raise ValueError(f"a {budget >> 20} MB budget is too small for {ALIGN}px tiles "
+                         f"with {margin}px overlap; raise it to at least "
+                         f"{math.ceil(cost(side, side) / (1 << 20))} MB")
+    while side < max(w, h) and cost(side + ALIGN, side + ALIGN) <= budget:
+        side += ALIGN
+    th = min(side, h)
+    tw = min(side, w)
+    while tw < w and cost(tw + ALIGN, th) <= budget:
+        tw += ALIGN
+    return min(tw, w), th
+
+def render_tiled(spec, types, path, scale, budget=256 << 20, level=6):
+    """Render spec at `scale` into a PNG at path, tile by tile
+
+    Random parameters are drawn once, as for the still, so every tile
+    shows the same composition. Returns ((width, height), path).
+    """
+    size, nodes = resolve(spec, types)
+    w, h = View(size, scale).full
+    margin = reach(nodes, scale, types)
+    margin = -(-margin // ALIGN) * ALIGN
+    tw, th = tile_shape((w, h), margin, budget)
+
+    with PngStream(path, (w, h), 'RGB', level) as png:
+        for y0 in range(0, h, th):
+            y1 = min(h, y0 + th)
+            band = np.empty((y1 - y0, w, 3), dtype=np.uint8)
+            for x0 in range(0, w, tw):
+                x1 = min(w, x0 + tw)
+                ext = (max(0, x0 - margin), max(0, y0 - margin),
+                       min(w, x1 + margin), min(h, y1 + margin))
+                with profiling.stage("tile", (ext[2] - ext[0], ext[3] - ext[1]), x=x0, y=y0):
+                    tile = render_view(nodes, View(size, scale, ext), types).convert('RGB')
+                    band[:, x0:x1] = np.asarray(tile)[y0 - ext[1]:y1 - ext[1], x0 - ext[0]:x1 - ext[0]]
+                del tile
+            with profiling.stage("encode", (w, y1 - y0), y=y0):
+                png.write(band)
+    return (w, h), path
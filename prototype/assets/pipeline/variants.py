@@ -0,0 +1,93 @@
+"""
+Render-once, emit-many resolution variants
+Takes one master render and writes resampled copies (720p, Steam Deck,
+thumbnails, ...) next to it, reusing intermediate levels so extra sizes
+cost little more than one. Sizes above the master (4K, 1024px portraits)
+are drawn natively by the generator's render(scale) callback: an upscale
+would add bytes but no detail
+"""
+
+import os
+
+from PIL import Image
+
+from pipeline.encode import save_image
+
+# name -> (width, height); aspect ratios that differ from the master are
+# center-cropped to fill
+ENDING_VARIANTS = {
+    "4k": (3840, 2160),
+    "720p": (1280, 720),
+    "steamdeck": (1280, 800),
+    "thumb": (320, 180),
+}
+
+PORTRAIT_VARIANTS = {
+    "1024": (1024, 1024),
+    "256": (256, 256),
+    "thumb": (128, 128),
+}
+
+# UI scaling and high-DPI sizes; icons draw these from their vectors
+ICON_VARIANTS = {str(px): (px, px) for px in (16, 24, 32, 48, 96, 128, 256, 512)}
+
+def variant_path(output_path, name):
+    """ending_mercy.png -> ending_mercy_720p.png"""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_{name}{ext}"
+
+def _same_aspect(a, b):
+    return abs(a[0] * b[1] - a[1] * b[0]) <= max(a[1], b[1])
+
+def _fit(source, size):
+    """Resample source to cover size, then center-crop to it"""
+    sw, sh = source.size
+    tw, th = size
+    scale = max(tw / sw, th / sh)
+    scaled = (max(tw, round(sw * scale)), max(th, round(sh * scale)))
+    # reducing_gap lets Pillow do the bulk with a cheap integer reduce
+    img = source.resize(scaled, Image.LANCZOS, reducing_gap=3.0)
+    if scaled != size:
+        left = (scaled[0] - tw) // 2
+        top = (scaled[1] - th) // 2
+        img = img.crop((left, top, left + tw, top + th))
+    return img
+
+def _larger(size, master_size):
+    return size[0] > master_size[0] or size[1] > master_size[1]
+
+def render_variants(master, variants, render=None):
+    """Resample master into every {name: size}; returns {name: image}
+
+    Targets are produced largest first, and each one is resampled from
+    the smallest already-produced level that still covers it. Sizes larger
+    than the master come from render(scale), the composition drawn at
+    scale times the master's size, cropped to fit; without render they
+    are skipped.
+    """
+    levels = [master]
+    out = {}
+    for name, size in sorted(variants.items(), key=lambda kv: -kv[1][0] * kv[1][1]):
+        if _larger(size, master.size):
+            if render:
+                out[name] = _fit(render(max(size[0] / master.size[0], size[1] / master.size[1])), size)
+            continue
+        candidates = [lv for lv in levels if lv.size[0] >= size[0] and lv.size[1] >= size[1]]
+        source = min(candidates, key=lambda lv: lv.size[0] * lv.size[1])
+        img = _fit(source, size)
+        out[name] = img
+        # Cropped levels would reframe anything derived from them
+        if img.size[0] < master.size[0] and _same_aspect(img.size, master.size):
+            levels.append(img)
+    return out
+
+def save_variants(master, output_path, variants=None, profile=None, render=None):
+    """Write each variant beside output_path; returns the written paths
+
+    render(scale) draws the variants larger than the master (see
+    render_variants).
+    """
+    if not variants:
+        return []
+    return [save_image(img, variant_path(output_path, name), profile)
+            for name, img in render_variants(master, variants, render).items()]
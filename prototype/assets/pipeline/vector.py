@@ -0,0 +1,131 @@
+"""
+Resolution-independent shape lists for small vector art such as UI icons
+A drawing is a list of shape dicts in design units. The same list
+rasterizes at any size, supersampled so thin strokes stay smooth, and
+exports to SVG for renderers that would rather rasterize at runtime.
+
+    shapes = [{"shape": "ellipse", "box": (12, 12, 52, 52), "width": 2}, ...]
+    img = rasterize(shapes, (64, 64), (256, 256), color=(255, 180, 50))
+    svg = to_svg(shapes, (64, 64), color=(255, 180, 50), glow=3.5)
+
+Shapes mean what the matching ImageDraw call means: boxes are inclusive
+pixel boxes, lines join pixel centres and arcs run clockwise in degrees
+from 3 o'clock. "alpha" defaults to 255 and "color" to the drawing's
+colour; ellipses are outlined unless "fill" is set.
+"""
+
+import math
+
+from PIL import Image
+
+from pipeline.view import View
+
+# Supersampling factor for sizes other than the design size
+SUPERSAMPLE = 4
+
+def _rgba(shape, color):
+    return (*shape.get("color", color), shape.get("alpha", 255))
+
+def draw_shapes(draw, shapes, color):
+    """Issue each shape as an ImageDraw (or ViewDraw) call, in order"""
+    for shape in shapes:
+        kind = shape["shape"]
+        rgba = _rgba(shape, color)
+        width = shape.get("width", 1)
+        if kind == "line":
+            draw.line(shape["points"], fill=rgba, width=width)
+        elif kind == "arc":
+            draw.arc(shape["box"], *shape["angles"], fill=rgba, width=width)
+        elif kind == "ellipse" and shape.get("fill"):
+            draw.ellipse(shape["box"], fill=rgba)
+        elif kind == "ellipse":
+            draw.ellipse(shape["box"], outline=rgba, width=width)
+        else:
+            raise ValueError(f"unknown shape {kind!r}; expected line, arc or ellipse")
+
+def rasterize(shapes, design, size, color, supersample=None):
+    """RGBA image of shapes drawn at size (w, h)
+
+    At the design size the shapes are drawn directly, pixel for pixel
+    what the ImageDraw calls give. Other sizes are drawn `supersample`
+    times larger through a View and box-filtered down.
+    """
+    size = tuple(size)
+    if supersample is None:
+        supersample = 1 if size == tuple(design) else SUPERSAMPLE
+    view = View(design, size[0] * supersample / design[0])
+    img = Image.new('RGBA', view.full, (0, 0, 0, 0))
+    draw_shapes(view.draw(img), shapes, color)
+    if img.size != size:
+        # resize() premultiplies alpha, so edges don't darken the way reduce()'s would
+        img = img.resize(size, Image.BOX)
+    return img
+
+def _num(value):
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+def _paint(kind, rgba):
+    r, g, b, a = rgba
+    paint = f'{kind}="#{r:02x}{g:02x}{b:02x}"'
+    if a != 255:
+        paint += f' {kind}-opacity="{_num(a / 255)}"'
+    return paint
+
+def _ellipse_geometry(box, inset):
+    # An inclusive box covers x0..x1 + 1; outlines are drawn inside it
+    x0, y0, x1, y1 = box
+    return ((x0 + x1 + 1) / 2, (y0 + y1 + 1) / 2,
+            (x1 - x0 + 1) / 2 - inset, (y1 - y0 + 1) / 2 - inset)
+
+def _svg_element(shape, color):
+    rgba = _rgba(shape, color)
+    width = shape.get("width", 1)
+    stroke = f'fill="none" {_paint("stroke", rgba)} stroke-width="{_num(width)}"'
+    kind = shape["shape"]
+    if kind == "line":
+        points = " ".join(f"{_num(x + 0.5)},{_num(y + 0.5)}" for x, y in shape["points"])
+        return f'<polyline points="{points}" {stroke}/>'
+    if kind == "ellipse":
+        inset = 0 if shape.get("fill") else width / 2
+        cx, cy, rx, ry = _ellipse_geometry(shape["box"], inset)
+        paint = _paint("fill", rgba) if shape.get("fill") else stroke
+        return (f'<ellipse cx="{_num(cx)}" cy="{_num(cy)}" '
+                f'rx="{_num(rx)}" ry="{_num(ry)}" {paint}/>')
+    if kind == "arc":
+        cx, cy, rx, ry = _ellipse_geometry(shape["box"], width / 2)
+        start, end = shape["angles"]
+        sweep = (end - start) % 360 or 360
+        if sweep == 360:
+            return _svg_element({**shape, "shape": "ellipse"}, color)
+        a0, a1 = math.radians(start), math.radians(start + sweep)
+        x0, y0 = cx + rx * math.cos(a0), cy + ry * math.sin(a0)
+        x1, y1 = cx + rx * math.cos(a1), cy + ry * math.sin(a1)
+        # y points down, so the positive sweep flag runs clockwise like ImageDraw
+        return (f'<path d="M {_num(x0)} {_num(y0)} A {_num(rx)} {_num(ry)} 0 '
+                f'{int(sweep > 180)} 1 {_num(x1)} {_num(y1)}" {stroke}/>')
+    raise ValueError(f"unknown shape {kind!r}; expected line, arc or ellipse")
+
+def to_svg(shapes, design, color, glow=0, size=None):
+    """SVG document drawing shapes in a design-unit viewBox
+
+    glow adds a Gaussian blur of that radius under the shapes, as
+    bloom() does for the raster. Renderers without SVG filter support
+    draw the shapes without it.
+    """
+    w, h = design
+    out_w, out_h = size or design
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{out_w}" height="{out_h}" '
+             f'viewBox="0 0 {w} {h}">']
+    group = "<g>"
+    if glow:
+        lines += ['  <defs>',
+                  '    <filter id="glow" x="-50%" y="-50%" width="200%" height="200%">',
+                  f'      <feGaussianBlur in="SourceGraphic" stdDeviation="{_num(glow)}" result="blur"/>',
+                  '      <feMerge><feMergeNode in="blur"/><feMergeNode in="SourceGraphic"/></feMerge>',
+                  '    </filter>',
+                  '  </defs>']
+        group = '<g filter="url(#glow)">'
+    lines.append(f"  {group}")
+    lines += [f"    {_svg_element(shape, color)}" for shape in shapes]
+    lines += ["  </g>", "</svg>", ""]
+    return "\n".join(lines)
@@ -0,0 +1,135 @@
+"""
+Views onto a design-size canvas for the layer-graph node renderers
+A view maps the design coordinates an ending is written in (1920x1080)
+to the pixels of one output window: the whole frame for the still, or
+one tile of a scaled-up poster export. Nodes draw through their view,
+so the same spec renders at any scale, one window at a time.
+
+    view = View((1920, 1080))                           # the still
+    view = View((1920, 1080), 4, (0, 0, 1024, 1024))    # top-left 8K tile
+    radial_field(view.size, view.point(center), view.length(radius))
+    view.draw(img).ellipse(...)                         # design coordinates
+"""
+
+from PIL import ImageDraw
+import numpy as np
+
+from pipeline.particles import splat
+
+class View:
+    """Window `box` (x0, y0, x1, y1) of `design` scaled by `scale`"""
+
+    def __init__(self, design, scale=1, box=None):
+        self.design = tuple(design)
+        self.scale = scale
+        self.full = (int(round(self.design[0] * scale)), int(round(self.design[1] * scale)))
+        self.box = tuple(box) if box is not None else (0, 0, *self.full)
+        self.origin = self.box[:2]
+        self.size = (self.box[2] - self.box[0], self.box[3] - self.box[1])
+        self.identity = scale == 1 and self.box == (0, 0, *self.full)
+
+    def __repr__(self):
+        return f"View({self.design}, scale={self.scale}, box={self.box})"
+
+    @property
+    def crop(self):
+        """The box, or None when the view covers the whole output"""
+        return None if self.box == (0, 0, *self.full) else self.box
+
+    def x(self, value):
+        return value if self.identity else value * self.scale - self.origin[0]
+
+    def y(self, value):
+        return value if self.identity else value * self.scale - self.origin[1]
+
+    def point(self, p):
+        return p if self.identity else (self.x(p[0]), self.y(p[1]))
+
+    def length(self, value):
+        """Scale a distance, a list of distances or an (rx, ry) pair"""
+        if self.identity:
+            return value
+        if isinstance(value, (list, tuple)):
+            return type(value)(v * self.scale for v in value)
+        return value * self.scale
+
+    def draw(self, img):
+        """ImageDraw for img taking design coordinates"""
+        return ImageDraw.Draw(img) if self.identity else ViewDraw(img, self)
+
+    def _discs(self, xs, ys, radii):
+        if not self.identity:
+            xs = np.rint(np.asarray(xs, dtype=np.float64) * self.scale - self.origin[0])
+            ys = np.rint(np.asarray(ys, dtype=np.float64) * self.scale - self.origin[1])
+            radii = np.rint(np.asarray(radii, dtype=np.float64) * self.scale)
+        return xs, ys, radii
+
+    def splat(self, img, xs, ys, radii, colors, alphas, blend=True):
+        """particles.splat() with centres and radii in design coordinates"""
+        return splat(img, *self._discs(xs, ys, radii), colors, alphas, blend)
+
+    def disc_box(self, xs, ys, radii):
+        """Pixel box (x0, y0, x1, y1) splat() draws those discs in, or None"""
+        xs, ys, radii = (np.asarray(v, dtype=np.int64) for v in self._discs(xs, ys, radii))
+        if xs.size == 0:
+            return None
+        x0, y0 = max(0, int((xs - radii).min())), max(0, int((ys - radii).min()))
+        x1 = min(self.size[0], int((xs + radii).max()) + 1)
+        y1 = min(self.size[1], int((ys + radii).max()) + 1)
+        return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+def _is_flat(xy):
+    return len(xy) > 0 and not isinstance(xy[0], (list, tuple))
+
+class ViewDraw:
+    """The ImageDraw calls the generators use, mapped through a view
+
+    Strokes widen with the scale so 1px rows stay gap-free, and fonts
+    are re-sized with font_variant().
+    """
+
+    def __init__(self, img, view):
+        self.view = view
+        self.draw = ImageDraw.Draw(img)
+
+    def _xy(self, xy):
+        v = self.view
+        if _is_flat(xy):
+            return [v.x(c) if i % 2 == 0 else v.y(c) for i, c in enumerate(xy)]
+        return [v.point(p) for p in xy]
+
+    def _box(self, xy):
+        # Boxes are inclusive, so the far corner covers its whole scaled pixel
+        x0, y0, x1, y1 = xy if _is_flat(xy) else (*xy[0], *xy[1])
+        v, s = self.view, self.view.scale
+        if s == 1:
+            return self._xy(xy)
+        return [v.x(x0), v.y(y0), max(v.x(x0), v.x(x1 + 1) - 1), max(v.y(y0), v.y(y1 + 1) - 1)]
+
+    def _width(self, width):
+        # ImageDraw draws width 0 as a 1px line
+        return max(1, int(round(max(width, 1) * self.view.scale)))
+
+    def _font(self, font):
+        if font is None or not hasattr(font, 'font_variant'):
+            return font
+        return font.font_variant(size=max(1, int(round(font.size * self.view.scale))))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.draw.ellipse(self._box(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.draw.rectangle(self._box(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.draw.polygon(self._xy(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def line(self, xy, fill=None, width=0):
+        self.draw.line(self._xy(xy), fill=fill, width=self._width(width))
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        self.draw.arc(self._box(xy), start, end, fill=fill, width=self._width(width))
+
+    def text(self, xy, text, fill=None, font=None, anchor=None, **kwargs):
+        self.draw.text(self.view.point(xy), text, fill=fill, font=self._font(font),
+                       anchor=anchor, **kwargs)
@@ -0,0 +1,106 @@
+"""
+Shared vignette masks for the asset generators
+Rectangular and elliptical falloff built analytically from size, strength
+and shape, memoized per (size, params) and applied in 8-bit by Pillow.
+A mask is a tuple of (box, 'L' image) patches; pixels outside every
+patch are left alone, so a rectangular vignette only touches its border
+bands.
+"""
+
+from functools import lru_cache
+import math
+
+from PIL import Image
+import numpy as np
+
+def _patch(box, amount):
+    return (tuple(int(v) for v in box), Image.fromarray(np.rint(amount * 255).astype(np.uint8), 'L'))
+
+def _clip(box, window):
+    x0, y0 = max(box[0], window[0]), max(box[1], window[1])
+    x1, y1 = min(box[2], window[2]), min(box[3], window[3])
+    return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+def rect_vignette_bands(size, depth):
+    """Boxes covering every pixel a rectangular vignette of `depth` darkens"""
+    w, h = size
+    d = math.ceil(depth)
+    top, bottom = min(d, h), max(h - d, min(d, h))
+    bands = [(0, 0, w, top), (0, bottom, w, h), (0, top, min(d, w), bottom),
+             (max(w - d, min(d, w)), top, w, bottom)]
+    return [band for band in bands if band[0] < band[2] and band[1] < band[3]]
+
+def rect_vignette_window(size, depth, strength, sides, box):
+    """rect_vignette_mask(size, ...) for the (x0, y0, x1, y1) window box
+
+    Patch boxes are relative to the window. Not memoized: tiled renders
+    ask for each window once.
+    """
+    w, h = size
+    patches = []
+    for band in rect_vignette_bands(size, depth):
+        clipped = _clip(band, box)
+        if clipped is None:
+            continue
+        x0, y0, x1, y1 = clipped
+        x = np.arange(x0, x1, dtype=np.float32)
+        y = np.arange(y0, y1, dtype=np.float32)
+        dx = np.minimum(x, w - 1 - x)[None, :]
+        dy = np.minimum(y, h - 1 - y)[:, None]
+        ramp_x = np.clip(1 - dx / np.float32(depth), 0, 1) * np.float32(sides)
+        ramp_y = np.clip(1 - dy / np.float32(depth), 0, 1)
+        amount = np.maximum(ramp_x, ramp_y) * np.float32(strength)
+        patches.append(_patch((x0 - box[0], y0 - box[1], x1 - box[0], y1 - box[1]), amount))
+    return tuple(patches)
+
+@lru_cache(maxsize=32)
+def rect_vignette_mask(size, depth, strength, sides=1.0):
+    """Mask of a rectangular vignette
+
+    Ramps linearly from `strength` at the top/bottom edges to 0 at `depth`
+    pixels in; the left/right edges are scaled by `sides`. The patches
+    are the four border bands and are shared between callers.
+    """
+    return rect_vignette_window(size, depth, strength, sides, (0, 0, *size))
+
+@lru_cache(maxsize=32)
+def ellipse_vignette_mask(size, strength, inner=0.55, outer=1.45):
+    """Mask of an elliptical vignette, one patch over the whole frame
+
+    Uses elliptical distance t (1 at the edge midpoints, ~1.41 in the
+    corners) with a smoothstep from `inner` to `outer`. Shared between
+    callers.
+    """
+    w, h = size
+    x = (np.arange(w, dtype=np.float32) - (w - 1) / 2) / np.float32(w / 2)
+    y = (np.arange(h, dtype=np.float32) - (h - 1) / 2) / np.float32(h / 2)
+    t = np.sqrt(x[None, :] ** 2 + y[:, None] ** 2)
+    s = np.clip((t - inner) / np.float32(outer - inner), 0, 1)
+    return (_patch((0, 0, w, h), s * s * (3 - 2 * s) * np.float32(strength)),)
+
+def crop_mask(mask, box):
+    """The part of mask inside box, relative to the box"""
+    patches = []
+    for patch_box, patch in mask:
+        clipped = _clip(patch_box, box)
+        if clipped is not None:
+            x0, y0, x1, y1 = clipped
+            patches.append(((x0 - box[0], y0 - box[1], x1 - box[0], y1 - box[1]),
+                            patch.crop((x0 - patch_box[0], y0 - patch_box[1],
+                                        x1 - patch_box[0], y1 - patch_box[1]))))
+    return tuple(patches)
+
+def apply_vignette(img, mask, color=(0, 0, 0)):
+    """Pull RGB toward `color` by the mask: c + (color - c) * mask
+
+    Each patch is one Image.composite with a flat `color` carrying the
+    patch's own alpha, so alpha is left as is.
+    """
+    out = img.copy()
+    for box, amount in mask:
+        region = out.crop(box)
+        ink = Image.new(img.mode, region.size, tuple(color[:3]) + (255,) * (len(img.mode) - 3))
+        if 'A' in img.mode:
+            ink.putalpha(region.getchannel('A'))
+        out.paste(Image.composite(ink, region, amount), box[:2])
+    return out
@@ -2,15 +2,70 @@
 Neo-Noir Character Portrait Generator
 Spectral Emergence Design Philosophy
 For 기억의 전당포 (Memory Pawnshop)
+
+Usage:
+    python generate_portraits.py                 # portraits and the atlas
+    python generate_portraits.py --expressions   # plus one per dialogue emotion
 """
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from PIL import Image, ImageDraw, ImageFont
+import argparse
+from collections import namedtuple
+import glob
 import math
-import random
 import os
-
-# Set seed for reproducibility
-random.seed(42)
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.atlas import build_atlas
+from pipeline.bands import band_composite
+from pipeline.bloom import pyramid_blur
+from pipeline.compositing import apply_grain, grain_offsets
+from pipeline.dialogues import (DIALOGUE_DIR, dialogue_characters, dialogue_portraits,
+                                portrait_emotions)
+from pipeline.encode import encoded_path, save_image
+from pipeline.gradients import linear_gradient, radial_field, ring_steps, shade
+from pipeline.glyphs import draw_glow_text
+from pipeline.particles import Particles
+from pipeline.profiling import StageTimer
+from pipeline.rng import asset_rng
+from pipeline.variants import PORTRAIT_VARIANTS, save_variants
+from pipeline.view import View
+from pipeline.vignette import ellipse_vignette_mask, apply_vignette, crop_mask
+
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Resolution variants written by the batch builder's --variants mode
+VARIANTS = PORTRAIT_VARIANTS
+
+# Folder beside the portraits for the per-emotion expression portraits
+EXPRESSIONS_DIR = "expressions"
+
+# Atlas pages, manifest and AtlasTexture folder written by post_build()
+ATLAS_NAME = "portraits_atlas"
+
+# Portraits this script draws: silhouette style, and the art-directed
+# accent of those drawn before the build followed the dialogue. Names
+# come from the dialogue files, and so does the accent (memory_color)
+# where this gives None. The dialogue's other portraits
+# (portrait_minji.png, ...) are painted by hand.
+PORTRAIT_STYLES = {
+    "portrait_soldier_kim.png": ("soldier", "#6B7280"),
+    "portrait_haneul.png": ("idol", "#F472B6"),
+    "portrait_professor_lee.png": ("professor", "#3B82F6"),
+    "portrait_gang.png": ("gang", "#8B5CF6"),
+    "portrait_minji_mother.png": ("mother", "#F5B700"),
+    "portrait_suyeon.png": ("sister", "#00D4FF"),
+}
+
+# Accent for a drawn portrait whose dialogue has no memory_color
+DEFAULT_ACCENT = "#9CA3AF"
+
+def characters(dialogue_dir=DIALOGUE_DIR):
+    """(name, style, accent hex, file name) of every portrait a dialogue uses that this draws"""
+    found = dialogue_characters(dialogue_dir)
+    return [(found[filename][0], style, accent or found[filename][1] or DEFAULT_ACCENT, filename)
+            for filename, (style, accent) in PORTRAIT_STYLES.items() if filename in found]
 
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
@@ -19,19 +74,10 @@ def hex_to_rgb(hex_color):
 
 def create_radial_gradient(size, center, color, intensity=1.0):
     """Create a radial gradient for glow effects"""
-    img = Image.new('RGBA', size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    cx, cy = center
     max_radius = int(math.sqrt(size[0]**2 + size[1]**2) / 2)
 
-    for r in range(max_radius, 0, -2):
-        alpha = int(255 * (1 - r/max_radius) * intensity * 0.3)
-        alpha = max(0, min(255, alpha))
-        c = (*color, alpha)
-        draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=c)
-
-    return img
+    field = ring_steps(radial_field(size, center, max_radius), max_radius / 2)
+    return shade(field, color, lambda t: 255 * (1 - t) * intensity * 0.3)
 
 def draw_silhouette(draw, size, character_type, accent_color):
     """Draw a stylized silhouette based on character type"""
@@ -100,77 +146,100 @@ def draw_silhouette(draw, size, character_type, accent_color):
 
     return head_y, head_size, shoulder_width
 
-def add_facial_features(draw, cx, head_y, head_size, accent_color, character_type):
+# Eyes per character: (shape, half width, half height, alpha)
+EYES = {
+    "soldier": ("ellipse", 4, 2, 80),     # Haunted, thousand-yard stare
+    "idol": ("ellipse", 5, 3, 90),        # Wide, hopeful but sad
+    "professor": ("ellipse", 3, 2, 60),   # Wise but fading
+    "gang": ("line", 6, 0, 120),          # Piercing, cold
+    "mother": ("ellipse", 4, 3, 85),      # Warm, worried
+    "sister": ("ellipse", 5, 4, 100),     # Hopeful, bright
+}
+
+# How each expression changes the eyes: openness and brightness
+# multipliers, brow tilt (+1 raises the inner ends, -1 lowers them; no
+# key, no brows), brow lift and gaze offset in px. "neutral" is the
+# character's base portrait.
+EXPRESSIONS = {
+    "neutral": {},
+    "angry": {"open": 0.6, "glow": 1.4, "brow": -1},
+    "cold": {"open": 0.5, "glow": 1.2, "brow": 0},
+    "sad": {"open": 0.8, "glow": 0.8, "brow": 1, "gaze": (0, 2)},
+    "fearful": {"open": 1.5, "glow": 1.1, "brow": 1, "lift": 2},
+    "hopeful": {"open": 1.2, "glow": 1.3, "gaze": (0, -1)},
+    "weary": {"open": 0.4, "glow": 0.6, "gaze": (0, 2)},
+    "surprised": {"open": 1.8, "glow": 1.2, "brow": 0, "lift": 4},
+    "thoughtful": {"open": 0.9, "brow": 0, "gaze": (3, -1)},
+}
+
+# Dialogue emotion tags -> expression; unlisted tags render as "neutral"
+EMOTION_EXPRESSIONS = {
+    **dict.fromkeys(["angry", "frustrated", "defensive", "firm", "urgent"], "angry"),
+    **dict.fromkeys(["cold", "dismissive", "matter_of_fact", "manipulative", "smug",
+                     "knowing", "guarded"], "cold"),
+    **dict.fromkeys(["sad", "bitter", "pained", "heartbroken", "devastated", "tearful",
+                     "wistful", "nostalgic", "ashamed", "guilty", "resigned"], "sad"),
+    **dict.fromkeys(["nervous", "anxious", "fearful", "frozen", "desperate",
+                     "desperate_hidden", "pleading", "worried", "haunted",
+                     "traumatized"], "fearful"),
+    **dict.fromkeys(["hopeful", "relieved", "grateful", "accepting", "understanding",
+                     "determined", "satisfied", "proud"], "hopeful"),
+    **dict.fromkeys(["exhausted", "weary", "broken", "empty", "hollow"], "weary"),
+    **dict.fromkeys(["surprised", "confused"], "surprised"),
+    **dict.fromkeys(["thoughtful", "contemplative", "curious", "intrigued", "listening",
+                     "serious"], "thoughtful"),
+}
+
+def expression_for(emotion):
+    """Expression name for a dialogue emotion tag (None -> "neutral")"""
+    return EMOTION_EXPRESSIONS.get(emotion, "neutral")
+
+def add_facial_features(draw, cx, head_y, head_size, accent_color, character_type,
+                        expression="neutral"):
     """Add minimal, stylized facial features"""
     # Very subtle eye highlight
     eye_y = head_y - int(head_size * 0.1)
     eye_spacing = int(head_size * 0.35)
 
-    # Different eye expressions per character
-    if character_type == "soldier":
-        # Haunted, thousand-yard stare
-        for ex in [-eye_spacing, eye_spacing]:
-            draw.ellipse([
-                cx + ex - 4, eye_y - 2,
-                cx + ex + 4, eye_y + 2
-            ], fill=(*accent_color, 80))
-    elif character_type == "idol":
-        # Wide, hopeful but sad
-        for ex in [-eye_spacing, eye_spacing]:
-            draw.ellipse([
-                cx + ex - 5, eye_y - 3,
-                cx + ex + 5, eye_y + 3
-            ], fill=(*accent_color, 90))
-    elif character_type == "professor":
-        # Wise but fading
-        for ex in [-eye_spacing, eye_spacing]:
-            draw.ellipse([
-                cx + ex - 3, eye_y - 2,
-                cx + ex + 3, eye_y + 2
-            ], fill=(*accent_color, 60))
-    elif character_type == "gang":
-        # Piercing, cold
-        for ex in [-eye_spacing, eye_spacing]:
-            draw.line([
-                (cx + ex - 6, eye_y),
-                (cx + ex + 6, eye_y)
-            ], fill=(*accent_color, 120), width=2)
-    elif character_type == "mother":
-        # Warm, worried
-        for ex in [-eye_spacing, eye_spacing]:
-            draw.ellipse([
-                cx + ex - 4, eye_y - 3,
-                cx + ex + 4, eye_y + 3
-            ], fill=(*accent_color, 85))
-    else:  # sister
-        # Hopeful, bright
-        for ex in [-eye_spacing, eye_spacing]:
-            draw.ellipse([
-                cx + ex - 5, eye_y - 4,
-                cx + ex + 5, eye_y + 4
-            ], fill=(*accent_color, 100))
-
-def add_memory_particles(img, accent_color, density=30):
-    """Add floating memory particles"""
-    draw = ImageDraw.Draw(img)
-    w, h = img.size
+    shape, ew, eh, alpha = EYES.get(character_type, EYES["sister"])
+    mood = EXPRESSIONS[expression]
+    eh = max(1, round(eh * mood.get("open", 1))) if eh else 0
+    alpha = min(255, round(alpha * mood.get("glow", 1)))
+    gx, gy = mood.get("gaze", (0, 0))
+
+    for ex in [-eye_spacing, eye_spacing]:
+        x, y = cx + ex + gx, eye_y + gy
+        if shape == "line":
+            draw.line([(x - ew, y), (x + ew, y)], fill=(*accent_color, alpha),
+                      width=max(1, round(2 * mood.get("open", 1))))
+        else:
+            draw.ellipse([x - ew, y - eh, x + ew, y + eh], fill=(*accent_color, alpha))
+
+        if "brow" in mood:
+            # Inner end toward the nose, tilted by the expression
+            side = 1 if ex > 0 else -1
+            brow_y = eye_y - max(eh, 2) - 6 - mood.get("lift", 0)
+            draw.line([(cx + ex - side * (ew + 2), brow_y - 3 * mood["brow"]),
+                       (cx + ex + side * (ew + 3), brow_y)],
+                      fill=(*accent_color, alpha * 7 // 10), width=2)
+
+def memory_particles(size, accent_color, rng, density=30):
+    """Floating memory particles, as a Particles list to draw"""
+    particles = Particles()
+    w, h = size
 
     for _ in range(density):
-        x = random.randint(0, w)
-        y = random.randint(0, h)
-        size = random.randint(1, 4)
-        alpha = random.randint(30, 120)
-
-        draw.ellipse([
-            x - size, y - size,
-            x + size, y + size
-        ], fill=(*accent_color, alpha))
+        x = rng.randint(0, w)
+        y = rng.randint(0, h)
+        size = rng.randint(1, 4)
+        alpha = rng.randint(30, 120)
 
-    return img
+        particles.add(x, y, size, accent_color, alpha)
+    return particles
 
-def add_edge_glow(img, accent_color, side='right'):
-    """Add neon edge glow effect"""
-    w, h = img.size
+def edge_glow_layer(size, accent_color, side='right'):
+    """Blurred neon edge glow, to composite over the portrait"""
+    w, h = size
     glow = Image.new('RGBA', (w, h), (0, 0, 0, 0))
     draw = ImageDraw.Draw(glow)
 
@@ -190,85 +259,70 @@ def add_edge_glow(img, accent_color, side='right'):
             draw.line([(i, 0), (i, h)], fill=(*accent_color, alpha))
             draw.line([(w-i, 0), (w-i, h)], fill=(*accent_color, alpha))
 
-    glow = glow.filter(ImageFilter.GaussianBlur(10))
-    img = Image.alpha_composite(img, glow)
-    return img
+    return pyramid_blur(glow, 10)
 
-def create_portrait(character_name, character_type, accent_hex, output_path):
-    """Create a single character portrait"""
-    size = (512, 512)
+# The emotion-independent layers of a portrait, kept so expressions only
+# redraw the face: `under` is the frame before the eyes are drawn, the
+# rest is what create_portrait() lays over it, and `final` is the result.
+PortraitBase = namedtuple('PortraitBase', ['size', 'accent', 'character_type', 'head',
+                                           'under', 'particles', 'edge_glow', 'vignette',
+                                           'grain', 'final'])
+
+def render_base(character_name, character_type, accent_hex, asset_id, size=(512, 512),
+                timer=None):
+    """Render a portrait with its base expression; returns its PortraitBase"""
+    rng = asset_rng(asset_id)
     accent_color = hex_to_rgb(accent_hex)
+    timer = timer or StageTimer(size)
 
     # Create base image with dark gradient background
-    img = Image.new('RGBA', size, (8, 8, 12, 255))
-    draw = ImageDraw.Draw(img)
-
-    # Add subtle background gradient
-    for y in range(size[1]):
-        darkness = int(8 + (y / size[1]) * 10)
-        draw.line([(0, y), (size[0], y)], fill=(darkness, darkness, darkness + 4, 255))
+    timer("background")
+    img = linear_gradient(size, [(8, 8, 12), (18, 18, 22)]).convert('RGBA')
 
     # Add ambient glow from accent color
+    timer("ambient_glow")
     glow = create_radial_gradient(size, (size[0]//2, size[1]//3), accent_color, 0.6)
-    glow = glow.filter(ImageFilter.GaussianBlur(80))
-    img = Image.alpha_composite(img, glow)
+    glow = pyramid_blur(glow, 80)
+    img = band_composite(img, glow)
 
     # Redraw after composite
     draw = ImageDraw.Draw(img)
 
     # Draw silhouette
+    timer("silhouette")
     head_y, head_size, shoulder_width = draw_silhouette(draw, size, character_type, accent_color)
+    under = img.copy()
 
     # Add facial features
     add_facial_features(draw, size[0]//2, head_y, head_size, accent_color, character_type)
 
     # Add memory particles
-    img = add_memory_particles(img, accent_color, density=40)
+    timer("particles")
+    particles = memory_particles(size, accent_color, rng, density=40)
+    img = particles.draw(img, blend=False)
 
     # Add edge glow
-    img = add_edge_glow(img, accent_color, 'both')
-
-    # Add subtle vignette
-    vignette = Image.new('RGBA', size, (0, 0, 0, 0))
-    vdraw = ImageDraw.Draw(vignette)
-    for i in range(100):
-        alpha = int(150 * (i / 100))
-        vdraw.ellipse([
-            -size[0]//2 + i*3, -size[1]//2 + i*3,
-            size[0]*1.5 - i*3, size[1]*1.5 - i*3
-        ], outline=(0, 0, 0, alpha))
-    vignette = vignette.filter(ImageFilter.GaussianBlur(30))
-
-    # Invert vignette (darker at edges)
-    img_array = list(img.getdata())
-    vig_array = list(vignette.getdata())
-    result = []
-    for i in range(len(img_array)):
-        r, g, b, a = img_array[i]
-        vr, vg, vb, va = vig_array[i]
-        factor = 1 - (va / 255) * 0.5
-        result.append((int(r * factor), int(g * factor), int(b * factor), a))
-    img.putdata(result)
+    timer("edge_glow")
+    edge_glow = edge_glow_layer(size, accent_color, 'both')
+    img = band_composite(img, edge_glow)
+
+    # Add subtle vignette (darker at edges)
+    timer("vignette")
+    vignette = ellipse_vignette_mask(size, 0.3)
+    img = apply_vignette(img, vignette)
 
     # Add subtle noise texture
-    for _ in range(2000):
-        x = random.randint(0, size[0]-1)
-        y = random.randint(0, size[1]-1)
-        pixel = img.getpixel((x, y))
-        noise = random.randint(-10, 10)
-        new_pixel = (
-            max(0, min(255, pixel[0] + noise)),
-            max(0, min(255, pixel[1] + noise)),
-            max(0, min(255, pixel[2] + noise)),
-            pixel[3]
-        )
-        img.putpixel((x, y), new_pixel)
+    timer("grain")
+    grain = grain_offsets(size, rng, count=2000, amount=10)
+    img = apply_grain(img, grain)
 
     # Convert to RGB for saving as PNG
+    timer("flatten")
     final = Image.new('RGB', size, (8, 8, 12))
     final.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
 
     # Add character name subtly at bottom
+    timer("name_text")
     draw_final = ImageDraw.Draw(final)
 
     # Try to use a nice font, fallback to default
@@ -279,43 +333,131 @@ def create_portrait(character_name, character_type, accent_hex, output_path):
 
     # Draw name with glow effect
     name_y = size[1] - 35
-    text_color = (*accent_color,)
-
-    # Glow behind text
-    for offset in range(3, 0, -1):
-        glow_alpha = 100 - offset * 30
-        glow_color = (accent_color[0], accent_color[1], accent_color[2])
-        draw_final.text((size[0]//2 - offset, name_y), character_name,
-                       font=font, fill=glow_color, anchor="mm")
-        draw_final.text((size[0]//2 + offset, name_y), character_name,
-                       font=font, fill=glow_color, anchor="mm")
-
-    draw_final.text((size[0]//2, name_y), character_name,
-                   font=font, fill=text_color, anchor="mm")
+    draw_glow_text(draw_final, (size[0]//2, name_y), character_name, font,
+                   tuple(accent_color), anchor="mm")
+
+    return PortraitBase(size, accent_color, character_type, (head_y, head_size),
+                        under, particles, edge_glow, vignette, grain, final)
+
+def render_expression(base, expression):
+    """base.final with the eyes redrawn for expression
+
+    Only the head's box is re-rendered: the eyes are drawn on the cached
+    frame beneath them, and the particles, edge glow, vignette and grain
+    are applied again from their cached layers. Every one of those is
+    per-pixel, so the box matches a full render and is pasted back into
+    the base. The name text lies below the head and is left as is.
+    """
+    w, h = base.size
+    head_y, head_size = base.head
+    cx = w // 2
+    box = (max(0, cx - head_size), max(0, head_y - head_size),
+           min(w, cx + head_size + 1), min(h, head_y + head_size + 1))
+    x0, y0, x1, y1 = box
+
+    view = View(base.size, 1, box)
+    region = base.under.crop(box)
+    add_facial_features(view.draw(region), cx, head_y, head_size, base.accent,
+                        base.character_type, expression)
+    region = view.splat(region, *base.particles.columns(), blend=False)
+    region = band_composite(region, base.edge_glow.crop(box))
+    region = apply_vignette(region, crop_mask(base.vignette, box))
+    region = apply_grain(region, base.grain[y0:y1, x0:x1])
+
+    flat = Image.new('RGB', region.size, (8, 8, 12))
+    flat.paste(region, mask=region.split()[3])
+    out = base.final.copy()
+    out.paste(flat, box[:2])
+    return out
+
+def expression_path(output_path, emotion):
+    """portraits/portrait_haneul.png -> portraits/expressions/portrait_haneul_hopeful.png"""
+    root, ext = os.path.splitext(os.path.basename(output_path))
+    return os.path.join(os.path.dirname(output_path), EXPRESSIONS_DIR, f"{root}_{emotion}{ext}")
+
+def save_expressions(base, output_path, emotions):
+    """Write one portrait per emotion; returns the written paths
+
+    Emotions sharing an expression share one render.
+    """
+    renders = {}
+    paths = []
+    for emotion in emotions:
+        expression = expression_for(emotion)
+        if expression not in renders:
+            renders[expression] = render_expression(base, expression)
+        path = expression_path(output_path, emotion)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        paths.append(save_image(renders[expression], path))
+    return paths
+
+def create_portrait(character_name, character_type, accent_hex, output_path, asset_id=None,
+                    variants=None, size=(512, 512), expressions=None):
+    """Create a single character portrait
+
+    asset_id seeds the portrait's random stream; defaults to the file name.
+    variants maps suffix -> size for extra copies of the render; sizes above
+    `size` are rendered natively, the rest resampled.
+    expressions lists dialogue emotions to also write an expression
+    portrait for (see save_expressions); they reuse this render's layers.
+    """
+    if asset_id is None:
+        asset_id = os.path.splitext(os.path.basename(output_path))[0]
+    timer = StageTimer(size)
+    base = render_base(character_name, character_type, accent_hex, asset_id, size, timer)
 
     # Save
-    final.save(output_path, 'PNG')
-    print(f"Created: {output_path}")
-
-def main():
-    output_dir = r"C:\Users\user\projects\2026_active\neowiz_quest\prototype\assets\portraits"
-
+    timer("save")
+    output_path = save_image(base.final, output_path)
+    timer("variants")
+    save_variants(base.final, output_path, variants, render=lambda scale: render_base(
+        character_name, character_type, accent_hex, asset_id,
+        (round(size[0] * scale), round(size[1] * scale))).final)
+    if expressions:
+        timer("expressions")
+        save_expressions(base, output_path, expressions)
+    timer.done()
+
+def jobs(output_dir=OUTPUT_DIR):
+    """List (asset_id, create function, args) for every portrait the dialogue uses"""
+    return [(os.path.splitext(filename)[0], create_portrait,
+             (name, char_type, color, os.path.join(output_dir, filename)))
+            for name, char_type, color, filename in characters()]
+
+def job_expressions(output_path):
+    """Emotions the dialogue tags the lines of output_path's character with"""
+    return portrait_emotions().get(os.path.basename(output_path), [])
+
+def post_build(output_dir=OUTPUT_DIR):
+    """Pack every portrait in output_dir into the portrait atlas
+
+    Regions are keyed by character (portrait_haneul.png -> haneul) and by
+    each dialogue's portrait_key (idol_trainee -> the same region).
+    """
+    variant_suffixes = tuple(f"_{name}" for name in PORTRAIT_VARIANTS)
+    sources = {}
+    for path in sorted(glob.glob(encoded_path(os.path.join(output_dir, "portrait_*.png")))):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if not stem.endswith(variant_suffixes):
+            sources[stem[len("portrait_"):]] = path
+    aliases = {key: os.path.splitext(filename)[0][len("portrait_"):]
+               for key, filename in dialogue_portraits().items()}
+    build_atlas(sources, output_dir, ATLAS_NAME, aliases, mode='RGB')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render the character portraits and their atlas")
+    parser.add_argument("--expressions", action="store_true",
+                        help=f"also write a portrait per dialogue emotion into {EXPRESSIONS_DIR}/")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     # Ensure directory exists
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Character definitions
-    characters = [
-        ("김 상병", "soldier", "#6B7280", "portrait_soldier_kim.png"),
-        ("하늘", "idol", "#F472B6", "portrait_haneul.png"),
-        ("이 교수", "professor", "#3B82F6", "portrait_professor_lee.png"),
-        ("강 회장", "gang", "#8B5CF6", "portrait_gang.png"),
-        ("민지 어머니", "mother", "#F5B700", "portrait_minji_mother.png"),
-        ("김수연", "sister", "#00D4FF", "portrait_suyeon.png"),
-    ]
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    for name, char_type, color, filename in characters:
-        output_path = os.path.join(output_dir, filename)
-        create_portrait(name, char_type, color, output_path)
+    for asset_id, func, paths in jobs(OUTPUT_DIR):
+        func(*paths, expressions=job_expressions(paths[-1]) if args.expressions else None)
+    post_build(OUTPUT_DIR)
 
     print("\nAll portraits generated successfully!")
 
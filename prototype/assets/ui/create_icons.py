@@ -1,216 +1,203 @@
 """
 Neon Memoria - UI Icons Generator
 Creates 4 UI icons for "기억의 전당포" (Memory Pawnshop)
-Minimalist neon line art style
+Minimalist neon line art style, drawn from resolution-independent shape
+lists at 64px plus any extra sizes, with an SVG of each for Godot
+
+Usage:
+    python create_icons.py                      # 64px icons, SVGs and the atlas
+    python create_icons.py --sizes 16 32 128    # also draw these sizes
 """
 
-from PIL import Image, ImageDraw, ImageFilter
-import math
+import argparse
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.atlas import build_atlas
+from pipeline.bloom import bloom, chained_radius
+from pipeline.encode import encoded_path, save_image
+from pipeline.profiling import StageTimer
+from pipeline.variants import ICON_VARIANTS, variant_path
+from pipeline.vector import rasterize, to_svg
 
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 SIZE = 64
 
-def create_glow_effect(img, glow_color, intensity=2):
-    """Add glow effect to an image"""
-    # Create a blurred version for glow
-    glow = img.copy()
-    for _ in range(intensity):
-        glow = glow.filter(ImageFilter.GaussianBlur(2))
-
-    # Composite the glow under the original
-    result = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    result = Image.alpha_composite(result, glow)
-    result = Image.alpha_composite(result, img)
-    return result
-
-def create_icon_mercy():
+# Multi-DPI sizes written by the batch builder's --variants mode
+VARIANTS = ICON_VARIANTS
+
+# Few colours and hard edges: a 256-colour palette PNG is about half the bytes
+ICON_PROFILE = 'palette'
+
+def create_glow_effect(img, glow_color, intensity=2, scale=1):
+    """Add glow effect to an image drawn at `scale` times SIZE"""
+    # One blur equivalent to `intensity` chained GaussianBlur(2) passes,
+    # composited under the original
+    return bloom(img, chained_radius(2, intensity) * scale)
+
+# Icon geometry in SIZE x SIZE design units (see pipeline.vector for the
+# shape format); glow is the number of chained GaussianBlur(2) passes
+ICONS = {
+    # Heart with soft glow (amber/gold): two arcs meeting in a point
+    "icon_mercy": {"color": (255, 200, 100), "glow": 3, "shapes": [
+        {"shape": "arc", "box": (10, 18, 32, 41), "angles": (90, 220), "width": 2},
+        {"shape": "arc", "box": (32, 18, 54, 41), "angles": (-40, 90), "width": 2},
+        {"shape": "line", "points": [(23, 37), (32, 50)], "width": 2},
+        {"shape": "line", "points": [(41, 37), (32, 50)], "width": 2},
+        # Inner glow dot
+        {"shape": "ellipse", "box": (29, 31, 35, 37), "fill": True, "alpha": 150},
+    ]},
+    # Scales with cold glow (cyan)
+    "icon_justice": {"color": (0, 220, 255), "glow": 3, "shapes": [
+        # Beam, pillar and base
+        {"shape": "line", "points": [(10, 27), (54, 27)], "width": 2},
+        {"shape": "line", "points": [(32, 27), (32, 44)], "width": 2},
+        {"shape": "line", "points": [(24, 44), (40, 44)], "width": 2},
+        # Pans on their chains
+        {"shape": "line", "points": [(10, 27), (10, 40)], "alpha": 200},
+        {"shape": "arc", "box": (2, 37, 18, 47), "angles": (0, 180), "width": 2},
+        {"shape": "line", "points": [(54, 27), (54, 40)], "alpha": 200},
+        {"shape": "arc", "box": (46, 37, 62, 47), "angles": (0, 180), "width": 2},
+        # Center decoration
+        {"shape": "ellipse", "box": (30, 25, 34, 29), "fill": True, "alpha": 200},
+    ]},
+    # Coin with golden glow
+    "icon_profit": {"color": (255, 180, 50), "glow": 3, "shapes": [
+        {"shape": "ellipse", "box": (12, 12, 52, 52), "width": 2},
+        {"shape": "ellipse", "box": (18, 18, 46, 46), "alpha": 180},
+        # Stylized currency symbol
+        {"shape": "line", "points": [(32, 22), (32, 42)], "width": 2},
+        {"shape": "line", "points": [(26, 28), (38, 28)], "width": 2},
+        {"shape": "line", "points": [(26, 36), (38, 36)], "width": 2},
+        # Small rings at the corners, suggesting stacked coins
+        {"shape": "ellipse", "box": (47, 12, 53, 18), "alpha": 100},
+        {"shape": "ellipse", "box": (11, 46, 17, 52), "alpha": 100},
+    ]},
+    # Glowing memory orb with particles (magenta/purple)
+    "icon_memory": {"color": (200, 100, 255), "glow": 3, "shapes": [
+        # Outer glow rings
+        {"shape": "ellipse", "box": (2, 2, 62, 62), "alpha": 110},
+        {"shape": "ellipse", "box": (6, 6, 58, 58), "alpha": 90},
+        {"shape": "ellipse", "box": (10, 10, 54, 54), "alpha": 70},
+        # Orb, inner glow and highlight
+        {"shape": "ellipse", "box": (16, 16, 48, 48), "width": 2},
+        {"shape": "ellipse", "box": (24, 24, 40, 40), "fill": True, "alpha": 100},
+        {"shape": "ellipse", "box": (27, 24, 31, 28), "fill": True,
+         "color": (255, 255, 255), "alpha": 180},
+        # Floating particles
+        *({"shape": "ellipse", "box": (x - 2, y - 2, x + 2, y + 2), "fill": True, "alpha": 150}
+          for x, y in [(10, 22), (52, 24), (14, 47), (54, 44), (37, 8), (24, 54)]),
+    ]},
+}
+
+def render_icon(asset_id, size=SIZE):
+    """The icon at size x size px, supersampled and with its glow scaled to match"""
+    icon = ICONS[asset_id]
+    img = rasterize(icon["shapes"], (SIZE, SIZE), (size, size), icon["color"])
+    return create_glow_effect(img, icon["color"], icon["glow"], size / SIZE)
+
+def render_sizes(asset_id, sizes):
+    """{size: image} for every requested size, each drawn from the vectors"""
+    return {size: render_icon(asset_id, size) for size in sizes}
+
+def icon_svg(asset_id):
+    """SVG of the icon, glow included, for Godot to rasterize at runtime"""
+    icon = ICONS[asset_id]
+    return to_svg(icon["shapes"], (SIZE, SIZE), icon["color"],
+                  glow=chained_radius(2, icon["glow"]))
+
+def create_icon(asset_id, output_path=None, variants=None):
+    """Render one icon at SIZE with an SVG beside it
+
+    variants maps suffix -> (size, size) for extra sizes; unlike the
+    resampled portrait and ending variants, each is drawn from the
+    vectors, so 16px stays crisp and 512px stays sharp.
+    """
+    print(f"Creating {asset_id}.png...")
+    output_path = output_path or os.path.join(OUTPUT_DIR, asset_id + '.png')
+
+    timer = StageTimer((SIZE, SIZE))
+    timer("shape")
+    icon = ICONS[asset_id]
+    img = rasterize(icon["shapes"], (SIZE, SIZE), (SIZE, SIZE), icon["color"])
+
+    timer("glow")
+    img = create_glow_effect(img, icon["color"], icon["glow"])
+
+    timer("save")
+    save_image(img, output_path, ICON_PROFILE)
+    with open(os.path.splitext(output_path)[0] + '.svg', 'w', encoding='utf-8') as f:
+        f.write(icon_svg(asset_id))
+
+    if variants:
+        timer("variants")
+        sizes = render_sizes(asset_id, sorted({w for w, h in variants.values()}))
+        for name, (w, h) in variants.items():
+            save_image(sizes[w], variant_path(output_path, name), ICON_PROFILE)
+    timer.done()
+    print(f"  -> {asset_id}.png saved!")
+
+def create_icon_mercy(output_path=None, variants=None):
     """Create Mercy icon - heart with soft glow (amber/gold)"""
-    print("Creating icon_mercy.png...")
-
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    cx, cy = SIZE // 2, SIZE // 2 + 2
-    color = (255, 200, 100)  # Warm amber
-
-    # Draw heart shape using bezier-like approach
-    # Heart is made of two arcs and a point at bottom
-    heart_size = 22
-
-    # Left arc
-    draw.arc([cx - heart_size, cy - heart_size//2 - 5,
-              cx, cy + heart_size//3],
-             90, 220, fill=(*color, 255), width=2)
-
-    # Right arc
-    draw.arc([cx, cy - heart_size//2 - 5,
-              cx + heart_size, cy + heart_size//3],
-             -40, 90, fill=(*color, 255), width=2)
-
-    # Bottom point lines
-    draw.line([(cx - heart_size//2 + 2, cy + heart_size//4 - 2),
-               (cx, cy + heart_size//2 + 5)], fill=(*color, 255), width=2)
-    draw.line([(cx + heart_size//2 - 2, cy + heart_size//4 - 2),
-               (cx, cy + heart_size//2 + 5)], fill=(*color, 255), width=2)
+    create_icon("icon_mercy", output_path, variants)
 
-    # Inner glow dot
-    draw.ellipse([cx - 3, cy - 3, cx + 3, cy + 3], fill=(*color, 150))
-
-    # Add glow
-    img = create_glow_effect(img, color, intensity=3)
-
-    img.save(os.path.join(OUTPUT_DIR, 'icon_mercy.png'), 'PNG')
-    print("  -> icon_mercy.png saved!")
-
-def create_icon_justice():
+def create_icon_justice(output_path=None, variants=None):
     """Create Justice icon - scales with cold glow (cyan)"""
-    print("Creating icon_justice.png...")
-
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    cx, cy = SIZE // 2, SIZE // 2
-    color = (0, 220, 255)  # Cold cyan
-
-    # Main balance beam
-    beam_width = 22
-    draw.line([(cx - beam_width, cy - 5), (cx + beam_width, cy - 5)],
-              fill=(*color, 255), width=2)
-
-    # Center pillar
-    draw.line([(cx, cy - 5), (cx, cy + 12)], fill=(*color, 255), width=2)
-
-    # Base
-    draw.line([(cx - 8, cy + 12), (cx + 8, cy + 12)], fill=(*color, 255), width=2)
-
-    # Left pan chain
-    draw.line([(cx - beam_width, cy - 5), (cx - beam_width, cy + 8)],
-              fill=(*color, 200), width=1)
-    # Left pan (arc)
-    draw.arc([cx - beam_width - 8, cy + 5, cx - beam_width + 8, cy + 15],
-             0, 180, fill=(*color, 255), width=2)
+    create_icon("icon_justice", output_path, variants)
 
-    # Right pan chain
-    draw.line([(cx + beam_width, cy - 5), (cx + beam_width, cy + 8)],
-              fill=(*color, 200), width=1)
-    # Right pan (arc)
-    draw.arc([cx + beam_width - 8, cy + 5, cx + beam_width + 8, cy + 15],
-             0, 180, fill=(*color, 255), width=2)
-
-    # Center decoration
-    draw.ellipse([cx - 2, cy - 7, cx + 2, cy - 3], fill=(*color, 200))
-
-    # Add glow
-    img = create_glow_effect(img, color, intensity=3)
-
-    img.save(os.path.join(OUTPUT_DIR, 'icon_justice.png'), 'PNG')
-    print("  -> icon_justice.png saved!")
-
-def create_icon_profit():
+def create_icon_profit(output_path=None, variants=None):
     """Create Profit icon - coin/money with golden glow"""
-    print("Creating icon_profit.png...")
-
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    cx, cy = SIZE // 2, SIZE // 2
-    color = (255, 180, 50)  # Gold
-
-    # Main coin circle
-    radius = 20
-    draw.ellipse([cx - radius, cy - radius, cx + radius, cy + radius],
-                 outline=(*color, 255), width=2)
-
-    # Inner circle
-    inner_radius = 14
-    draw.ellipse([cx - inner_radius, cy - inner_radius,
-                  cx + inner_radius, cy + inner_radius],
-                 outline=(*color, 180), width=1)
-
-    # Currency symbol (stylized)
-    # Vertical line
-    draw.line([(cx, cy - 10), (cx, cy + 10)], fill=(*color, 255), width=2)
-
-    # Horizontal lines
-    draw.line([(cx - 6, cy - 4), (cx + 6, cy - 4)], fill=(*color, 255), width=2)
-    draw.line([(cx - 6, cy + 4), (cx + 6, cy + 4)], fill=(*color, 255), width=2)
+    create_icon("icon_profit", output_path, variants)
 
-    # Small decorative dots at corners (suggesting coins stacked)
-    draw.ellipse([cx + 15, cy - 20, cx + 21, cy - 14], outline=(*color, 100), width=1)
-    draw.ellipse([cx - 21, cy + 14, cx - 15, cy + 20], outline=(*color, 100), width=1)
-
-    # Add glow
-    img = create_glow_effect(img, color, intensity=3)
-
-    img.save(os.path.join(OUTPUT_DIR, 'icon_profit.png'), 'PNG')
-    print("  -> icon_profit.png saved!")
-
-def create_icon_memory():
+def create_icon_memory(output_path=None, variants=None):
     """Create Memory orb icon - glowing orb with particles (magenta/purple)"""
-    print("Creating icon_memory.png...")
-
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    cx, cy = SIZE // 2, SIZE // 2
-    color = (200, 100, 255)  # Purple/magenta
-
-    # Outer glow circles
-    for i in range(3, 0, -1):
-        alpha = 50 + i * 20
-        r = 18 + i * 4
-        draw.ellipse([cx - r, cy - r, cx + r, cy + r],
-                     outline=(*color, alpha), width=1)
-
-    # Main orb outline
-    radius = 16
-    draw.ellipse([cx - radius, cy - radius, cx + radius, cy + radius],
-                 outline=(*color, 255), width=2)
-
-    # Inner glow
-    inner_radius = 8
-    draw.ellipse([cx - inner_radius, cy - inner_radius,
-                  cx + inner_radius, cy + inner_radius],
-                 fill=(*color, 100))
-
-    # Highlight
-    draw.ellipse([cx - 5, cy - 8, cx - 1, cy - 4], fill=(255, 255, 255, 180))
-
-    # Small floating particles around
-    particles = [
-        (cx - 22, cy - 10, 2),
-        (cx + 20, cy - 8, 2),
-        (cx - 18, cy + 15, 2),
-        (cx + 22, cy + 12, 2),
-        (cx + 5, cy - 24, 2),
-        (cx - 8, cy + 22, 2),
+    create_icon("icon_memory", output_path, variants)
+
+def jobs(output_dir=OUTPUT_DIR):
+    """List (asset_id, create function, args) for every icon"""
+    icons = [
+        ("icon_mercy", create_icon_mercy),
+        ("icon_justice", create_icon_justice),
+        ("icon_profit", create_icon_profit),
+        ("icon_memory", create_icon_memory),
     ]
+    return [(asset_id, func, (os.path.join(output_dir, asset_id + ".png"),))
+            for asset_id, func in icons]
+
+def post_build(output_dir=OUTPUT_DIR):
+    """Pack the icons into one atlas page keyed by icon name (mercy, ...)"""
+    sources = {asset_id[len("icon_"):]: encoded_path(args[-1], ICON_PROFILE)
+               for asset_id, func, args in jobs(output_dir)}
+    sources = {key: path for key, path in sources.items() if os.path.exists(path)}
+    build_atlas(sources, output_dir, "icons_atlas")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render the UI icons and their atlas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[], metavar="PX",
+                        help=f"extra square sizes to draw, e.g. --sizes 16 32 128 "
+                             f"(build_assets --variants draws {', '.join(ICON_VARIANTS)})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    variants = {str(px): (px, px) for px in args.sizes if px != SIZE}
 
-    for px, py, pr in particles:
-        draw.ellipse([px - pr, py - pr, px + pr, py + pr],
-                     fill=(*color, 150))
-
-    # Add glow
-    img = create_glow_effect(img, color, intensity=3)
-
-    img.save(os.path.join(OUTPUT_DIR, 'icon_memory.png'), 'PNG')
-    print("  -> icon_memory.png saved!")
-
-if __name__ == "__main__":
     print("=" * 40)
     print("Neon Memoria - UI Icons Generator")
     print("64x64 Minimalist Neon Line Art")
     print("=" * 40)
     print()
 
-    create_icon_mercy()
-    create_icon_justice()
-    create_icon_profit()
-    create_icon_memory()
+    for asset_id, func, paths in jobs():
+        func(*paths, variants=variants)
+    post_build()
 
     print()
     print("=" * 40)
     print("All icons created successfully!")
     print(f"Output directory: {OUTPUT_DIR}")
     print("=" * 40)
+
+if __name__ == "__main__":
+    main()